@@ -1,10 +1,16 @@
-import json
 import os
 
 from flask import Flask
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from app.ai_clients import AIClientRegistry
+from app.ai_health import create_provider_health_cache
+from app.ai_limits import create_provider_guard
+from app.ai_service import probe_provider
+from app.answer_matching import create_answer_matcher
+from app.quiz_state import create_quiz_state_store
+from app.vite import ViteManifest
 from config import Config
 
 db = SQLAlchemy()
@@ -19,7 +25,7 @@ def create_app(config_class=Config):
     migrate.init_app(app, db)
 
     # Custom Jinja2 filter for safe percentage values
-    @app.template_filter('safe_percent')
+    @app.template_filter("safe_percent")
     def safe_percent_filter(value):
         """Ensure a value is a valid percentage between 0-100"""
         try:
@@ -28,36 +34,39 @@ def create_app(config_class=Config):
         except (ValueError, TypeError):
             return 0.0
 
-    # Vite manifest helpers
+    # Vite manifest helpers (parsed once, reloaded on change in debug mode)
+    vite_manifest = ViteManifest(
+        os.path.join(app.static_folder, "dist", ".vite", "manifest.json"),
+        auto_reload=(
+            app.debug
+            if app.config.get("VITE_MANIFEST_RELOAD") is None
+            else app.config["VITE_MANIFEST_RELOAD"]
+        ),
+    )
+    app.extensions["vite_manifest"] = vite_manifest
+
     @app.context_processor
     def vite_helpers():
-        def get_vite_asset(entry):
-            manifest_path = os.path.join(
-                app.static_folder, "dist", ".vite", "manifest.json"
-            )
-            if os.path.exists(manifest_path):
-                with open(manifest_path, "r") as f:
-                    manifest = json.load(f)
-                    if entry in manifest:
-                        return f"/static/dist/{manifest[entry]['file']}"
-            # Fallback for development
-            return f"/static/dist/assets/{entry}"
-
-        def get_vite_css(entry):
-            manifest_path = os.path.join(
-                app.static_folder, "dist", ".vite", "manifest.json"
-            )
-            if os.path.exists(manifest_path):
-                with open(manifest_path, "r") as f:
-                    manifest = json.load(f)
-                    if entry in manifest and "css" in manifest[entry]:
-                        return [f"/static/dist/{css}" for css in manifest[entry]["css"]]
-            return []
-
-        return dict(vite_asset=get_vite_asset, vite_css=get_vite_css)
+        return dict(vite_asset=vite_manifest.asset, vite_css=vite_manifest.css)
+
+    app.extensions["quiz_state"] = create_quiz_state_store(app.config)
+    app.extensions["answer_matcher"] = create_answer_matcher(app.config)
+    app.extensions["ai_clients"] = AIClientRegistry(
+        model_ttl=app.config.get("AI_MODEL_CACHE_TTL", 300)
+    )
+    app.extensions["ai_health"] = create_provider_health_cache(
+        app.config, probe_provider
+    )
+    app.extensions["ai_guard"] = create_provider_guard(app.config)
 
     from app import models, routes
+    from app.ai_cache import create_ai_response_cache
+    from app.ai_jobs import create_ai_job_runner
+    from app.commands import import_list_command
 
+    app.extensions["ai_cache"] = create_ai_response_cache(app.config)
+    app.extensions["ai_jobs"] = create_ai_job_runner(app)
     app.register_blueprint(routes.bp)
+    app.cli.add_command(import_list_command)
 
     return app
@@ -0,0 +1,112 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from flask import current_app
+
+from app import db
+from app.models import CachedAIResponse
+
+
+def make_cache_key(provider_key: str, prompt: str) -> str:
+    """Hash a provider and its prompt, ignoring case and whitespace layout"""
+    normalized = " ".join(prompt.casefold().split())
+    return hashlib.sha256(f"{provider_key}\0{normalized}".encode()).hexdigest()
+
+
+class AIResponseCache:
+    """Persistent, content-addressed cache of generated lists
+
+    Entries live in the ai_response_cache table so they survive restarts
+    and are shared by all workers. An entry expires `ttl` seconds after it
+    was generated; beyond `max_entries` the least recently used entries are
+    evicted. Hit and miss counters are kept per process.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 7 * 86400,
+        max_entries: int = 1000,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.ttl = timedelta(seconds=ttl)
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        """Get cached items, None on a miss or when the entry expired"""
+        entry = db.session.get(CachedAIResponse, key)
+        now = self.clock()
+        if entry is not None and now - entry.created_at >= self.ttl:
+            db.session.delete(entry)
+            db.session.commit()
+            entry = None
+
+        if entry is None:
+            self._count(hit=False)
+            return None
+
+        entry.last_used_at = now
+        entry.hits += 1
+        db.session.commit()
+        self._count(hit=True)
+        return entry.items
+
+    def set(self, key: str, provider_key: str, items: List[dict]) -> None:
+        """Store generated items, evicting the least recently used beyond the limit"""
+        now = self.clock()
+        entry = db.session.get(CachedAIResponse, key)
+        if entry is None:
+            entry = CachedAIResponse(key=key, provider=provider_key, hits=0)
+            db.session.add(entry)
+        entry.items = items
+        entry.created_at = now
+        entry.last_used_at = now
+        db.session.flush()
+
+        overflow = CachedAIResponse.query.count() - self.max_entries
+        if overflow > 0:
+            stale_keys = (
+                db.session.query(CachedAIResponse.key)
+                .order_by(CachedAIResponse.last_used_at)
+                .limit(overflow)
+                .subquery()
+            )
+            CachedAIResponse.query.filter(
+                CachedAIResponse.key.in_(db.select(stale_keys.c.key))
+            ).delete(synchronize_session=False)
+        db.session.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters of this process and the number of stored entries"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "entries": CachedAIResponse.query.count(),
+        }
+
+
+def create_ai_response_cache(config) -> AIResponseCache:
+    """Create the AI response cache configured by AI_CACHE_*"""
+    return AIResponseCache(
+        ttl=config.get("AI_CACHE_TTL", 7 * 86400),
+        max_entries=config.get("AI_CACHE_MAX_ENTRIES", 1000),
+    )
+
+
+def get_ai_response_cache() -> AIResponseCache:
+    """Get the AI response cache of the current app"""
+    return current_app.extensions["ai_cache"]
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from flask import current_app
+
+# Preferred Ollama models, the first installed match wins
+OLLAMA_MODELS_TO_TRY = ["llama3.2", "llama3", "mistral", "gemma2"]
+
+
+class AIClientRegistry:
+    """App-scoped registry of AI SDK clients
+
+    Each SDK client owns an HTTP connection pool, so clients are created
+    once per provider and configuration (API key, host, timeout) and reused
+    across requests. The SDKs are imported on first use only, they are
+    optional dependencies.
+
+    The resolved Ollama model is cached per host for `model_ttl` seconds,
+    so generating does not list the installed models every time.
+    """
+
+    def __init__(
+        self, model_ttl: float = 300.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.model_ttl = model_ttl
+        self.clock = clock
+        self._clients: Dict[Hashable, object] = {}
+        self._models: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, key: Hashable, factory: Callable[[], object]):
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = factory()
+            return client
+
+    def openai(self, api_key: str):
+        """Get the OpenAI client for an API key"""
+
+        def factory():
+            from openai import OpenAI
+
+            return OpenAI(api_key=api_key)
+
+        return self._get_or_create(("openai", api_key), factory)
+
+    def anthropic(self, api_key: str):
+        """Get the Anthropic client for an API key"""
+
+        def factory():
+            import anthropic
+
+            return anthropic.Anthropic(api_key=api_key)
+
+        return self._get_or_create(("anthropic", api_key), factory)
+
+    def ollama(self, host: str, timeout: Optional[float] = None):
+        """Get the Ollama client for a host (and request timeout)"""
+
+        def factory():
+            import ollama
+
+            if timeout is None:
+                return ollama.Client(host=host)
+            return ollama.Client(host=host, timeout=timeout)
+
+        return self._get_or_create(("ollama", host, timeout), factory)
+
+    def ollama_model(self, host: str) -> Optional[str]:
+        """Get the Ollama model to generate with, resolved once per TTL"""
+        with self._lock:
+            cached = self._models.get(host)
+            if cached is not None and self.clock() - cached[1] < self.model_ttl:
+                return cached[0]
+
+        available_models = [
+            m["name"] for m in self.ollama(host).list().get("models", [])
+        ]
+        model = choose_ollama_model(available_models)
+        if model:
+            with self._lock:
+                self._models[host] = (model, self.clock())
+        return model
+
+    def forget_ollama_model(self, host: str) -> None:
+        """Drop the cached model, for instance after it was removed"""
+        with self._lock:
+            self._models.pop(host, None)
+
+
+def choose_ollama_model(available_models: List[str]) -> Optional[str]:
+    """Pick the preferred model from the installed ones"""
+    for m in OLLAMA_MODELS_TO_TRY:
+        for available in available_models:
+            if m in available:
+                return available
+    return available_models[0] if available_models else None
+
+
+def get_ai_clients() -> AIClientRegistry:
+    """Get the AI client registry of the current app"""
+    return current_app.extensions["ai_clients"]
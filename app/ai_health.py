@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+
+
+class ProviderHealthCache:
+    """Cached availability of AI providers whose check needs the network
+
+    Reads never probe: get() returns the last known state and, when that is
+    missing or older than its TTL, asks the background refresher to probe
+    again. Failed probes are cached too (with their own, shorter TTL), so a
+    provider that is down is not hammered on every page view.
+
+    `clock` can be replaced in tests to move time without sleeping.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[str], bool],
+        ttl: float = 60.0,
+        negative_ttl: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.probe = probe
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self._states: Dict[str, Tuple[bool, float]] = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _is_stale(self, state: Tuple[bool, float]) -> bool:
+        available, checked_at = state
+        ttl = self.ttl if available else self.negative_ttl
+        return self.clock() - checked_at >= ttl
+
+    def get(self, key: str, default: bool = False) -> bool:
+        """Get the cached availability, scheduling a probe when it is stale"""
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or self._is_stale(state):
+                self._pending.add(key)
+                self._wake.set()
+        return default if state is None else state[0]
+
+    def refresh(self, key: str) -> bool:
+        """Probe a provider now and cache the result"""
+        try:
+            available = bool(self.probe(key))
+        except Exception as e:
+            print(f"Error probing AI provider {key}: {e}")
+            available = False
+        with self._lock:
+            self._states[key] = (available, self.clock())
+            self._pending.discard(key)
+        return available
+
+    def refresh_due(self, keys: Iterable[str] = ()) -> None:
+        """Probe the given and requested providers that are missing or stale"""
+        with self._lock:
+            keys = set(keys) | self._pending
+            due = [
+                key
+                for key in keys
+                if key not in self._states or self._is_stale(self._states[key])
+            ]
+        for key in due:
+            self.refresh(key)
+
+    def start(self, keys: Iterable[str], interval: float, app=None) -> None:
+        """Start the background refresher (once) for the given providers"""
+        keys = list(keys)
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            def run():
+                while not self._stopped.is_set():
+                    if app is not None:
+                        with app.app_context():
+                            self.refresh_due(keys)
+                    else:
+                        self.refresh_due(keys)
+                    self._wake.wait(interval)
+                    self._wake.clear()
+
+            self._thread = threading.Thread(
+                target=run, name="ai-health-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def create_provider_health_cache(config, probe: Callable[[str], bool]):
+    """Create the provider health cache configured by AI_HEALTH_*"""
+    return ProviderHealthCache(
+        probe,
+        ttl=config.get("AI_HEALTH_TTL", 60),
+        negative_ttl=config.get("AI_HEALTH_NEGATIVE_TTL", 15),
+    )
+
+
+def get_provider_health_cache() -> ProviderHealthCache:
+    """Get the provider health cache of the current app"""
+    return current_app.extensions["ai_health"]
@@ -0,0 +1,212 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence
+
+from flask import current_app
+
+from app import db
+from app.ai_service import AIService
+from app.models import AIGenerationJob
+from app.repositories import AIGenerationJobRepository
+
+
+class AIJobRunner:
+    """Runs list generations in the background
+
+    A generation takes as long as the LLM call, so it runs on a small pool
+    of `max_workers` threads instead of the request worker. Each job runs
+    in its own app context and records the items in the jobs table as the
+    provider streams them, where the poll and event endpoints read them.
+    Readers in this process are woken on every update through
+    wait_for_update(), readers in other processes poll. Every save rewrites
+    the items column, so progress is saved every `save_every` items or
+    `save_interval` seconds and the full list once when the job finishes.
+
+    With `max_workers=0` jobs run inline on submit, which keeps tests and
+    single-process setups without threads simple.
+
+    A batch takes a single worker and runs its jobs concurrently with
+    fan_out(). A batch has at most `max_batch_jobs` jobs. Every generation,
+    single or in a batch, holds a provider slot while it runs, so at most
+    `provider_limits[provider]` (or `default_limit`) calls of a provider run
+    at once in this process.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_workers: int = 2,
+        max_pending: int = 20,
+        timeout: float = 300.0,
+        queue_timeout: float = 3600.0,
+        provider_limits: Optional[Dict[str, int]] = None,
+        default_limit: int = 4,
+        max_batch_jobs: int = 20,
+        save_every: int = 10,
+        save_interval: float = 1.0,
+    ):
+        self.app = app
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.provider_limits = provider_limits or {}
+        self.default_limit = default_limit
+        self.max_batch_jobs = max_batch_jobs
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._updated = threading.Condition()
+
+    def submit(self, job_id: int) -> Future:
+        """Queue a pending job"""
+        if not self.max_workers:
+            return _completed(self.run(job_id))
+        return self._pool().submit(self._run_in_app_context, job_id)
+
+    def submit_batch(self, job_ids: Sequence[int]) -> Future:
+        """Queue pending jobs to run concurrently"""
+        if not self.max_workers:
+            return _completed(self.run_batch(job_ids))
+        return self._pool().submit(self.run_batch, job_ids)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="ai-job"
+                )
+            return self._executor
+
+    def provider_slot(self, provider: str) -> threading.BoundedSemaphore:
+        """The semaphore limiting the concurrent calls of a provider"""
+        with self._lock:
+            if provider not in self._slots:
+                self._slots[provider] = threading.BoundedSemaphore(
+                    self.provider_limits.get(provider, self.default_limit)
+                )
+            return self._slots[provider]
+
+    def run_batch(self, job_ids: Sequence[int]) -> List:
+        """Run jobs concurrently, each waiting for its provider slot"""
+        return fan_out(
+            [partial(self._run_in_app_context, job_id) for job_id in job_ids]
+        )
+
+    def _run_in_app_context(self, job_id: int) -> Optional[AIGenerationJob]:
+        with self.app.app_context():
+            return self.run(job_id)
+
+    def run(self, job_id: int) -> Optional[AIGenerationJob]:
+        """Run a pending job now, None if another worker already took it"""
+        job_repo = AIGenerationJobRepository()
+        pending = job_repo.get_by_id(job_id)
+        if pending is None or pending.status != "pending":
+            return None
+        provider = pending.provider
+        # No transaction stays open while waiting for the provider slot
+        db.session.rollback()
+
+        # The job stays pending until it has a slot, so started_at (and the
+        # generation timeout) does not include the wait
+        with self.provider_slot(provider):
+            job = job_repo.start(job_id, datetime.utcnow())
+            if job is None:
+                return None
+
+            items, status, error = [], "done", None
+            saved, saved_at = 0, time.monotonic()
+            try:
+                for item in AIService().stream_list(
+                    provider_key=job.provider,
+                    topic=job.topic,
+                    source_language=job.source_language.name,
+                    target_language=job.target_language.name,
+                    entry_type=job.entry_type,
+                    count=job.count,
+                    regenerate=job.regenerate,
+                ):
+                    items.append(item)
+                    if (
+                        len(items) - saved < self.save_every
+                        and time.monotonic() - saved_at < self.save_interval
+                    ):
+                        continue
+                    if not job_repo.record_items(job_id, list(items)):
+                        # Timed out meanwhile: stop, the job stays failed
+                        break
+                    saved, saved_at = len(items), time.monotonic()
+                    self._notify()
+            except Exception as e:
+                print(f"Error in AI generation job {job_id}: {e}")
+                db.session.rollback()
+                status, error = "failed", str(e)
+
+        job_repo.finish(job_id, status, datetime.utcnow(), error=error, items=items)
+        db.session.refresh(job)
+        self._notify()
+        return job
+
+    def _notify(self) -> None:
+        with self._updated:
+            self._updated.notify_all()
+
+    def wait_for_update(self, timeout: float) -> None:
+        """Block until a job in this process made progress, or the timeout"""
+        with self._updated:
+            self._updated.wait(timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+def _completed(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def fan_out(calls: Sequence[Callable[[], object]]) -> List:
+    """
+    Run blocking calls concurrently, a thread each
+
+    The total time is that of the slowest call instead of their sum. Calls
+    that must not all run at once limit themselves, as run() does with the
+    provider slots. Returns the results in order, with the exception in
+    place of a call that raised.
+    """
+    if not calls:
+        return []
+    with ThreadPoolExecutor(len(calls), thread_name_prefix="ai-fan-out") as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.exception() or future.result() for future in futures]
+
+
+def create_ai_job_runner(app) -> AIJobRunner:
+    """Create the job runner configured by AI_JOB_*, AI_BATCH_* and concurrency"""
+    return AIJobRunner(
+        app,
+        max_workers=app.config.get("AI_JOB_WORKERS", 2),
+        max_pending=app.config.get("AI_JOB_MAX_PENDING", 20),
+        timeout=app.config.get("AI_JOB_TIMEOUT", 300),
+        queue_timeout=app.config.get("AI_JOB_QUEUE_TIMEOUT", 3600),
+        provider_limits=app.config.get("AI_PROVIDER_CONCURRENCY"),
+        default_limit=app.config.get("AI_DEFAULT_CONCURRENCY", 4),
+        max_batch_jobs=app.config.get("AI_BATCH_MAX_JOBS", 20),
+        save_every=app.config.get("AI_JOB_SAVE_EVERY", 10),
+        save_interval=app.config.get("AI_JOB_SAVE_INTERVAL", 1.0),
+    )
+
+
+def get_ai_job_runner() -> AIJobRunner:
+    """Get the job runner of the current app"""
+    return current_app.extensions["ai_jobs"]
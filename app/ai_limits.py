@@ -0,0 +1,270 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+from flask import current_app
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, overload
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+# Connection errors of the SDKs (httpx based) that have no status code
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "ConnectError"}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed AI call may succeed when it is tried again"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    return (
+        isinstance(error, (ConnectionError, TimeoutError))
+        or type(error).__name__ in RETRYABLE_ERRORS
+    )
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """The Retry-After seconds a provider sent with an error, if any"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, in bursts of `capacity`"""
+
+    def __init__(
+        self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token, returning 0 or the seconds until one is available"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class CircuitBreaker:
+    """Stops calling a provider after `threshold` failures in a row
+
+    Once open, calls are refused for `reset_timeout` seconds. Then a single
+    trial call is let through: if it succeeds the breaker closes, if it
+    fails the breaker stays open for another `reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are refused right now"""
+        with self._lock:
+            return (
+                self._opened_at is not None
+                and self.clock() - self._opened_at < self.reset_timeout
+            )
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead, taking the trial call when it is due"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self.clock() - self._opened_at < self.reset_timeout:
+                return False
+            # Trial call: refuse others until it succeeded
+            self._opened_at = self.clock()
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self._opened_at = self.clock()
+
+
+class ProviderGuard:
+    """Rate limiting, retries and circuit breaking for AI provider calls
+
+    Every provider gets its own token bucket (`rates` in calls per minute,
+    a provider without a rate is not limited) and circuit breaker, shared
+    by all threads of the app. Calls that fail with a rate limit, overload
+    or connection error are retried up to `retries` times with full-jitter
+    exponential backoff, honouring Retry-After.
+
+    `clock`, `sleep` and `jitter` (a random number in [0, 1)) can be
+    replaced in tests.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        burst: int = 5,
+        retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0,
+        max_wait: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.rates = rates or {}
+        self.burst = burst
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.sleep = sleep
+        self.jitter = jitter
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        """Get the circuit breaker of a provider"""
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self.clock
+                )
+            return breaker
+
+    def is_open(self, key: str) -> bool:
+        """Whether a provider is refused after repeated failures"""
+        return self.breaker(key).is_open
+
+    def wait_for_token(self, key: str) -> None:
+        """Block until the rate limit of a provider allows a call"""
+        rate = self.rates.get(key)
+        if not rate:
+            return
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(
+                    rate / 60, self.burst, self.clock
+                )
+
+        waited = 0.0
+        while True:
+            wait = bucket.try_acquire()
+            if not wait:
+                return
+            if waited + wait > self.max_wait:
+                raise ValueError(
+                    f"Te veel verzoeken naar {key}, probeer het later opnieuw"
+                )
+            self.sleep(wait)
+            waited += wait
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 0)"""
+        delay = self.jitter() * min(self.max_delay, self.base_delay * 2**attempt)
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay))
+        return delay
+
+    def stream(self, key: str, start: Callable[[], Iterator[T]]) -> Iterator[T]:
+        """
+        Iterate a provider call within the limits of the provider
+
+        `start` starts the call. It is retried as long as it failed before
+        yielding anything; once items were yielded a retry would repeat
+        them, so later errors are raised.
+        """
+        breaker = self.breaker(key)
+        if not breaker.allow():
+            raise ValueError(
+                f"Provider {key} is tijdelijk niet beschikbaar na herhaalde fouten"
+            )
+
+        attempt = 0
+        while True:
+            self.wait_for_token(key)
+            started = False
+            try:
+                for item in start():
+                    started = True
+                    yield item
+            except Exception as e:
+                # Our own errors (configuration, unusable answer) are not
+                # the provider failing; the provider did answer, which also
+                # ends a trial call instead of keeping the breaker open
+                if isinstance(e, ValueError):
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                if (
+                    started
+                    or attempt >= self.retries
+                    or not is_retryable(e)
+                    # Opened by this call's own failures, or a failed trial
+                    or breaker.is_open
+                ):
+                    raise
+                print(f"Error calling AI provider {key}, retrying: {e}")
+                self.sleep(self.backoff(attempt, e))
+                attempt += 1
+                continue
+            breaker.record_success()
+            return
+
+
+def create_provider_guard(config) -> ProviderGuard:
+    """Create the provider guard configured by AI_RATE_*, AI_RETRY_* and AI_BREAKER_*"""
+    return ProviderGuard(
+        rates=config.get("AI_RATE_LIMITS"),
+        burst=config.get("AI_RATE_BURST", 5),
+        retries=config.get("AI_RETRY_ATTEMPTS", 3),
+        base_delay=config.get("AI_RETRY_BASE_DELAY", 1.0),
+        max_delay=config.get("AI_RETRY_MAX_DELAY", 20.0),
+        max_wait=config.get("AI_RATE_MAX_WAIT", 30.0),
+        failure_threshold=config.get("AI_BREAKER_THRESHOLD", 5),
+        reset_timeout=config.get("AI_BREAKER_RESET", 60.0),
+    )
+
+
+def get_provider_guard() -> ProviderGuard:
+    """Get the provider guard of the current app"""
+    return current_app.extensions["ai_guard"]
@@ -1,14 +1,32 @@
 import json
+import random
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List
 
 from flask import current_app
 
+from app.ai_clients import get_ai_clients
+from app.ai_health import get_provider_health_cache
+from app.ai_limits import get_provider_guard
+from app.ai_stream import ItemStreamParser, parse_item_stream
+
+SYSTEM_PROMPT = (
+    "Je bent een hulpvaardige assistent die woordenlijsten genereert. "
+    "Je antwoordt alleen met JSON."
+)
+
 
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
 
-    @abstractmethod
+    # Providers whose is_available() makes a network call are probed in the
+    # background through the provider health cache
+    network_probe = False
+    # Providers that are not listed at all while they are unavailable
+    hidden_when_unavailable = False
+
     def generate_list(
         self,
         topic: str,
@@ -18,6 +36,27 @@ class AIProvider(ABC):
         count: int = 10,
     ) -> List[dict]:
         """Generate a list of word/sentence pairs"""
+        return list(
+            self.stream_list(topic, source_language, target_language, entry_type, count)
+        )
+
+    def stream_list(
+        self,
+        topic: str,
+        source_language: str,
+        target_language: str,
+        entry_type: str,
+        count: int = 10,
+    ) -> Iterator[dict]:
+        """Generate a list, yielding each pair as soon as it is complete"""
+        prompt = self._build_prompt(
+            topic, source_language, target_language, entry_type, count
+        )
+        return parse_item_stream(self._stream_completion(prompt))
+
+    @abstractmethod
+    def _stream_completion(self, prompt: str) -> Iterator[str]:
+        """Stream the completion of a prompt as text chunks"""
         pass
 
     @abstractmethod
@@ -60,42 +99,11 @@ Zorg ervoor dat:
 """
 
     def _parse_response(self, response_text: str) -> List[dict]:
-        """Parse the AI response to extract the list items"""
-        # Try to find JSON array in the response
-        text = response_text.strip()
-
-        # Remove markdown code blocks if present
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-
-        text = text.strip()
-
-        # Find the JSON array
-        start_idx = text.find("[")
-        end_idx = text.rfind("]") + 1
-
-        if start_idx == -1 or end_idx == 0:
-            raise ValueError("Geen geldige JSON array gevonden in het antwoord")
-
-        json_str = text[start_idx:end_idx]
-        items = json.loads(json_str)
-
-        # Validate structure
-        validated_items = []
-        for item in items:
-            if isinstance(item, dict) and "source" in item and "target" in item:
-                validated_items.append(
-                    {"source": str(item["source"]), "target": str(item["target"])}
-                )
-
-        if not validated_items:
-            raise ValueError("Geen geldige items gevonden in het antwoord")
-
-        return validated_items
+        """Parse a complete AI response to extract the list items"""
+        parser = ItemStreamParser()
+        items = parser.feed(response_text)
+        parser.close()
+        return items
 
 
 class OpenAIProvider(AIProvider):
@@ -105,39 +113,24 @@ class OpenAIProvider(AIProvider):
         api_key = current_app.config.get("OPENAI_API_KEY")
         return bool(api_key)
 
-    def generate_list(
-        self,
-        topic: str,
-        source_language: str,
-        target_language: str,
-        entry_type: str,
-        count: int = 10,
-    ) -> List[dict]:
-        from openai import OpenAI
-
+    def _stream_completion(self, prompt: str) -> Iterator[str]:
         api_key = current_app.config.get("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OpenAI API key niet geconfigureerd")
 
-        client = OpenAI(api_key=api_key)
-        prompt = self._build_prompt(
-            topic, source_language, target_language, entry_type, count
-        )
-
-        response = client.chat.completions.create(
+        client = get_ai_clients().openai(api_key)
+        stream = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {
-                    "role": "system",
-                    "content": "Je bent een hulpvaardige assistent die woordenlijsten genereert. Je antwoordt alleen met JSON.",
-                },
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
             temperature=0.7,
+            stream=True,
         )
-
-        response_text = response.choices[0].message.content
-        return self._parse_response(response_text)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
 
 class AnthropicProvider(AIProvider):
@@ -147,101 +140,133 @@ class AnthropicProvider(AIProvider):
         api_key = current_app.config.get("ANTHROPIC_API_KEY")
         return bool(api_key)
 
-    def generate_list(
-        self,
-        topic: str,
-        source_language: str,
-        target_language: str,
-        entry_type: str,
-        count: int = 10,
-    ) -> List[dict]:
-        import anthropic
-
+    def _stream_completion(self, prompt: str) -> Iterator[str]:
         api_key = current_app.config.get("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("Anthropic API key niet geconfigureerd")
 
-        client = anthropic.Anthropic(api_key=api_key)
-        prompt = self._build_prompt(
-            topic, source_language, target_language, entry_type, count
-        )
-
-        response = client.messages.create(
+        client = get_ai_clients().anthropic(api_key)
+        with client.messages.stream(
             model="claude-3-haiku-20240307",
             max_tokens=2048,
             messages=[{"role": "user", "content": prompt}],
-        )
-
-        response_text = response.content[0].text
-        return self._parse_response(response_text)
+        ) as stream:
+            yield from stream.text_stream
 
 
 class OllamaProvider(AIProvider):
     """Ollama (local) provider"""
 
+    network_probe = True
+
     def is_available(self) -> bool:
         try:
-            import ollama
-
             host = current_app.config.get("OLLAMA_HOST", "http://localhost:11434")
-            client = ollama.Client(host=host)
+            client = get_ai_clients().ollama(
+                host, timeout=current_app.config.get("OLLAMA_PROBE_TIMEOUT", 2)
+            )
             # Try to list models to check if Ollama is running
             client.list()
             return True
         except Exception:
             return False
 
-    def generate_list(
-        self,
-        topic: str,
-        source_language: str,
-        target_language: str,
-        entry_type: str,
-        count: int = 10,
-    ) -> List[dict]:
-        import ollama
-
+    def _stream_completion(self, prompt: str) -> Iterator[str]:
         host = current_app.config.get("OLLAMA_HOST", "http://localhost:11434")
-        client = ollama.Client(host=host)
-
-        prompt = self._build_prompt(
-            topic, source_language, target_language, entry_type, count
-        )
-
-        # Try common models
-        models_to_try = ["llama3.2", "llama3", "mistral", "gemma2"]
-        available_models = [m["name"] for m in client.list().get("models", [])]
-
-        model = None
-        for m in models_to_try:
-            for available in available_models:
-                if m in available:
-                    model = available
-                    break
-            if model:
-                break
-
-        if not model and available_models:
-            model = available_models[0]
+        clients = get_ai_clients()
+        client = clients.ollama(host)
 
+        model = clients.ollama_model(host)
         if not model:
             raise ValueError(
                 "Geen Ollama model beschikbaar. Installeer een model met: ollama pull llama3.2"
             )
 
-        response = client.chat(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Je bent een hulpvaardige assistent die woordenlijsten genereert. Je antwoordt alleen met JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
+        try:
+            stream = client.chat(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for part in stream:
+                yield part["message"]["content"]
+        except Exception:
+            # The model may have been removed, resolve it again next time
+            clients.forget_ollama_model(host)
+            raise
+
+
+class StubProvider(AIProvider):
+    """Local provider without network, for load tests and benchmarks
+
+    Answers are deterministic: the same prompt always streams the same
+    pairs of made-up words, after AI_STUB_LATENCY (+/- AI_STUB_JITTER)
+    seconds spread over the items. A share AI_STUB_MALFORMED_RATE of the
+    prompts gets one of the malformed answers LLMs give instead, to
+    exercise the parse errors. Enabled with AI_STUB_ENABLED.
+    """
+
+    hidden_when_unavailable = True
+
+    SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vo", "zi", "bel", "dor"]
+    MALFORMED = ["prose", "truncated", "missing_target", "broken_item"]
+    COUNT_RE = re.compile(r"lijst van (\d+) ")
+
+    def is_available(self) -> bool:
+        return bool(current_app.config.get("AI_STUB_ENABLED"))
+
+    def _build_prompt(
+        self,
+        topic: str,
+        source_language: str,
+        target_language: str,
+        entry_type: str,
+        count: int,
+    ) -> str:
+        """Ask for AI_STUB_ITEM_COUNT items if set, which also keys the cache"""
+        count = current_app.config.get("AI_STUB_ITEM_COUNT") or count or 10
+        return super()._build_prompt(
+            topic, source_language, target_language, entry_type, count
         )
 
-        response_text = response["message"]["content"]
-        return self._parse_response(response_text)
+    def _word(self, rng: random.Random) -> str:
+        return "".join(rng.choice(self.SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+    def _stream_completion(self, prompt: str) -> Iterator[str]:
+        config = current_app.config
+        rng = random.Random(prompt)
+        count = int(self.COUNT_RE.search(prompt).group(1))
+        latency = max(
+            0.0,
+            config.get("AI_STUB_LATENCY", 0.5)
+            + rng.uniform(-1, 1) * config.get("AI_STUB_JITTER", 0.2),
+        )
+        malformed = None
+        if rng.random() < config.get("AI_STUB_MALFORMED_RATE", 0.0):
+            malformed = rng.choice(self.MALFORMED)
+
+        if malformed == "prose":
+            time.sleep(latency)
+            yield "Sorry, ik kan geen lijst maken over dit onderwerp."
+            return
+
+        yield "```json\n["
+        for i in range(count):
+            time.sleep(latency / count)
+            item = {"source": self._word(rng), "target": self._word(rng)}
+            if malformed == "missing_target":
+                del item["target"]
+            text = json.dumps(item, ensure_ascii=False)
+            if malformed == "broken_item" and i == count // 2:
+                text = text.replace('"target"', "target")
+            yield ("," if i else "") + "\n  " + text
+            if malformed == "truncated" and i == count // 2:
+                yield ',\n  {"source": "'
+                return
+        yield "\n]\n```"
 
 
 class AIService:
@@ -251,24 +276,53 @@ class AIService:
         "openai": OpenAIProvider,
         "anthropic": AnthropicProvider,
         "ollama": OllamaProvider,
+        "stub": StubProvider,
     }
 
     PROVIDER_NAMES = {
         "openai": "OpenAI (GPT)",
         "anthropic": "Anthropic (Claude)",
         "ollama": "Ollama (Lokaal)",
+        "stub": "Stub (test)",
     }
 
+    def is_provider_available(self, key: str, default: bool = False) -> bool:
+        """
+        Check if a provider is available without blocking on the network
+
+        Network probes come from the provider health cache; `default` is
+        returned while a provider has not been probed yet. A provider that
+        failed repeatedly is unavailable until its circuit breaker resets.
+        """
+        if get_provider_guard().is_open(key):
+            return False
+
+        provider = self.PROVIDERS[key]()
+        if not provider.network_probe:
+            return provider.is_available()
+
+        health = get_provider_health_cache()
+        interval = current_app.config.get("AI_HEALTH_REFRESH_INTERVAL", 30)
+        if interval and not current_app.testing:
+            health.start(
+                [k for k, cls in self.PROVIDERS.items() if cls.network_probe],
+                interval,
+                app=current_app._get_current_object(),
+            )
+        return health.get(key, default)
+
     def get_available_providers(self) -> List[dict]:
         """Get list of available providers with their status"""
         providers = []
         for key, provider_class in self.PROVIDERS.items():
-            provider = provider_class()
+            available = self.is_provider_available(key)
+            if provider_class.hidden_when_unavailable and not available:
+                continue
             providers.append(
                 {
                     "key": key,
                     "name": self.PROVIDER_NAMES[key],
-                    "available": provider.is_available(),
+                    "available": available,
                 }
             )
         return providers
@@ -281,18 +335,79 @@ class AIService:
         target_language: str,
         entry_type: str,
         count: int = 10,
+        regenerate: bool = False,
     ) -> List[dict]:
         """Generate a list using the specified provider"""
+        return list(
+            self.stream_list(
+                provider_key,
+                topic,
+                source_language,
+                target_language,
+                entry_type,
+                count,
+                regenerate=regenerate,
+            )
+        )
+
+    def stream_list(
+        self,
+        provider_key: str,
+        topic: str,
+        source_language: str,
+        target_language: str,
+        entry_type: str,
+        count: int = 10,
+        regenerate: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Generate a list, yielding each pair as soon as the provider sent it
+
+        Results are cached by provider and prompt, so asking for the same
+        list again is answered from the cache. `regenerate` skips the cache
+        lookup and replaces the cached result with a fresh one. Provider
+        calls go through the provider guard (rate limits, retries).
+        """
+        # Imported here: the cache needs the models, which need the app package
+        from app.ai_cache import get_ai_response_cache, make_cache_key
+
         if provider_key not in self.PROVIDERS:
             raise ValueError(f"Onbekende AI provider: {provider_key}")
 
         provider = self.PROVIDERS[provider_key]()
+        cache = get_ai_response_cache()
+        cache_key = make_cache_key(
+            provider_key,
+            provider._build_prompt(
+                topic, source_language, target_language, entry_type, count
+            ),
+        )
+        if not regenerate:
+            items = cache.get(cache_key)
+            if items is not None:
+                return iter(items)
 
-        if not provider.is_available():
+        # Not probed yet: just try, a failing provider raises its own error
+        if not self.is_provider_available(provider_key, default=True):
             raise ValueError(
                 f"Provider {self.PROVIDER_NAMES[provider_key]} is niet beschikbaar"
             )
 
-        return provider.generate_list(
-            topic, source_language, target_language, entry_type, count
-        )
+        def stream_and_cache():
+            items = []
+            for item in get_provider_guard().stream(
+                provider_key,
+                lambda: provider.stream_list(
+                    topic, source_language, target_language, entry_type, count
+                ),
+            ):
+                items.append(item)
+                yield item
+            cache.set(cache_key, provider_key, items)
+
+        return stream_and_cache()
+
+
+def probe_provider(key: str) -> bool:
+    """Run the availability check of a provider, used by the health cache"""
+    return AIService.PROVIDERS[key]().is_available()
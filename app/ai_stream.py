@@ -0,0 +1,111 @@
+import json
+import re
+from typing import Iterable, Iterator, List, Optional
+
+# The characters that change the parser state, everything else is skipped
+_SIGNIFICANT = re.compile(r'[\[\]{}"\\]')
+
+
+def validate_item(item) -> Optional[dict]:
+    """Normalize a generated item to {"source", "target"}, None if it is invalid"""
+    if isinstance(item, dict) and "source" in item and "target" in item:
+        return {"source": str(item["source"]), "target": str(item["target"])}
+    return None
+
+
+class ItemStreamParser:
+    """Incremental parser for the JSON array of items an LLM streams back
+
+    feed() takes the completion in arbitrary chunks and returns the items
+    of the first top-level array as soon as their object is closed, so
+    they can be shown before the completion is done. Text around the array
+    (code fences, an introduction) is ignored, as are objects that are not
+    valid JSON or lack "source" and "target".
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.count = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_parts: Optional[List[str]] = None
+
+    def feed(self, chunk: str) -> List[dict]:
+        """Parse the next chunk, returning the items it completed"""
+        items = []
+        if self.finished or not chunk:
+            return items
+
+        start = 0 if self._object_parts is not None else None
+        skip = 0 if self._escaped else -1
+        self._escaped = False
+
+        for match in _SIGNIFICANT.finditer(chunk):
+            index = match.start()
+            if index == skip:
+                continue
+            char = match.group()
+
+            if not self.started:
+                if char == "[":
+                    self.started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if char == "\\":
+                    skip = index + 1
+                    self._escaped = skip == len(chunk)
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if self._depth == 1 and char == "{":
+                    self._object_parts = []
+                    start = index
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1 and self._object_parts is not None:
+                    self._object_parts.append(chunk[start : index + 1])
+                    item = self._parse_object("".join(self._object_parts))
+                    self._object_parts = None
+                    start = None
+                    if item is not None:
+                        self.count += 1
+                        items.append(item)
+                elif self._depth == 0:
+                    self.finished = True
+                    break
+
+        if self._object_parts is not None:
+            self._object_parts.append(chunk[start:])
+        return items
+
+    def _parse_object(self, text: str) -> Optional[dict]:
+        try:
+            return validate_item(json.loads(text))
+        except ValueError:
+            return None
+
+    def close(self) -> None:
+        """Check that the completion contained items"""
+        if not self.started:
+            raise ValueError("Geen geldige JSON array gevonden in het antwoord")
+        if not self.count:
+            raise ValueError("Geen geldige items gevonden in het antwoord")
+
+
+def parse_item_stream(chunks: Iterable[str]) -> Iterator[dict]:
+    """Yield the items of a streamed completion as they complete"""
+    parser = ItemStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.finished:
+            break
+    parser.close()
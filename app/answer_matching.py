@@ -0,0 +1,162 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import FrozenSet, Hashable, List, Optional, Sequence
+
+from flask import current_app
+from rapidfuzz.distance import Levenshtein
+
+MODES = ("exact", "tolerant")
+
+_PUNCTUATION = re.compile(r"[\W_]+")
+# "I have had / I had" and "huis; woning", but not "he/she/it"
+_VARIANT_SEPARATOR = re.compile(r"\s+/\s+|;")
+_PARENTHETICAL = re.compile(r"\([^)]*\)")
+
+
+def normalize_answer(text: str) -> str:
+    """Fold case, accents and punctuation: "  Crème-brûlée!" -> "creme brulee" """
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _PUNCTUATION.sub(" ", text).strip()
+
+
+def split_variants(text: str) -> List[str]:
+    """
+    Split an expected answer into the answers that are accepted
+
+    "(to) walk / go" gives the full text, "(to) walk", "walk" and "go":
+    alternatives are separated by " / " or ";" and parenthesized parts are
+    optional.
+    """
+    variants = [text]
+    for part in _VARIANT_SEPARATOR.split(text):
+        variants.append(part)
+        variants.append(_PARENTHETICAL.sub(" ", part))
+    return variants
+
+
+class AnswerMatcher:
+    """Decides whether a typed answer counts as correct
+
+    In "exact" mode answers must match after trimming and lowercasing. In
+    "tolerant" mode both sides are normalized with normalize_answer() and
+    a number of typos scaled to the answer length is allowed. Distances are
+    computed by RapidFuzz in C with a score cutoff, so a mismatch is
+    rejected without computing the full edit distance.
+
+    The accepted variants of an expected answer are parsed once and kept in
+    an LRU index, so a correct answer is a set lookup.
+    """
+
+    def __init__(
+        self,
+        mode: str = "exact",
+        max_error_rate: float = 0.2,
+        min_fuzzy_length: int = 4,
+        max_cached_variants: int = 10000,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Onbekende antwoordcontrole: {mode}")
+        self.mode = mode
+        self.max_error_rate = max_error_rate
+        self.min_fuzzy_length = min_fuzzy_length
+        self.max_cached_variants = max_cached_variants
+        self._variants = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalize(self, text: str) -> str:
+        """Normalize text the way this matcher compares it"""
+        if self.mode == "exact":
+            return " ".join(text.lower().split())
+        return normalize_answer(text)
+
+    def allowed_edits(self, expected: str) -> int:
+        """Number of typos accepted for an expected (normalized) answer"""
+        if len(expected) < self.min_fuzzy_length:
+            return 0
+        return int(len(expected) * self.max_error_rate)
+
+    def variants(self, expected: str, key: Optional[Hashable] = None) -> FrozenSet[str]:
+        """
+        Get the normalized variants of an expected answer
+
+        With an (entry_id, direction) key the parsed variants are cached
+        until invalidate() is called for the entry. The cached text is
+        compared as well, so an entry edited by another worker is reparsed.
+        """
+        if key is not None:
+            with self._lock:
+                cached = self._variants.get(key)
+                if cached is not None and cached[0] == expected:
+                    self._variants.move_to_end(key)
+                    return cached[1]
+
+        variants = frozenset(
+            variant
+            for variant in map(self.normalize, split_variants(expected))
+            if variant
+        )
+
+        if key is not None:
+            with self._lock:
+                self._variants[key] = (expected, variants)
+                self._variants.move_to_end(key)
+                while len(self._variants) > self.max_cached_variants:
+                    self._variants.popitem(last=False)
+        return variants
+
+    def invalidate(self, entry_id: int) -> None:
+        """Drop the cached variants of an entry, keyed by (entry_id, direction)"""
+        with self._lock:
+            for direction in ("forward", "reverse"):
+                self._variants.pop((entry_id, direction), None)
+
+    def is_match(
+        self, answer: str, expected: str, key: Optional[Hashable] = None
+    ) -> bool:
+        """Check a single answer"""
+        variants = self.variants(expected, key)
+        answer = self.normalize(answer)
+        if answer in variants:
+            return True
+        if self.mode == "exact":
+            return False
+
+        for variant in variants:
+            max_edits = self.allowed_edits(variant)
+            if (
+                max_edits
+                and Levenshtein.distance(answer, variant, score_cutoff=max_edits)
+                <= max_edits
+            ):
+                return True
+        return False
+
+    def match_many(
+        self,
+        answers: Sequence[str],
+        expected: Sequence[str],
+        keys: Optional[Sequence[Hashable]] = None,
+    ) -> List[bool]:
+        """Check a batch of answers against their expected answers pairwise"""
+        if len(answers) != len(expected):
+            raise ValueError("Aantal antwoorden en verwachte antwoorden verschilt")
+        keys = keys or [None] * len(answers)
+        return [self.is_match(a, e, k) for a, e, k in zip(answers, expected, keys)]
+
+
+def create_answer_matcher(config) -> AnswerMatcher:
+    """Create the answer matcher configured by ANSWER_MATCHING"""
+    return AnswerMatcher(
+        mode=config.get("ANSWER_MATCHING", "exact"),
+        max_error_rate=config.get("ANSWER_MAX_ERROR_RATE", 0.2),
+        min_fuzzy_length=config.get("ANSWER_MIN_FUZZY_LENGTH", 4),
+        max_cached_variants=config.get("ANSWER_VARIANT_CACHE_SIZE", 10000),
+    )
+
+
+def get_answer_matcher() -> AnswerMatcher:
+    """Get the answer matcher of the current app"""
+    return current_app.extensions["answer_matcher"]
@@ -0,0 +1,61 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.importer import FORMATS, detect_format, read_rows
+from app.services import LanguageService, ListService
+
+
+@click.command("import-list")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--list-id", type=int, help="Add the entries to this list")
+@click.option("--name", help="Create a new list with this name")
+@click.option("--source", "source_code", help="Source language code (new list)")
+@click.option("--target", "target_code", help="Target language code (new list)")
+@click.option("--format", "fmt", type=click.Choice(FORMATS), help="Default: extension")
+@click.option("--entry-type", type=click.Choice(["word", "sentence"]), default="word")
+@click.option("--header", is_flag=True, help="Skip the first row (CSV/TSV)")
+@click.option(
+    "--chunk-size", type=click.IntRange(min=1), help="Rows written per transaction"
+)
+@with_appcontext
+def import_list_command(
+    path, list_id, name, source_code, target_code, fmt, entry_type, header, chunk_size
+):
+    """Import a CSV, TSV or Anki .apkg file into a list"""
+    list_service = ListService()
+
+    if list_id is None:
+        if not all([name, source_code, target_code]):
+            raise click.UsageError(
+                "Give --list-id, or --name, --source and --target for a new list"
+            )
+        language_service = LanguageService()
+        source = language_service.get_language_by_code(source_code)
+        target = language_service.get_language_by_code(target_code)
+        if not source or not target:
+            raise click.BadParameter("Unknown language code")
+        list_id = list_service.create_list(name, source.id, target.id).id
+        click.echo(f"Created list '{name}' ({list_id})")
+
+    def report(result):
+        click.echo(
+            f"\r{result.read:,} rows read, {result.imported:,} imported, "
+            f"{result.duplicates:,} duplicates, {result.invalid:,} invalid "
+            f"({result.rate:,.0f} rows/s)",
+            nl=False,
+        )
+
+    try:
+        with open(path, "rb") as stream:
+            result = list_service.import_entries(
+                list_id,
+                read_rows(stream, fmt or detect_format(path), skip_header=header),
+                entry_type=entry_type,
+                chunk_size=chunk_size or current_app.config["IMPORT_CHUNK_SIZE"],
+                progress=report,
+            )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"\nDone in {result.elapsed:.1f}s")
@@ -1,5 +1,13 @@
 from flask_wtf import FlaskForm
-from wtforms import SelectField, StringField, SubmitField
+from flask_wtf.file import FileAllowed, FileField, FileRequired
+from wtforms import (
+    BooleanField,
+    SelectField,
+    SelectMultipleField,
+    StringField,
+    SubmitField,
+    TextAreaField,
+)
 from wtforms.validators import DataRequired, Length, ValidationError
 
 
@@ -83,6 +91,27 @@ class EditEntryForm(FlaskForm):
     submit = SubmitField("Bijwerken")
 
 
+class ImportEntriesForm(FlaskForm):
+    """Form voor het importeren van een CSV, TSV of Anki bestand"""
+
+    file = FileField(
+        "Bestand",
+        validators=[
+            FileRequired(),
+            FileAllowed(
+                ["csv", "tsv", "txt", "apkg"], "Alleen CSV, TSV of Anki (.apkg)"
+            ),
+        ],
+    )
+    entry_type = SelectField(
+        "Type",
+        choices=[("word", "Woorden"), ("sentence", "Zinnen")],
+        validators=[DataRequired()],
+    )
+    header = BooleanField("Eerste regel is een kop")
+    submit = SubmitField("Importeren")
+
+
 class DeleteForm(FlaskForm):
     """Form voor het verwijderen (alleen CSRF token)"""
 
@@ -159,6 +188,7 @@ class AIGenerateForm(FlaskForm):
         ],
         default="10",
     )
+    regenerate = BooleanField("Opnieuw genereren (niet uit de cache)")
     submit = SubmitField("Genereer Lijst")
 
     def __init__(self, providers=None, languages=None, *args, **kwargs):
@@ -183,6 +213,74 @@ class AIGenerateForm(FlaskForm):
             raise ValidationError("Bron- en doeltaal moeten verschillend zijn")
 
 
+class AIBatchGenerateForm(FlaskForm):
+    """Form voor het genereren van meerdere lijsten tegelijk met AI"""
+
+    providers = SelectMultipleField(
+        "AI Providers",
+        validators=[DataRequired()],
+    )
+    topics = TextAreaField(
+        "Onderwerpen (een per regel)",
+        validators=[DataRequired(), Length(min=1, max=4000)],
+    )
+    entry_type = SelectField(
+        "Type",
+        choices=[("word", "Woorden"), ("sentence", "Zinnen")],
+        validators=[DataRequired()],
+    )
+    source_language_id = SelectField(
+        "Brontaal",
+        coerce=int,
+        validators=[DataRequired()],
+    )
+    target_language_id = SelectField(
+        "Doeltaal",
+        coerce=int,
+        validators=[DataRequired()],
+    )
+    count = SelectField(
+        "Aantal items per onderwerp",
+        choices=[
+            ("", "Automatisch"),
+            ("5", "5"),
+            ("10", "10"),
+            ("15", "15"),
+            ("20", "20"),
+        ],
+        default="10",
+    )
+    regenerate = BooleanField("Opnieuw genereren (niet uit de cache)")
+    submit = SubmitField("Genereer Lijsten")
+
+    def __init__(self, providers=None, languages=None, *args, **kwargs):
+        super(AIBatchGenerateForm, self).__init__(*args, **kwargs)
+        if providers:
+            self.providers.choices = [
+                (p["key"], p["name"]) for p in providers if p["available"]
+            ]
+        else:
+            self.providers.choices = []
+        if languages:
+            lang_choices = [(lang.id, lang.name) for lang in languages]
+            self.source_language_id.choices = lang_choices
+            self.target_language_id.choices = lang_choices
+        else:
+            self.source_language_id.choices = []
+            self.target_language_id.choices = []
+
+    def validate_topics(self, field):
+        """Validate the length of every topic"""
+        for topic in field.data.splitlines():
+            if len(topic.strip()) > 200:
+                raise ValidationError("Een onderwerp mag maximaal 200 tekens zijn")
+
+    def validate_target_language_id(self, field):
+        """Validate that source and target languages are different"""
+        if field.data == self.source_language_id.data:
+            raise ValidationError("Bron- en doeltaal moeten verschillend zijn")
+
+
 class SaveGeneratedListForm(FlaskForm):
     """Form voor het opslaan van een gegenereerde lijst"""
 
@@ -0,0 +1,152 @@
+"""
+Streaming readers for vocabulary exports: CSV, TSV and Anki .apkg decks.
+
+Readers yield (source, target) pairs one at a time, so a file of a million
+rows is never held in memory; ListService.import_entries validates,
+deduplicates and writes them in chunks.
+"""
+
+import codecs
+import csv
+import html
+import itertools
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+import zipfile
+from typing import BinaryIO, Iterator, Tuple
+
+FORMATS = ("csv", "tsv", "apkg")
+
+# Anki's plain text export is tab separated
+EXTENSIONS = {".csv": "csv", ".tsv": "tsv", ".txt": "tsv", ".apkg": "apkg"}
+
+# Newest first: recent Anki versions also write a collection.anki2 that
+# only tells older versions to upgrade
+ANKI_COLLECTIONS = ("collection.anki21", "collection.anki2")
+# Zstandard compressed collection of Anki 2.1.50+, next to that dummy
+ANKI_COMPRESSED_COLLECTION = "collection.anki21b"
+
+TAG_RE = re.compile(r"<[^>]+>")
+BREAK_RE = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+SPACE_RE = re.compile(r"\s+")
+
+
+class ImportResult:
+    """Counters of an import, updated after every chunk"""
+
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Rows read per second"""
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def detect_format(filename: str) -> str:
+    """Get the import format from a file name"""
+    fmt = EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+    if not fmt:
+        raise ValueError(
+            f"Unsupported file type: {filename} (use .csv, .tsv, .txt or .apkg)"
+        )
+    return fmt
+
+
+def read_rows(
+    stream: BinaryIO, fmt: str, skip_header: bool = False
+) -> Iterator[Tuple[str, str]]:
+    """Yield (source, target) pairs from a binary file object"""
+    if fmt == "apkg":
+        return read_apkg(stream)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+    return read_delimited(stream, "\t" if fmt == "tsv" else ",", skip_header)
+
+
+def read_delimited(
+    stream: BinaryIO, delimiter: str, skip_header: bool = False
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the first two columns of every row of a CSV or TSV file
+
+    Leading lines starting with "#" are skipped (Anki writes its export
+    settings that way). Missing columns come out empty, so they count as
+    invalid.
+    """
+    lines = itertools.dropwhile(
+        lambda line: line.startswith("#"), codecs.iterdecode(stream, "utf-8-sig")
+    )
+    reader = csv.reader(lines, delimiter=delimiter)
+    try:
+        if skip_header:
+            next(reader, None)
+        for row in reader:
+            if not any(row):
+                continue
+            yield (row[0], row[1] if len(row) > 1 else "")
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Unreadable file near line {reader.line_num}: {e}")
+
+
+def clean_field(value: str) -> str:
+    """Turn an Anki field (HTML) into plain text"""
+    value = BREAK_RE.sub(" ", value)
+    value = html.unescape(TAG_RE.sub("", value))
+    return SPACE_RE.sub(" ", value).strip()
+
+
+def read_apkg(stream: BinaryIO) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the first two fields of every note in an Anki deck package
+
+    A package is a zip with the collection as SQLite database; it is
+    copied to a temporary file and the notes are read with a cursor.
+    """
+    try:
+        package = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise ValueError("Not a valid Anki package (.apkg)")
+
+    names = set(package.namelist())
+    # Checked first: the collection.anki2 next to it is only the dummy
+    if ANKI_COMPRESSED_COLLECTION in names:
+        raise ValueError(
+            "Compressed Anki packages are not supported, export the deck "
+            "with 'Support older Anki versions' enabled"
+        )
+    member = next((name for name in ANKI_COLLECTIONS if name in names), None)
+    if not member:
+        raise ValueError("Not a valid Anki package (.apkg)")
+
+    fd, path = tempfile.mkstemp(suffix=".anki2")
+    try:
+        with os.fdopen(fd, "wb") as collection, package.open(member) as source:
+            shutil.copyfileobj(source, collection)
+
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            for (fields,) in connection.execute("SELECT flds FROM notes ORDER BY id"):
+                fields = fields.split("\x1f")
+                yield (
+                    clean_field(fields[0]),
+                    clean_field(fields[1]) if len(fields) > 1 else "",
+                )
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Unreadable Anki collection: {e}")
+        finally:
+            connection.close()
+    finally:
+        os.remove(path)
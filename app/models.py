@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from sqlalchemy.ext.hybrid import hybrid_property
+
 from app import db
 
 
@@ -32,6 +34,18 @@ class Category(db.Model):
 
 class List(db.Model):
     __tablename__ = "lists"
+    __table_args__ = (
+        db.Index(
+            "ix_lists_source_language_id_created_at", "source_language_id", "created_at"
+        ),
+        db.Index(
+            "ix_lists_target_language_id_created_at", "target_language_id", "created_at"
+        ),
+        db.Index(
+            "ix_lists_category_id_created_at_id", "category_id", "created_at", "id"
+        ),
+        db.Index("ix_lists_created_at_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -67,9 +81,16 @@ class List(db.Model):
 
 class Entry(db.Model):
     __tablename__ = "entries"
+    __table_args__ = (
+        db.Index("ix_entries_created_at_id", "created_at", "id"),
+        # Duplicate checks of the importer
+        db.Index("ix_entries_list_id_source_word", "list_id", "source_word"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    list_id = db.Column(db.Integer, db.ForeignKey("lists.id"), nullable=False)
+    list_id = db.Column(
+        db.Integer, db.ForeignKey("lists.id"), nullable=False, index=True
+    )
     source_word = db.Column(db.String(200), nullable=False)
     target_word = db.Column(db.String(200), nullable=False)
     entry_type = db.Column(db.String(20), default="word", nullable=False)
@@ -93,9 +114,36 @@ class Entry(db.Model):
         """Total number of quiz attempts for this entry"""
         return self.correct_count + self.incorrect_count
 
+    @hybrid_property
+    def success_ratio(self):
+        """Fraction of correct answers (0-1), None before the first attempt"""
+        total = self.correct_count + self.incorrect_count
+        if total == 0:
+            return None
+        return self.correct_count / total
+
+    @success_ratio.expression
+    def success_ratio(cls):
+        # Rendered without bound parameters so queries match the
+        # expression of ix_entries_success_ratio_id exactly
+        total = cls.correct_count + cls.incorrect_count
+        return db.cast(cls.correct_count, db.Float).op("/", return_type=db.Float)(
+            db.func.nullif(total, db.literal_column("0"))
+        )
+
+
+# Smart practice reads the worst entries straight off this index
+db.Index("ix_entries_success_ratio_id", Entry.success_ratio, Entry.id)
+
 
 class QuizSession(db.Model):
     __tablename__ = "quiz_sessions"
+    __table_args__ = (
+        db.Index(
+            "ix_quiz_sessions_status_completed_at_id", "status", "completed_at", "id"
+        ),
+        db.Index("ix_quiz_sessions_status_started_at_id", "status", "started_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     quiz_type = db.Column(db.String(20), nullable=False)  # 'single' or 'mixed'
@@ -156,9 +204,11 @@ class QuizAnswer(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(
-        db.Integer, db.ForeignKey("quiz_sessions.id"), nullable=False
+        db.Integer, db.ForeignKey("quiz_sessions.id"), nullable=False, index=True
+    )
+    entry_id = db.Column(
+        db.Integer, db.ForeignKey("entries.id"), nullable=False, index=True
     )
-    entry_id = db.Column(db.Integer, db.ForeignKey("entries.id"), nullable=False)
     user_answer = db.Column(db.String(200), nullable=False)
     correct_answer = db.Column(db.String(200), nullable=False)
     is_correct = db.Column(db.Boolean, nullable=False)
@@ -179,12 +229,132 @@ class QuizSessionList(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(
-        db.Integer, db.ForeignKey("quiz_sessions.id"), nullable=False
+        db.Integer, db.ForeignKey("quiz_sessions.id"), nullable=False, index=True
+    )
+    list_id = db.Column(
+        db.Integer, db.ForeignKey("lists.id"), nullable=False, index=True
     )
-    list_id = db.Column(db.Integer, db.ForeignKey("lists.id"), nullable=False)
 
     # Relationship to list
     list = db.relationship("List", backref="quiz_sessions")
 
     def __repr__(self):
         return f"<QuizSessionList session={self.session_id} list={self.list_id}>"
+
+
+class ReviewSchedule(db.Model):
+    """Spaced-repetition state of one entry in one quiz direction"""
+
+    __tablename__ = "review_schedules"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "entry_id", "direction", name="uq_review_schedules_entry_id_direction"
+        ),
+        db.Index("ix_review_schedules_due_at_id", "due_at", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(
+        db.Integer, db.ForeignKey("entries.id", ondelete="CASCADE"), nullable=False
+    )
+    direction = db.Column(db.String(20), nullable=False)  # 'forward' or 'reverse'
+    ease = db.Column(db.Float, nullable=False, default=2.5)
+    interval_days = db.Column(db.Float, nullable=False, default=0.0)
+    repetitions = db.Column(db.Integer, nullable=False, default=0)
+    lapses = db.Column(db.Integer, nullable=False, default=0)
+    due_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_reviewed_at = db.Column(db.DateTime)
+
+    entry = db.relationship(
+        "Entry",
+        backref=db.backref(
+            "review_schedules", cascade="all, delete-orphan", passive_deletes=True
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ReviewSchedule {self.entry_id} {self.direction} due={self.due_at}>"
+
+
+class CachedAIResponse(db.Model):
+    """Generated list items, keyed by a hash of the provider and prompt"""
+
+    __tablename__ = "ai_response_cache"
+
+    key = db.Column(db.String(64), primary_key=True)
+    provider = db.Column(db.String(20), nullable=False)
+    items = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = db.Column(
+        db.DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+    hits = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<CachedAIResponse {self.provider} {self.key[:12]}>"
+
+
+class AIGenerationBatch(db.Model):
+    """Generation jobs started together, previewed as one merged list"""
+
+    __tablename__ = "ai_generation_batches"
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    jobs = db.relationship(
+        "AIGenerationJob",
+        backref="batch",
+        order_by="AIGenerationJob.id",
+        lazy="selectin",
+    )
+
+    @property
+    def is_finished(self):
+        """Whether all jobs are done or failed"""
+        return all(job.is_finished for job in self.jobs)
+
+    def __repr__(self):
+        return f"<AIGenerationBatch {self.id}>"
+
+
+class AIGenerationJob(db.Model):
+    """A list generation running in the background"""
+
+    __tablename__ = "ai_generation_jobs"
+    __table_args__ = (db.Index("ix_ai_generation_jobs_status_id", "status", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(
+        db.Integer, db.ForeignKey("ai_generation_batches.id"), nullable=True, index=True
+    )
+    status = db.Column(
+        db.String(20), nullable=False, default="pending"
+    )  # 'pending', 'running', 'done', 'failed'
+    provider = db.Column(db.String(20), nullable=False)
+    topic = db.Column(db.String(200), nullable=False)
+    source_language_id = db.Column(
+        db.Integer, db.ForeignKey("languages.id"), nullable=False
+    )
+    target_language_id = db.Column(
+        db.Integer, db.ForeignKey("languages.id"), nullable=False
+    )
+    entry_type = db.Column(db.String(20), nullable=False)
+    count = db.Column(db.Integer, nullable=True)  # None lets the provider decide
+    regenerate = db.Column(db.Boolean, nullable=False, default=False)
+    items = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    source_language = db.relationship("Language", foreign_keys=[source_language_id])
+    target_language = db.relationship("Language", foreign_keys=[target_language_id])
+
+    @property
+    def is_finished(self):
+        """Whether the job is done or failed"""
+        return self.status in ("done", "failed")
+
+    def __repr__(self):
+        return f"<AIGenerationJob {self.id} {self.status}>"
@@ -0,0 +1,85 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import literal, tuple_
+
+
+class Page:
+    """One page of keyset-paginated results"""
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode a (timestamp, id) position as an opaque URL-safe cursor"""
+    raw = f"{sort_value.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor, returning None when it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def keyset_paginate(
+    query,
+    sort_column,
+    id_column,
+    after: Optional[str] = None,
+    limit: int = 50,
+    key: Optional[Callable[[Any], Tuple[datetime, int]]] = None,
+) -> Page:
+    """Return the page of `query` that follows `after`, newest first
+
+    Rows are ordered by (sort_column, id_column) descending and the cursor
+    position is applied as a row-value comparison, so every page is an
+    index range scan instead of an OFFSET that grows with depth. Rows
+    without a sort value have no position, so they are left out.
+    """
+    if key is None:
+
+        def key(row):
+            return getattr(row, sort_column.key), getattr(row, id_column.key)
+
+    query = query.filter(sort_column.isnot(None))
+    position = decode_cursor(after)
+    if position:
+        sort_value, row_id = position
+        query = query.filter(
+            tuple_(sort_column, id_column)
+            < tuple_(literal(sort_value, sort_column.type), literal(row_id))
+        )
+
+    rows = (
+        query.order_by(None)
+        .order_by(sort_column.desc(), id_column.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*key(rows[-1]))
+    return Page(rows, next_cursor)
@@ -0,0 +1,97 @@
+import base64
+from array import array
+from typing import Iterable, Iterator, List, Tuple, Union
+
+DIRECTIONS = ("forward", "reverse")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class QuestionQueue:
+    """Compact queue of quiz questions
+
+    Entry ids are kept in an ``array('I')`` and directions in a bitset
+    (bit set = reverse). The serialized form is a base64 string of
+    varints: the question count, the lowest entry id, each entry id as an
+    offset from that lowest id, then the direction bits. Quiz entries tend
+    to have nearby ids, so most offsets fit in one or two bytes.
+    """
+
+    def __init__(self, questions: Iterable[Tuple[int, str]] = ()):
+        self.entry_ids = array("I")
+        self.direction_bits = bytearray()
+        for entry_id, direction in questions:
+            self.append(entry_id, direction)
+
+    def __len__(self) -> int:
+        return len(self.entry_ids)
+
+    def __getitem__(self, index: int) -> Tuple[int, str]:
+        entry_id = self.entry_ids[index]
+        if index < 0:
+            index += len(self.entry_ids)
+        reverse = self.direction_bits[index >> 3] >> (index & 7) & 1
+        return entry_id, DIRECTIONS[reverse]
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for index in range(len(self.entry_ids)):
+            yield self[index]
+
+    def append(self, entry_id: int, direction: str) -> None:
+        """Add a question to the end of the queue"""
+        index = len(self.entry_ids)
+        if index & 7 == 0:
+            self.direction_bits.append(0)
+        if direction == "reverse":
+            self.direction_bits[index >> 3] |= 1 << (index & 7)
+        self.entry_ids.append(entry_id)
+
+    def encode(self) -> str:
+        """Serialize the queue to a base64 string"""
+        out = bytearray()
+        base = min(self.entry_ids) if self.entry_ids else 0
+        _write_varint(out, len(self.entry_ids))
+        _write_varint(out, base)
+        for entry_id in self.entry_ids:
+            _write_varint(out, entry_id - base)
+        out += self.direction_bits
+        return base64.b64encode(bytes(out)).decode("ascii")
+
+    @classmethod
+    def decode(cls, encoded: str) -> "QuestionQueue":
+        """Deserialize a queue created by encode()"""
+        data = base64.b64decode(encoded)
+        count, pos = _read_varint(data, 0)
+        base, pos = _read_varint(data, pos)
+        queue = cls()
+        for _ in range(count):
+            offset, pos = _read_varint(data, pos)
+            queue.entry_ids.append(base + offset)
+        queue.direction_bits = bytearray(data[pos : pos + (count + 7) // 8])
+        return queue
+
+    @classmethod
+    def load(cls, value: Union[str, List[dict], None]) -> "QuestionQueue":
+        """Load a queue from its encoded form or the legacy list of dicts"""
+        if not value:
+            return cls()
+        if isinstance(value, str):
+            return cls.decode(value)
+        return cls((q["entry_id"], q["direction"]) for q in value)
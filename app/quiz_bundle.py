@@ -0,0 +1,35 @@
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional
+
+# What a quiz page needs to show a question, without touching the database
+BundledEntry = namedtuple(
+    "BundledEntry", ["id", "source_word", "target_word", "source_language"]
+)
+
+
+def build_bundle(entries: Iterable) -> Dict[str, List[str]]:
+    """
+    Freeze the question data of quiz entries
+
+    The bundle maps each entry id (as a string, so it survives JSON) to
+    [source_word, target_word, source language name]. Entries need their
+    list and its source language loaded.
+    """
+    return {
+        str(entry.id): [
+            entry.source_word,
+            entry.target_word,
+            entry.list.source_language.name,
+        ]
+        for entry in entries
+    }
+
+
+def get_bundled_entry(
+    bundle: Dict[str, List[str]], entry_id: int
+) -> Optional[BundledEntry]:
+    """Look up an entry in a bundle, None if it is not (or no longer) there"""
+    item = bundle.get(str(entry_id))
+    if item is None:
+        return None
+    return BundledEntry(entry_id, *item)
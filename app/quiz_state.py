@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from flask import current_app
+
+
+class QuizStateStore(ABC):
+    """Abstract server-side store for in-progress quiz state
+
+    State is keyed by the QuizSession id, so the cookie only has to carry
+    that id no matter how long the quiz is.
+    """
+
+    @abstractmethod
+    def get(self, session_id: int) -> Optional[Dict]:
+        """Get the stored state for a quiz session"""
+        pass
+
+    @abstractmethod
+    def set(self, session_id: int, state: Dict) -> None:
+        """Store the state for a quiz session"""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: int) -> None:
+        """Remove the state for a quiz session"""
+        pass
+
+
+class MemoryQuizStateStore(QuizStateStore):
+    """In-process LRU store (single worker, lost on restart)"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: int) -> Optional[Dict]:
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is None:
+                return None
+            self._states.move_to_end(session_id)
+            # Hand out a copy so callers can't mutate the cached state
+            return json.loads(state)
+
+    def set(self, session_id: int, state: Dict) -> None:
+        with self._lock:
+            self._states[session_id] = json.dumps(state)
+            self._states.move_to_end(session_id)
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+
+    def delete(self, session_id: int) -> None:
+        with self._lock:
+            self._states.pop(session_id, None)
+
+
+class SQLiteQuizStateStore(QuizStateStore):
+    """Store backed by a local SQLite file, shared by all workers on a host
+
+    State not written for `ttl` seconds is expired, like the Redis keys:
+    reads ignore it and every write deletes it.
+    """
+
+    def __init__(
+        self, path: str, ttl: int = 86400, clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS quiz_state ("
+            "session_id INTEGER PRIMARY KEY, data TEXT NOT NULL, updated_at REAL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_quiz_state_updated_at "
+            "ON quiz_state (updated_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, session_id: int) -> Optional[Dict]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT data FROM quiz_state WHERE session_id = ? AND updated_at > ?",
+                (session_id, self.clock() - self.ttl),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def set(self, session_id: int, state: Dict) -> None:
+        now = self.clock()
+        connection = self._connection()
+        connection.execute(
+            "DELETE FROM quiz_state WHERE updated_at <= ?", (now - self.ttl,)
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO quiz_state (session_id, data, updated_at) "
+            "VALUES (?, ?, ?)",
+            (session_id, json.dumps(state), now),
+        )
+
+    def delete(self, session_id: int) -> None:
+        self._connection().execute(
+            "DELETE FROM quiz_state WHERE session_id = ?", (session_id,)
+        )
+
+
+class RedisQuizStateStore(QuizStateStore):
+    """Store backed by a Redis-compatible server (get/set/delete with expiry)"""
+
+    def __init__(self, client, prefix: str = "magistra:quiz:", ttl: int = 86400):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, session_id: int) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def get(self, session_id: int) -> Optional[Dict]:
+        data = self.client.get(self._key(session_id))
+        return json.loads(data) if data else None
+
+    def set(self, session_id: int, state: Dict) -> None:
+        self.client.set(self._key(session_id), json.dumps(state), ex=self.ttl)
+
+    def delete(self, session_id: int) -> None:
+        self.client.delete(self._key(session_id))
+
+
+def create_quiz_state_store(config) -> QuizStateStore:
+    """Create the quiz state store configured by QUIZ_STATE_BACKEND"""
+    backend = config.get("QUIZ_STATE_BACKEND", "memory")
+
+    if backend == "memory":
+        return MemoryQuizStateStore(config.get("QUIZ_STATE_MAX_ENTRIES", 1000))
+
+    if backend == "sqlite":
+        return SQLiteQuizStateStore(
+            config["QUIZ_STATE_SQLITE_PATH"], ttl=config.get("QUIZ_STATE_TTL", 86400)
+        )
+
+    if backend == "redis":
+        import redis
+
+        client = redis.Redis.from_url(config["QUIZ_STATE_REDIS_URL"])
+        return RedisQuizStateStore(client, ttl=config.get("QUIZ_STATE_TTL", 86400))
+
+    raise ValueError(f"Onbekende quiz state backend: {backend}")
+
+
+def get_quiz_state_store() -> QuizStateStore:
+    """Get the quiz state store of the current app"""
+    return current_app.extensions["quiz_state"]
@@ -1,8 +1,23 @@
+import io
+from datetime import datetime
+from typing import Dict
 from typing import List as ListType
-from typing import Optional
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import contains_eager, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app import db
-from app.models import Category, Entry, Language, List
+from app.models import (
+    AIGenerationBatch,
+    AIGenerationJob,
+    Category,
+    Entry,
+    Language,
+    List,
+    ReviewSchedule,
+)
+from app.pagination import Page, keyset_paginate
 
 
 class BaseRepository:
@@ -19,11 +34,18 @@ class BaseRepository:
         """Get all records"""
         return self.model.query.all()
 
-    def create(self, **kwargs) -> object:
-        """Create a new record"""
+    def count(self) -> int:
+        """Count all records"""
+        return db.session.query(db.func.count(self.model.id)).scalar()
+
+    def create(self, commit: bool = True, **kwargs) -> object:
+        """Create a new record, only flushed (to get its id) without `commit`"""
         instance = self.model(**kwargs)
         db.session.add(instance)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
         return instance
 
     def update(self, instance: object, **kwargs) -> object:
@@ -71,12 +93,12 @@ class ListRepository(BaseRepository):
     def __init__(self):
         super().__init__(List)
 
-    def get_all_ordered(
+    def _ordered_query(
         self,
         language: Optional[Language] = None,
         category_id: Optional[int] = None,
-    ) -> ListType["List"]:
-        """Get all lists ordered by creation date (newest first), optionally filtered"""
+    ):
+        """Build the (optionally filtered) lists query, newest first"""
         query = self.model.query
         if language:
             # Filter op lijsten waar de taal voorkomt in source OF target
@@ -88,7 +110,74 @@ class ListRepository(BaseRepository):
             )
         if category_id:
             query = query.filter_by(category_id=category_id)
-        return query.order_by(self.model.created_at.desc()).all()
+        return query.order_by(self.model.created_at.desc())
+
+    def get_all_ordered(
+        self,
+        language: Optional[Language] = None,
+        category_id: Optional[int] = None,
+    ) -> ListType["List"]:
+        """Get all lists ordered by creation date (newest first), optionally filtered
+
+        Both languages are joined-loaded and each list gets an ``entry_count``
+        from a single grouped subquery, so rendering the lists doesn't load
+        any entries.
+        """
+        entry_counts = (
+            db.session.query(
+                Entry.list_id, db.func.count(Entry.id).label("entry_count")
+            )
+            .group_by(Entry.list_id)
+            .subquery()
+        )
+        query = (
+            self._ordered_query(language=language, category_id=category_id)
+            .options(
+                joinedload(self.model.source_language),
+                joinedload(self.model.target_language),
+            )
+            .outerjoin(entry_counts, entry_counts.c.list_id == self.model.id)
+            .add_columns(db.func.coalesce(entry_counts.c.entry_count, 0))
+        )
+
+        lists = []
+        for vocab_list, entry_count in query.all():
+            vocab_list.entry_count = entry_count
+            lists.append(vocab_list)
+        return lists
+
+    def get_page(
+        self,
+        language: Optional[Language] = None,
+        category_id: Optional[int] = None,
+        after: Optional[str] = None,
+        limit: int = 50,
+    ) -> Page:
+        """Get one page of lists (newest first) after the given cursor
+
+        Entry counts are fetched for the lists on the page only, so a page
+        costs the same no matter how deep it is or how large the table grows.
+        """
+        query = self._ordered_query(language=language, category_id=category_id)
+        query = query.options(
+            joinedload(self.model.source_language),
+            joinedload(self.model.target_language),
+        )
+        page = keyset_paginate(
+            query, self.model.created_at, self.model.id, after=after, limit=limit
+        )
+
+        entry_counts = {}
+        if page.items:
+            entry_counts = dict(
+                db.session.query(Entry.list_id, db.func.count(Entry.id))
+                .filter(Entry.list_id.in_([vocab_list.id for vocab_list in page]))
+                .group_by(Entry.list_id)
+                .all()
+            )
+        for vocab_list in page:
+            vocab_list.entry_count = entry_counts.get(vocab_list.id, 0)
+        return page
 
     def get_with_entries(self, list_id: int) -> Optional["List"]:
         """Get a list with all its entries loaded"""
@@ -100,9 +189,11 @@ class ListRepository(BaseRepository):
         source_language_id: int,
         target_language_id: int,
         category_id: Optional[int] = None,
+        commit: bool = True,
     ) -> "List":
         """Create a new list"""
         return self.create(
+            commit=commit,
             name=name,
             source_language_id=source_language_id,
             target_language_id=target_language_id,
@@ -110,6 +201,16 @@ class ListRepository(BaseRepository):
         )
 
 
+def _copy_escape(value: str) -> str:
+    """Escape a value for COPY's text format"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
 class EntryRepository(BaseRepository):
     """Repository for Entry operations"""
 
@@ -131,23 +232,311 @@ class EntryRepository(BaseRepository):
             entry_type=entry_type,
         )
 
-    def update_score(self, entry: Entry, is_correct: bool) -> Entry:
-        """Update entry score based on quiz answer"""
+    def bulk_create_entries(
+        self, list_id: int, rows: ListType[Tuple[str, str, str]], commit: bool = True
+    ) -> int:
+        """
+        Insert (source_word, target_word, entry_type) rows with one statement
+
+        The rows are sent as a single executemany, which SQLAlchemy turns
+        into multi-row INSERT ... VALUES batches, instead of an INSERT and
+        a commit per entry.
+        """
+        if rows:
+            db.session.execute(
+                db.insert(self.model),
+                [
+                    {
+                        "list_id": list_id,
+                        "source_word": source_word,
+                        "target_word": target_word,
+                        "entry_type": entry_type,
+                    }
+                    for source_word, target_word, entry_type in rows
+                ],
+            )
+        if commit:
+            db.session.commit()
+        return len(rows)
+
+    def get_existing_pairs(self, list_id: int, source_words: ListType[str]) -> set:
+        """Get the (source_word, target_word) pairs of a list among these sources"""
+        if not source_words:
+            return set()
+        rows = db.session.execute(
+            db.select(self.model.source_word, self.model.target_word).where(
+                self.model.list_id == list_id,
+                self.model.source_word.in_(source_words),
+            )
+        )
+        return {tuple(row) for row in rows}
+
+    def copy_entries(self, list_id: int, rows: ListType[Tuple[str, str, str]]) -> int:
+        """
+        Insert many (source_word, target_word, entry_type) rows, fastest way
+
+        PostgreSQL gets them through COPY; other databases through
+        bulk_create_entries. Nothing is committed.
+        """
+        connection = db.session.connection()
+        if connection.dialect.name != "postgresql" or not rows:
+            return self.bulk_create_entries(list_id, rows, commit=False)
+
+        created_at = datetime.utcnow().isoformat()
+        buffer = io.StringIO()
+        for source_word, target_word, entry_type in rows:
+            fields = (str(list_id), source_word, target_word, entry_type, created_at)
+            buffer.write("\t".join(_copy_escape(field) for field in fields))
+            buffer.write("\t0\t0\n")
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                "COPY entries (list_id, source_word, target_word, entry_type, "
+                "created_at, correct_count, incorrect_count) FROM STDIN",
+                buffer,
+            )
+        finally:
+            cursor.close()
+        return len(rows)
+
+    def update_score(
+        self, entry: Entry, is_correct: bool, commit: bool = True
+    ) -> Entry:
+        """Update entry score based on quiz answer
+
+        The counter is incremented in SQL (UPDATE ... RETURNING) so that
+        concurrent answers on the same entry never overwrite each other.
+        """
         if is_correct:
-            entry.correct_count += 1
+            self.apply_score_deltas({entry.id: (1, 0)}, commit=commit)
         else:
-            entry.incorrect_count += 1
-        db.session.commit()
+            self.apply_score_deltas({entry.id: (0, 1)}, commit=commit)
         return entry
 
+    def apply_score_deltas(
+        self, deltas: Dict[int, Tuple[int, int]], commit: bool = True
+    ) -> Dict[int, Tuple[int, int]]:
+        """
+        Add (correct, incorrect) deltas to many entries in one UPDATE
+
+        Returns the new (correct_count, incorrect_count) per entry id. Entries
+        already loaded in the session get the new values without a refresh.
+        """
+        if not deltas:
+            return {}
+
+        correct_delta = db.case(
+            {entry_id: delta[0] for entry_id, delta in deltas.items()},
+            value=self.model.id,
+            else_=0,
+        )
+        incorrect_delta = db.case(
+            {entry_id: delta[1] for entry_id, delta in deltas.items()},
+            value=self.model.id,
+            else_=0,
+        )
+        statement = (
+            db.update(self.model)
+            .where(self.model.id.in_(list(deltas)))
+            .values(
+                correct_count=db.func.coalesce(self.model.correct_count, 0)
+                + correct_delta,
+                incorrect_count=db.func.coalesce(self.model.incorrect_count, 0)
+                + incorrect_delta,
+            )
+            .returning(
+                self.model.id, self.model.correct_count, self.model.incorrect_count
+            )
+            .execution_options(synchronize_session=False)
+        )
+        counts = {
+            row.id: (row.correct_count, row.incorrect_count)
+            for row in db.session.execute(statement)
+        }
+
+        for entry_id, (correct_count, incorrect_count) in counts.items():
+            entry = db.session.identity_map.get(
+                db.inspect(self.model).identity_key_from_primary_key((entry_id,))
+            )
+            if entry is not None:
+                set_committed_value(entry, "correct_count", correct_count)
+                set_committed_value(entry, "incorrect_count", incorrect_count)
+
+        if commit:
+            db.session.commit()
+        return counts
+
     def get_entries_by_ids(self, entry_ids: ListType[int]) -> ListType[Entry]:
         """Get multiple entries by their IDs"""
         return self.model.query.filter(self.model.id.in_(entry_ids)).all()
 
+    def get_quiz_entries(
+        self,
+        entry_ids: Optional[ListType[int]] = None,
+        list_ids: Optional[ListType[int]] = None,
+    ) -> ListType[Entry]:
+        """Get entries by id or by list with the list and source language loaded"""
+        query = self.model.query.options(
+            joinedload(self.model.list).joinedload(List.source_language)
+        )
+        if entry_ids is not None:
+            query = query.filter(self.model.id.in_(set(entry_ids)))
+        if list_ids is not None:
+            query = query.filter(self.model.list_id.in_(list_ids))
+        return query.all()
+
+    def get_page_with_list(self, after: Optional[str] = None, limit: int = 50) -> Page:
+        """Get one page of entries (newest first) after the given cursor"""
+        query = self.model.query.join(List).options(contains_eager(self.model.list))
+        return keyset_paginate(
+            query, self.model.created_at, self.model.id, after=after, limit=limit
+        )
+
     def get_all_with_list(self) -> ListType[Entry]:
         """Get all entries with their list data, ordered by creation date"""
-        return (
-            self.model.query.join(List)
-            .order_by(self.model.created_at.desc())
+        return self.model.query.join(List).order_by(self.model.created_at.desc()).all()
+
+
+class ReviewScheduleRepository(BaseRepository):
+    """Repository for spaced-repetition schedules"""
+
+    def __init__(self):
+        super().__init__(ReviewSchedule)
+
+    def get_entry_with_schedule(
+        self, entry_id: int, direction: str
+    ) -> Tuple[Optional[Entry], Optional[ReviewSchedule]]:
+        """Get an entry and its schedule for one direction in a single query"""
+        row = (
+            db.session.query(Entry, self.model)
+            .outerjoin(
+                self.model,
+                db.and_(
+                    self.model.entry_id == Entry.id,
+                    self.model.direction == direction,
+                ),
+            )
+            .filter(Entry.id == entry_id)
+            .first()
+        )
+        if row is None:
+            return None, None
+        return row[0], row[1]
+
+    def get_entries_with_schedules(
+        self, entry_ids: ListType[int]
+    ) -> Tuple[Dict[int, Entry], Dict[Tuple[int, str], ReviewSchedule]]:
+        """
+        Get entries and all their schedules in a single query
+
+        Returns entries by id and schedules by (entry_id, direction).
+        """
+        entries, schedules = {}, {}
+        if not entry_ids:
+            return entries, schedules
+        rows = (
+            db.session.query(Entry, self.model)
+            .outerjoin(self.model, self.model.entry_id == Entry.id)
+            .filter(Entry.id.in_(set(entry_ids)))
             .all()
         )
+        for entry, schedule in rows:
+            entries[entry.id] = entry
+            if schedule is not None:
+                schedules[(entry.id, schedule.direction)] = schedule
+        return entries, schedules
+
+    def get_due(
+        self,
+        now: datetime,
+        list_id: Optional[int] = None,
+        limit: int = 15,
+    ) -> ListType[ReviewSchedule]:
+        """
+        Get the schedules that are due, most overdue first
+
+        Reads a range of ix_review_schedules_due_at_id and stops after
+        `limit` rows, so the cost does not grow with the number of entries.
+        """
+        query = (
+            self.model.query.join(Entry)
+            .options(contains_eager(self.model.entry))
+            .filter(self.model.due_at <= now)
+        )
+        if list_id:
+            query = query.filter(Entry.list_id == list_id)
+        return query.order_by(self.model.due_at, self.model.id).limit(limit).all()
+
+
+class AIGenerationJobRepository(BaseRepository):
+    """Repository for background list generations"""
+
+    def __init__(self):
+        super().__init__(AIGenerationJob)
+
+    def count_unfinished(self, since: datetime) -> int:
+        """Count the pending and running jobs created after `since`"""
+        return (
+            db.session.query(db.func.count(self.model.id))
+            .filter(
+                self.model.status.in_(("pending", "running")),
+                self.model.created_at > since,
+            )
+            .scalar()
+        )
+
+    def create_batch(self, jobs: ListType[dict]) -> AIGenerationBatch:
+        """Create a batch with a job for each set of job attributes"""
+        batch = AIGenerationBatch(jobs=[self.model(**job) for job in jobs])
+        db.session.add(batch)
+        db.session.commit()
+        return batch
+
+    def get_batch(self, batch_id: int) -> Optional[AIGenerationBatch]:
+        """Get a batch with its jobs"""
+        return db.session.get(AIGenerationBatch, batch_id)
+
+    def start(self, job_id: int, now: datetime) -> Optional[AIGenerationJob]:
+        """Mark a pending job as running, None if it was already picked up"""
+        claimed = self.model.query.filter(
+            self.model.id == job_id, self.model.status == "pending"
+        ).update({"status": "running", "started_at": now}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return None
+        return db.session.get(self.model, job_id)
+
+    def record_items(self, job_id: int, items: ListType[dict]) -> bool:
+        """Store the items so far of a running job, False if it is no longer running"""
+        updated = self.model.query.filter(
+            self.model.id == job_id, self.model.status == "running"
+        ).update({"items": items}, synchronize_session=False)
+        db.session.commit()
+        return bool(updated)
+
+    def finish(
+        self,
+        job_id: int,
+        status: str,
+        now: datetime,
+        error: Optional[str] = None,
+        unfinished: Tuple[str, ...] = ("running",),
+        items: Optional[ListType[dict]] = None,
+    ) -> bool:
+        """
+        Mark a job done or failed, False if it was not in an `unfinished` state
+
+        Conditional like start(), so a job that timed out is not marked done
+        by its worker afterwards, and a job that just finished does not time out.
+        The worker passes all its `items`, record_items() only saves progress.
+        """
+        values = {"status": status, "error": error, "finished_at": now}
+        if items is not None:
+            values["items"] = items
+        updated = self.model.query.filter(
+            self.model.id == job_id, self.model.status.in_(unfinished)
+        ).update(values, synchronize_session=False)
+        db.session.commit()
+        return bool(updated)
@@ -2,13 +2,21 @@ from flask import Blueprint
 
 from app.views import (
     AddEntryView,
+    AIBatchGenerateView,
+    AIBatchStatusAPIView,
+    AIBatchView,
+    AICacheStatsAPIView,
+    AIGenerateJobView,
     AIGenerateView,
+    AIJobEventsAPIView,
+    AIJobStatusAPIView,
     AISaveListView,
     AllEntriesView,
     DeleteEntryView,
     DeleteListView,
     EditEntryView,
     EditListView,
+    ImportEntriesView,
     IndexView,
     ListDetailView,
     MixedQuizAnswerView,
@@ -16,6 +24,7 @@ from app.views import (
     MixedQuizStartView,
     MixedQuizView,
     NewListView,
+    QuizAnswersAPIView,
     QuizAnswerView,
     QuizHistoryDetailView,
     QuizHistoryView,
@@ -41,6 +50,9 @@ bp.add_url_rule(
 bp.add_url_rule(
     "/list/<int:list_id>/entry", view_func=AddEntryView.as_view("add_entry")
 )
+bp.add_url_rule(
+    "/list/<int:list_id>/import", view_func=ImportEntriesView.as_view("import_entries")
+)
 bp.add_url_rule(
     "/entry/<int:entry_id>/edit",
     view_func=EditEntryView.as_view("edit_entry"),
@@ -79,6 +91,13 @@ bp.add_url_rule(
     methods=["POST"],
 )
 
+# JSON API
+bp.add_url_rule(
+    "/api/quiz/<int:session_id>/answers",
+    view_func=QuizAnswersAPIView.as_view("api_quiz_answers"),
+    methods=["POST"],
+)
+
 # Quiz history routes
 bp.add_url_rule("/quiz/history", view_func=QuizHistoryView.as_view("quiz_history"))
 bp.add_url_rule(
@@ -108,8 +127,37 @@ bp.add_url_rule(
     view_func=AIGenerateView.as_view("ai_generate"),
     methods=["GET", "POST"],
 )
+bp.add_url_rule(
+    "/ai/jobs/<int:job_id>",
+    view_func=AIGenerateJobView.as_view("ai_generate_job"),
+)
+bp.add_url_rule(
+    "/ai/batch",
+    view_func=AIBatchGenerateView.as_view("ai_batch_generate"),
+    methods=["GET", "POST"],
+)
+bp.add_url_rule(
+    "/ai/batches/<int:batch_id>",
+    view_func=AIBatchView.as_view("ai_batch"),
+)
 bp.add_url_rule(
     "/ai/save",
     view_func=AISaveListView.as_view("ai_save_list"),
     methods=["POST"],
 )
+bp.add_url_rule(
+    "/api/ai/cache",
+    view_func=AICacheStatsAPIView.as_view("api_ai_cache"),
+)
+bp.add_url_rule(
+    "/api/ai/jobs/<int:job_id>",
+    view_func=AIJobStatusAPIView.as_view("api_ai_job"),
+)
+bp.add_url_rule(
+    "/api/ai/jobs/<int:job_id>/events",
+    view_func=AIJobEventsAPIView.as_view("api_ai_job_events"),
+)
+bp.add_url_rule(
+    "/api/ai/batches/<int:batch_id>",
+    view_func=AIBatchStatusAPIView.as_view("api_ai_batch"),
+)
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from typing import Tuple
+
+# SM-2 constants, see https://super-memory.com/english/ol/sm2.htm
+INITIAL_EASE = 2.5
+MINIMUM_EASE = 1.3
+
+# The quiz only knows right or wrong, mapped onto SM-2's 0-5 quality scale
+QUALITY_CORRECT = 4
+QUALITY_INCORRECT = 1
+
+# A forgotten entry comes back within the same practice day
+RELEARN_DELAY = timedelta(minutes=10)
+
+
+def next_interval(
+    ease: float, interval_days: float, repetitions: int, quality: int
+) -> Tuple[float, float, int]:
+    """
+    Apply one SM-2 review
+
+    Returns:
+        Tuple of (ease, interval_days, repetitions) after the review. An
+        interval of 0 means the entry has to be relearned.
+    """
+    ease = ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    ease = max(MINIMUM_EASE, ease)
+
+    if quality < 3:
+        return ease, 0.0, 0
+
+    if repetitions == 0:
+        interval_days = 1.0
+    elif repetitions == 1:
+        interval_days = 6.0
+    else:
+        interval_days = interval_days * ease
+    return ease, interval_days, repetitions + 1
+
+
+def review(schedule, is_correct: bool, now: datetime):
+    """Update a ReviewSchedule in place after answering its entry"""
+    quality = QUALITY_CORRECT if is_correct else QUALITY_INCORRECT
+    schedule.ease, schedule.interval_days, schedule.repetitions = next_interval(
+        schedule.ease if schedule.ease is not None else INITIAL_EASE,
+        schedule.interval_days or 0.0,
+        schedule.repetitions or 0,
+        quality,
+    )
+    if is_correct:
+        schedule.due_at = now + timedelta(days=schedule.interval_days)
+    else:
+        schedule.lapses = (schedule.lapses or 0) + 1
+        schedule.due_at = now + RELEARN_DELAY
+    schedule.last_reviewed_at = now
+    return schedule
@@ -1,11 +1,21 @@
+import itertools
 import random
-from datetime import datetime
-from typing import Dict
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator
 from typing import List as ListType
 from typing import Optional, Tuple
 
+from sqlalchemy.orm import selectinload
+
 from app import db
+from app.ai_jobs import get_ai_job_runner
+from app.ai_service import AIService
+from app.answer_matching import get_answer_matcher
+from app.importer import ImportResult
 from app.models import (
+    AIGenerationBatch,
+    AIGenerationJob,
     Category,
     Entry,
     Language,
@@ -13,13 +23,21 @@ from app.models import (
     QuizAnswer,
     QuizSession,
     QuizSessionList,
+    ReviewSchedule,
 )
+from app.pagination import Page, keyset_paginate
+from app.question_queue import QuestionQueue
+from app.quiz_bundle import BundledEntry, build_bundle, get_bundled_entry
+from app.quiz_state import get_quiz_state_store
 from app.repositories import (
+    AIGenerationJobRepository,
     CategoryRepository,
     EntryRepository,
     LanguageRepository,
     ListRepository,
+    ReviewScheduleRepository,
 )
+from app.scheduler import review
 
 
 class LanguageService:
@@ -36,6 +54,10 @@ class LanguageService:
         """Get a specific language"""
         return self.language_repo.get_by_id(language_id)
 
+    def get_language_by_code(self, code: str) -> Optional[Language]:
+        """Get a language by its code"""
+        return self.language_repo.get_by_code(code)
+
 
 class CategoryService:
     """Service for category operations"""
@@ -64,6 +86,7 @@ class ListService:
     def __init__(self):
         self.list_repo = ListRepository()
         self.entry_repo = EntryRepository()
+        self.answer_matcher = get_answer_matcher()
 
     def get_all_lists(
         self,
@@ -84,16 +107,37 @@ class ListService:
         """Get a specific entry"""
         return self.entry_repo.get_by_id(entry_id)
 
+    def get_lists_page(
+        self,
+        language: Optional[Language] = None,
+        category_id: Optional[int] = None,
+        after: Optional[str] = None,
+        limit: int = 50,
+    ) -> Page:
+        """Get one page of lists ordered by creation date, optionally filtered"""
+        return self.list_repo.get_page(
+            language=language, category_id=category_id, after=after, limit=limit
+        )
+
     def get_all_entries(self) -> ListType[Entry]:
         """Get all entries from all lists"""
         return self.entry_repo.get_all_with_list()
 
+    def get_entries_page(self, after: Optional[str] = None, limit: int = 50) -> Page:
+        """Get one page of entries from all lists"""
+        return self.entry_repo.get_page_with_list(after=after, limit=limit)
+
+    def count_entries(self) -> int:
+        """Count entries across all lists"""
+        return self.entry_repo.count()
+
     def create_list(
         self,
         name: str,
         source_language_id: int,
         target_language_id: int,
         category_id: Optional[int] = None,
+        commit: bool = True,
     ) -> List:
         """Create a new list"""
         if not all([name, source_language_id, target_language_id]):
@@ -101,8 +145,27 @@ class ListService:
         if source_language_id == target_language_id:
             raise ValueError("Source and target languages must be different")
         return self.list_repo.create_list(
-            name, source_language_id, target_language_id, category_id
+            name, source_language_id, target_language_id, category_id, commit=commit
+        )
+
+    def create_list_with_entries(
+        self,
+        name: str,
+        source_language_id: int,
+        target_language_id: int,
+        items: ListType[dict],
+        entry_type: str = "word",
+    ) -> List:
+        """Create a list and its entries in one transaction, nothing if one is invalid"""
+        vocab_list = self.create_list(
+            name, source_language_id, target_language_id, commit=False
         )
+        try:
+            self.bulk_add_entries(vocab_list.id, items, entry_type)
+        except Exception:
+            db.session.rollback()
+            raise
+        return vocab_list
 
     def delete_list(self, list_id: int) -> None:
         """Delete a list"""
@@ -126,6 +189,91 @@ class ListService:
             list_id, source_word, target_word, entry_type
         )
 
+    def bulk_add_entries(
+        self,
+        list_id: int,
+        items: ListType[dict],
+        entry_type: str = "word",
+        commit: bool = True,
+    ) -> int:
+        """
+        Add many entries to a list in one statement and transaction
+
+        Items are {"source", "target"} dicts, optionally with their own
+        "entry_type". All items are validated before anything is inserted.
+        """
+        if not self.list_repo.get_by_id(list_id):
+            raise ValueError(f"List with id {list_id} not found")
+
+        max_length = Entry.source_word.type.length
+        rows = []
+        for item in items:
+            source_word, target_word = item.get("source"), item.get("target")
+            if not all([source_word, target_word]):
+                raise ValueError("Both source and target are required")
+            if len(source_word) > max_length or len(target_word) > max_length:
+                raise ValueError(f"Entries can be at most {max_length} characters")
+            rows.append((source_word, target_word, item.get("entry_type", entry_type)))
+
+        return self.entry_repo.bulk_create_entries(list_id, rows, commit=commit)
+
+    def import_entries(
+        self,
+        list_id: int,
+        rows: Iterable[Tuple[str, str]],
+        entry_type: str = "word",
+        chunk_size: int = 5000,
+        progress: Optional[Callable[[ImportResult], None]] = None,
+    ) -> ImportResult:
+        """
+        Import (source, target) pairs, e.g. from app.importer.read_rows
+
+        Rows are handled a chunk at a time: empty or too long pairs are
+        skipped as invalid, pairs already in the chunk or in the list are
+        skipped as duplicates, and the rest is written with one COPY or
+        executemany and committed. Memory stays constant however long the
+        file is, and an interrupted import can simply be run again.
+        `progress` is called with the running result after every chunk.
+        """
+        if not self.list_repo.get_by_id(list_id):
+            raise ValueError(f"List with id {list_id} not found")
+
+        max_length = Entry.source_word.type.length
+        result = ImportResult()
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            result.read += len(chunk)
+
+            pairs = {}
+            invalid = 0
+            for source_word, target_word in chunk:
+                pair = (source_word.strip(), target_word.strip())
+                if not all(pair) or max(len(pair[0]), len(pair[1])) > max_length:
+                    invalid += 1
+                else:
+                    pairs[pair] = None
+
+            existing = self.entry_repo.get_existing_pairs(
+                list_id, list({source_word for source_word, _ in pairs})
+            )
+            new_rows = [
+                (source_word, target_word, entry_type)
+                for source_word, target_word in pairs
+                if (source_word, target_word) not in existing
+            ]
+            result.invalid += invalid
+            result.duplicates += len(chunk) - invalid - len(new_rows)
+            result.imported += self.entry_repo.copy_entries(list_id, new_rows)
+            db.session.commit()
+
+            if progress:
+                progress(result)
+
+        return result
+
     def update_entry(
         self, entry_id: int, source_word: str, target_word: str, entry_type: str
     ) -> Entry:
@@ -137,12 +285,14 @@ class ListService:
         if not all([source_word, target_word]):
             raise ValueError("Both source and target are required")
 
-        return self.entry_repo.update(
+        entry = self.entry_repo.update(
             entry,
             source_word=source_word,
             target_word=target_word,
             entry_type=entry_type,
         )
+        self.answer_matcher.invalidate(entry.id)
+        return entry
 
     def delete_entry(self, entry_id: int) -> int:
         """Delete an entry and return its list_id"""
@@ -152,6 +302,7 @@ class ListService:
 
         list_id = entry.list_id
         self.entry_repo.delete(entry)
+        self.answer_matcher.invalidate(entry_id)
         return list_id
 
 
@@ -161,6 +312,25 @@ class QuizService:
     def __init__(self):
         self.list_repo = ListRepository()
         self.entry_repo = EntryRepository()
+        self.review_repo = ReviewScheduleRepository()
+        self.state_store = get_quiz_state_store()
+        self.answer_matcher = get_answer_matcher()
+
+    def build_question_queue(
+        self, entries: ListType[Entry], direction_preference: str = "random"
+    ) -> QuestionQueue:
+        """Create a shuffled question queue with directions based on preference"""
+        questions = []
+        for entry in entries:
+            if direction_preference == "random":
+                direction = random.choice(["forward", "reverse"])
+            else:
+                direction = direction_preference
+            questions.append((entry.id, direction))
+
+        # Shuffle questions for random order
+        random.shuffle(questions)
+        return QuestionQueue(questions)
 
     def initialize_quiz(
         self, list_id: int, direction_preference: str = "random"
@@ -178,21 +348,13 @@ class QuizService:
         if not vocab_list.entries:
             raise ValueError("Cannot start quiz: list has no entries")
 
-        # Create quiz questions with directions based on preference
-        # Each question is a dict with entry_id and direction ('forward' or 'reverse')
-        quiz_questions = []
-        for entry in vocab_list.entries:
-            if direction_preference == "random":
-                direction = random.choice(["forward", "reverse"])
-            else:
-                direction = direction_preference
-            quiz_questions.append({"entry_id": entry.id, "direction": direction})
-
-        # Shuffle questions for random order
-        random.shuffle(quiz_questions)
+        quiz_questions = self.build_question_queue(
+            vocab_list.entries, direction_preference
+        )
 
         return {
-            "quiz_questions": quiz_questions,
+            "quiz_questions": quiz_questions.encode(),
+            "quiz_bundle": build_bundle(vocab_list.entries),
             "quiz_list_id": list_id,
             "quiz_index": 0,
             "quiz_score": 0,
@@ -237,62 +399,106 @@ class QuizService:
 
             vocab_lists.append(vocab_list)
 
-        # Gather entries from all selected lists
-        all_entries = []
-        list_names = []
-
-        for vocab_list in vocab_lists:
-            if vocab_list.entries:
-                all_entries.extend(vocab_list.entries)
-                list_names.append(vocab_list.name)
+        # Gather entries from all selected lists in one query
+        all_entries = self.entry_repo.get_quiz_entries(list_ids=list_ids)
+        used_list_ids = {entry.list_id for entry in all_entries}
+        list_names = [
+            vocab_list.name
+            for vocab_list in vocab_lists
+            if vocab_list.id in used_list_ids
+        ]
 
         if not all_entries:
             raise ValueError(
                 "Kan quiz niet starten: geen items gevonden in geselecteerde lijsten"
             )
 
-        # Create quiz questions with directions based on preference
-        quiz_questions = []
-        for entry in all_entries:
-            if direction_preference == "random":
-                direction = random.choice(["forward", "reverse"])
-            else:
-                direction = direction_preference
-            quiz_questions.append({"entry_id": entry.id, "direction": direction})
-
-        # Shuffle questions for random order
-        random.shuffle(quiz_questions)
+        quiz_questions = self.build_question_queue(all_entries, direction_preference)
 
         return {
-            "quiz_questions": quiz_questions,
+            "quiz_questions": quiz_questions.encode(),
+            "quiz_bundle": build_bundle(all_entries),
             "quiz_list_ids": list_ids,  # Store multiple list IDs
             "quiz_list_names": list_names,  # Store list names for display
-            "quiz_source_language": source_lang,
-            "quiz_target_language": target_lang,
+            "quiz_source_language": source_lang.name,
+            "quiz_target_language": target_lang.name,
             "quiz_index": 0,
             "quiz_score": 0,
             "quiz_total": len(quiz_questions),
         }
 
+    def load_quiz_state(self, session_id: Optional[int]) -> Optional[Dict]:
+        """
+        Load the state of an in-progress quiz from the state store
+
+        Falls back to the copy persisted on the QuizSession when the store
+        no longer has it (evicted, restarted worker).
+        """
+        if not session_id:
+            return None
+
+        quiz_data = self.state_store.get(session_id)
+        if quiz_data is None:
+            quiz_session = QuizSession.query.get(session_id)
+            if (
+                not quiz_session
+                or quiz_session.status != "in_progress"
+                or not quiz_session.quiz_data
+            ):
+                return None
+            quiz_data = self.attach_bundle(dict(quiz_session.quiz_data))
+            self.state_store.set(session_id, quiz_data)
+        return quiz_data
+
+    def attach_bundle(self, quiz_data: Dict) -> Dict:
+        """
+        Add the question bundle to quiz data that lacks it (resumed quizzes)
+
+        The bundle is not persisted with the QuizSession, so it is rebuilt
+        with one IN query. Entries deleted since are simply missing from it.
+        """
+        if "quiz_bundle" not in quiz_data:
+            entry_ids = {
+                entry_id
+                for entry_id, _ in QuestionQueue.load(quiz_data.get("quiz_questions"))
+            }
+            quiz_data["quiz_bundle"] = build_bundle(
+                self.entry_repo.get_quiz_entries(entry_ids=entry_ids)
+            )
+        return quiz_data
+
+    def _persisted(self, quiz_data: Dict) -> Dict:
+        """Quiz data as stored on the QuizSession, without the bundle"""
+        return {key: value for key, value in quiz_data.items() if key != "quiz_bundle"}
+
+    def save_quiz_state(self, session_id: int, quiz_data: Dict) -> None:
+        """Store the state of an in-progress quiz"""
+        self.state_store.set(session_id, quiz_data)
+
+    def clear_quiz_state(self, session_id: Optional[int]) -> None:
+        """Remove the state of a finished or abandoned quiz"""
+        if session_id:
+            self.state_store.delete(session_id)
+
     def get_current_question(
         self, quiz_data: Dict
-    ) -> Tuple[Optional[Entry], Dict, str, str]:
+    ) -> Tuple[Optional[BundledEntry], Dict, str, str]:
         """
-        Get the current quiz question
+        Get the current quiz question from the question bundle
         Returns: (entry, updated_quiz_data, progress_string, direction) or (None, quiz_data, '', '') if quiz is complete
         """
         quiz_index = quiz_data.get("quiz_index", 0)
-        quiz_questions = quiz_data.get("quiz_questions", [])
+        quiz_questions = QuestionQueue.load(quiz_data.get("quiz_questions"))
 
         if quiz_index >= len(quiz_questions):
             return None, quiz_data, "", ""
 
+        bundle = self.attach_bundle(quiz_data)["quiz_bundle"]
+
         # Try to find a valid entry, skipping deleted ones
         while quiz_index < len(quiz_questions):
-            question = quiz_questions[quiz_index]
-            entry_id = question["entry_id"]
-            direction = question["direction"]
-            entry = self.entry_repo.get_by_id(entry_id)
+            entry_id, direction = quiz_questions[quiz_index]
+            entry = get_bundled_entry(bundle, entry_id)
 
             if entry:
                 # Found a valid entry
@@ -318,23 +524,257 @@ class QuizService:
         if not entry:
             raise ValueError(f"Entry with id {entry_id} not found")
 
-        # Determine the correct answer based on direction
-        if direction == "forward":
-            # source -> target (original behavior)
-            correct_answer_value = entry.target_word
-        else:
-            # reverse: target -> source
-            correct_answer_value = entry.source_word
-
-        correct_answer = correct_answer_value.strip().lower()
-        user_answer_clean = user_answer.strip().lower()
-        is_correct = user_answer_clean == correct_answer
+        is_correct, correct_answer_value = self._evaluate_answer(
+            entry, user_answer, direction
+        )
 
         # Update entry score
         self.entry_repo.update_score(entry, is_correct)
 
         return is_correct, correct_answer_value
 
+    def _expected_answer(self, entry: Entry, direction: str) -> str:
+        """The answer expected for an entry in a quiz direction"""
+        if direction == "forward":
+            # source -> target (original behavior)
+            return entry.target_word
+        # reverse: target -> source
+        return entry.source_word
+
+    def _evaluate_answer(
+        self, entry: Entry, user_answer: str, direction: str
+    ) -> Tuple[bool, str]:
+        """Compare an answer with the entry, returns (is_correct, correct_answer)"""
+        correct_answer_value = self._expected_answer(entry, direction)
+        is_correct = self.answer_matcher.is_match(
+            user_answer, correct_answer_value, key=(entry.id, direction)
+        )
+        return is_correct, correct_answer_value
+
+    def submit_answer(
+        self,
+        session_id: int,
+        quiz_data: Dict,
+        entry_id: int,
+        user_answer: str,
+        direction: str = "forward",
+    ) -> Dict:
+        """
+        Check an answer and record it in a single transaction
+
+        Updates the entry score and its review schedule, stores the
+        QuizAnswer and saves the session progress with one fetch and one
+        commit.
+
+        Returns:
+            Dict with is_correct, correct_answer, question_word and the
+            advanced quiz_data
+        """
+        entry, schedule = self.review_repo.get_entry_with_schedule(entry_id, direction)
+        if not entry:
+            # Deleted during the quiz: drop it so the next question skips it
+            if quiz_data.get("quiz_bundle", {}).pop(str(entry_id), None):
+                self.save_quiz_state(session_id, quiz_data)
+            raise ValueError(f"Entry with id {entry_id} not found")
+
+        is_correct, correct_answer = self._evaluate_answer(
+            entry, user_answer, direction
+        )
+        # Show the question word based on direction
+        question_word = (
+            entry.source_word if direction == "forward" else entry.target_word
+        )
+
+        try:
+            self.entry_repo.update_score(entry, is_correct, commit=False)
+            if schedule is None:
+                schedule = ReviewSchedule(entry_id=entry_id, direction=direction)
+                db.session.add(schedule)
+            review(schedule, is_correct, datetime.utcnow())
+            db.session.add(
+                QuizAnswer(
+                    session_id=session_id,
+                    entry_id=entry_id,
+                    user_answer=user_answer,
+                    correct_answer=correct_answer,
+                    is_correct=is_correct,
+                    question_direction=direction,
+                )
+            )
+
+            quiz_data = self.advance_quiz(quiz_data, is_correct)
+            QuizSession.query.filter_by(id=session_id).update(
+                {
+                    QuizSession.current_index: quiz_data.get("quiz_index", 0),
+                    QuizSession.correct_answers: quiz_data.get("quiz_score", 0),
+                    QuizSession.quiz_data: self._persisted(quiz_data),
+                },
+                synchronize_session=False,
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {
+            "is_correct": is_correct,
+            "correct_answer": correct_answer,
+            "question_word": question_word,
+            "quiz_data": quiz_data,
+        }
+
+    def submit_answers(
+        self, session_id: int, quiz_data: Dict, answers: ListType[Dict]
+    ) -> Dict:
+        """
+        Check a batch of answers and record them in a single transaction
+
+        Answers must follow the question queue in order; an answer for
+        another question than the current one is rejected and does not
+        advance the quiz. A current question whose entry was deleted is
+        skipped. Entries and their schedules are fetched with one query, the
+        queue is decoded once and all score changes are applied with one
+        UPDATE.
+
+        Args:
+            session_id: The quiz session ID
+            quiz_data: State of the quiz
+            answers: Dicts with entry_id, direction, answer and optionally an
+                ISO 8601 answered_at timestamp from the client
+
+        Returns:
+            Dict with a verdict per answer and the advanced quiz_data
+        """
+        answers = [self._parse_batch_answer(answer) for answer in answers]
+        entries, schedules = self.review_repo.get_entries_with_schedules(
+            [answer["entry_id"] for answer in answers]
+        )
+
+        known = [answer for answer in answers if answer["entry_id"] in entries]
+        verdicts = self.answer_matcher.match_many(
+            [answer["answer"] for answer in known],
+            [
+                self._expected_answer(entries[a["entry_id"]], a["direction"])
+                for a in known
+            ],
+            [(answer["entry_id"], answer["direction"]) for answer in known],
+        )
+        for answer, is_correct in zip(known, verdicts):
+            answer["is_correct"] = is_correct
+
+        now = datetime.utcnow()
+        results = []
+        score_deltas = {}
+        # Decoded once; the index and score move forward locally
+        questions = QuestionQueue.load(quiz_data.get("quiz_questions"))
+        quiz_index = quiz_data.get("quiz_index", 0)
+        quiz_score = quiz_data.get("quiz_score", 0)
+        requeued = False
+        try:
+            for answer in answers:
+                entry_id, direction = answer["entry_id"], answer["direction"]
+                entry = entries.get(entry_id)
+                result = {"entry_id": entry_id, "direction": direction}
+                results.append(result)
+
+                current = questions[quiz_index] if quiz_index < len(questions) else None
+                if entry is None:
+                    result.update(accepted=False, error="Item niet gevonden")
+                    if current == (entry_id, direction):
+                        # Deleted during the quiz: skip it, or it blocks the quiz
+                        quiz_index += 1
+                    continue
+                if current != (entry_id, direction):
+                    result.update(accepted=False, error="Niet de huidige vraag")
+                    continue
+
+                is_correct = answer["is_correct"]
+                correct_answer = self._expected_answer(entry, direction)
+                result.update(
+                    accepted=True, is_correct=is_correct, correct_answer=correct_answer
+                )
+
+                correct, incorrect = score_deltas.get(entry_id, (0, 0))
+                score_deltas[entry_id] = (
+                    (correct + 1, incorrect) if is_correct else (correct, incorrect + 1)
+                )
+                schedule = schedules.get((entry_id, direction))
+                if schedule is None:
+                    schedule = ReviewSchedule(entry_id=entry_id, direction=direction)
+                    schedules[(entry_id, direction)] = schedule
+                    db.session.add(schedule)
+                # Client clocks may run ahead, never record answers in the future
+                answered_at = min(answer["answered_at"] or now, now)
+                review(schedule, is_correct, answered_at)
+                db.session.add(
+                    QuizAnswer(
+                        session_id=session_id,
+                        entry_id=entry_id,
+                        user_answer=answer["answer"],
+                        correct_answer=correct_answer,
+                        is_correct=is_correct,
+                        question_direction=direction,
+                        answered_at=answered_at,
+                    )
+                )
+                # Same as advance_quiz(), without decoding the queue again
+                if is_correct:
+                    quiz_score += 1
+                else:
+                    questions.append(entry_id, direction)
+                    requeued = True
+                quiz_index += 1
+
+            quiz_data["quiz_index"] = quiz_index
+            quiz_data["quiz_score"] = quiz_score
+            if requeued:
+                quiz_data["quiz_questions"] = questions.encode()
+            self.entry_repo.apply_score_deltas(score_deltas, commit=False)
+            QuizSession.query.filter_by(id=session_id).update(
+                {
+                    QuizSession.current_index: quiz_data.get("quiz_index", 0),
+                    QuizSession.correct_answers: quiz_data.get("quiz_score", 0),
+                    QuizSession.quiz_data: self._persisted(quiz_data),
+                },
+                synchronize_session=False,
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {"results": results, "quiz_data": quiz_data}
+
+    def _parse_batch_answer(self, answer: Dict) -> Dict:
+        """Validate one answer of a batch, raises ValueError when malformed"""
+        if not isinstance(answer, dict):
+            raise ValueError("Elk antwoord moet een object zijn")
+        entry_id = answer.get("entry_id")
+        direction = answer.get("direction", "forward")
+        user_answer = answer.get("answer")
+        if not isinstance(entry_id, int) or isinstance(entry_id, bool):
+            raise ValueError("entry_id moet een getal zijn")
+        if direction not in ("forward", "reverse"):
+            raise ValueError("direction moet 'forward' of 'reverse' zijn")
+        if not isinstance(user_answer, str):
+            raise ValueError("answer moet tekst zijn")
+
+        answered_at = None
+        if answer.get("answered_at"):
+            try:
+                answered_at = datetime.fromisoformat(str(answer["answered_at"]))
+            except ValueError:
+                raise ValueError("answered_at moet een ISO 8601 tijdstip zijn")
+            if answered_at.tzinfo is not None:
+                answered_at = answered_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+        return {
+            "entry_id": entry_id,
+            "direction": direction,
+            "answer": user_answer,
+            "answered_at": answered_at,
+        }
+
     def advance_quiz(self, quiz_data: Dict, is_correct: bool) -> Dict:
         """
         Advance to the next question
@@ -342,7 +782,7 @@ class QuizService:
         Returns: updated quiz_data
         """
         quiz_index = quiz_data.get("quiz_index", 0)
-        quiz_questions = quiz_data.get("quiz_questions", [])
+        quiz_questions = QuestionQueue.load(quiz_data.get("quiz_questions"))
 
         if is_correct:
             # Move to next question and increment score
@@ -351,9 +791,8 @@ class QuizService:
         else:
             # Re-add the current question to the end of the queue
             if quiz_index < len(quiz_questions):
-                current_question = quiz_questions[quiz_index]
-                quiz_questions.append(current_question)
-                quiz_data["quiz_questions"] = quiz_questions
+                quiz_questions.append(*quiz_questions[quiz_index])
+                quiz_data["quiz_questions"] = quiz_questions.encode()
             # Move to next question (the incorrect one is now also at the end)
             quiz_data["quiz_index"] = quiz_index + 1
 
@@ -362,13 +801,15 @@ class QuizService:
     def is_quiz_complete(self, quiz_data: Dict) -> bool:
         """Check if the quiz is complete"""
         quiz_index = quiz_data.get("quiz_index", 0)
-        quiz_questions = quiz_data.get("quiz_questions", [])
+        quiz_questions = QuestionQueue.load(quiz_data.get("quiz_questions"))
         return quiz_index >= len(quiz_questions)
 
     def get_quiz_results(self, quiz_data: Dict) -> Dict:
         """Get the final quiz results"""
         # Use quiz_total if available (original question count), otherwise fall back to questions length
-        total = quiz_data.get("quiz_total", len(quiz_data.get("quiz_questions", [])))
+        total = quiz_data.get(
+            "quiz_total", len(QuestionQueue.load(quiz_data.get("quiz_questions")))
+        )
         return {
             "score": quiz_data.get("quiz_score", 0),
             "total": total,
@@ -397,13 +838,15 @@ class QuizService:
             if session:
                 session.current_index = quiz_data.get("quiz_index", 0)
                 session.correct_answers = quiz_data.get("quiz_score", 0)
-                session.quiz_data = quiz_data
+                session.quiz_data = self._persisted(quiz_data)
                 db.session.commit()
                 return session
 
         # Create new session
         # Use quiz_total if available (original question count), otherwise fall back to questions length
-        total = quiz_data.get("quiz_total", len(quiz_data.get("quiz_questions", [])))
+        total = quiz_data.get(
+            "quiz_total", len(QuestionQueue.load(quiz_data.get("quiz_questions")))
+        )
         session = QuizSession(
             quiz_type=quiz_type,
             direction=direction,
@@ -411,7 +854,7 @@ class QuizService:
             correct_answers=quiz_data.get("quiz_score", 0),
             current_index=quiz_data.get("quiz_index", 0),
             status="in_progress",
-            quiz_data=quiz_data,
+            quiz_data=self._persisted(quiz_data),
         )
         db.session.add(session)
         db.session.flush()
@@ -499,14 +942,17 @@ class QuizService:
         direction = quiz_data.get("direction", "random")
         if direction == "random":
             directions = set(
-                q.get("direction") for q in quiz_data.get("quiz_questions", [])
+                direction
+                for _, direction in QuestionQueue.load(quiz_data.get("quiz_questions"))
             )
             if len(directions) == 1:
                 direction = directions.pop()
 
         # Create quiz session as completed
         # Use quiz_total if available (original question count), otherwise fall back to questions length
-        total = quiz_data.get("quiz_total", len(quiz_data.get("quiz_questions", [])))
+        total = quiz_data.get(
+            "quiz_total", len(QuestionQueue.load(quiz_data.get("quiz_questions")))
+        )
         session = QuizSession(
             quiz_type=quiz_type,
             direction=direction,
@@ -516,7 +962,7 @@ class QuizService:
             status="completed",
             started_at=datetime.utcnow(),
             completed_at=datetime.utcnow(),
-            quiz_data=quiz_data,
+            quiz_data=self._persisted(quiz_data),
         )
         db.session.add(session)
         db.session.flush()
@@ -547,35 +993,108 @@ class QuizService:
         db.session.commit()
         return session
 
-    def get_quiz_history(
-        self, limit: Optional[int] = None, status: Optional[str] = "completed"
-    ) -> ListType[QuizSession]:
-        """Get quiz history ordered by completion date (newest first)"""
-        query = QuizSession.query
+    def _history_query(self, status: Optional[str] = "completed"):
+        """Build the quiz sessions query for a status, newest first
+
+        Session lists and their list are eager-loaded in two extra queries,
+        since the history page shows list names for every session.
+        """
+        query = QuizSession.query.options(
+            selectinload(QuizSession.session_lists).selectinload(QuizSessionList.list)
+        )
         if status:
             query = query.filter_by(status=status)
 
         if status == "completed":
-            query = query.order_by(QuizSession.completed_at.desc())
-        else:
-            query = query.order_by(QuizSession.started_at.desc())
+            return query.order_by(QuizSession.completed_at.desc())
+        return query.order_by(QuizSession.started_at.desc())
 
+    def get_quiz_history(
+        self, limit: Optional[int] = None, status: Optional[str] = "completed"
+    ) -> ListType[QuizSession]:
+        """Get quiz history ordered by completion date (newest first)"""
+        query = self._history_query(status)
         if limit:
             query = query.limit(limit)
         return query.all()
 
+    def get_quiz_history_page(
+        self, after: Optional[str] = None, limit: int = 50
+    ) -> Page:
+        """Get one page of completed sessions (newest first) after the given cursor"""
+        return keyset_paginate(
+            self._history_query("completed"),
+            QuizSession.completed_at,
+            QuizSession.id,
+            after=after,
+            limit=limit,
+        )
+
+    def get_quiz_history_stats(self) -> Dict:
+        """Get the number of completed quizzes and their average score"""
+        score = db.case(
+            (
+                QuizSession.total_questions > 0,
+                QuizSession.correct_answers * 100.0 / QuizSession.total_questions,
+            ),
+            else_=0,
+        )
+        count, average = (
+            db.session.query(db.func.count(QuizSession.id), db.func.avg(score))
+            .filter(QuizSession.status == "completed")
+            .one()
+        )
+        return {"count": count, "average_score": float(average or 0)}
+
     def get_incomplete_sessions(self) -> ListType[QuizSession]:
         """Get all incomplete quiz sessions"""
-        return (
-            QuizSession.query.filter_by(status="in_progress")
-            .order_by(QuizSession.started_at.desc())
-            .all()
-        )
+        return self._history_query("in_progress").all()
 
     def get_quiz_session_detail(self, session_id: int) -> Optional[QuizSession]:
         """Get detailed quiz session with all answers"""
         return QuizSession.query.filter_by(id=session_id).first()
 
+    def get_practice_set(
+        self,
+        list_id: Optional[int] = None,
+        limit: int = 15,
+        now: Optional[datetime] = None,
+    ) -> ListType[Tuple[Entry, str]]:
+        """
+        Get the (entry, direction) pairs for a smart practice session
+
+        Reviews that are due come first, most overdue first. Remaining
+        places are filled with the entries with the lowest success rate.
+
+        Args:
+            list_id: Optional filter by specific list
+            limit: Maximum number of questions to return
+            now: Moment to check due dates against (defaults to utcnow)
+
+        Returns:
+            List of (entry, direction) tuples
+        """
+        due = self.review_repo.get_due(
+            now or datetime.utcnow(), list_id=list_id, limit=limit
+        )
+        practice_set = [(schedule.entry, schedule.direction) for schedule in due]
+
+        if len(practice_set) < limit:
+            chosen = {entry.id for entry, _ in practice_set}
+            for entry in self.get_difficult_entries(list_id=list_id, limit=limit):
+                if len(practice_set) >= limit:
+                    break
+                if entry.id in chosen:
+                    continue
+                direction = (
+                    "forward"
+                    if entry.success_rate is not None and entry.success_rate < 50
+                    else "reverse"
+                )
+                practice_set.append((entry, direction))
+
+        return practice_set
+
     def get_difficult_entries(
         self, list_id: Optional[int] = None, min_attempts: int = 2, limit: int = 15
     ) -> ListType[Entry]:
@@ -590,22 +1109,190 @@ class QuizService:
         Returns:
             List of entries ordered by success rate (worst first)
         """
+        # Range scan on ix_entries_success_ratio_id from the worst rate up,
+        # stopping after `limit` rows; unattempted entries (NULL) fall outside
         query = Entry.query.filter(
-            (Entry.correct_count + Entry.incorrect_count) >= min_attempts
+            Entry.success_ratio >= 0,
+            (Entry.correct_count + Entry.incorrect_count) >= min_attempts,
         )
 
         if list_id:
             query = query.filter_by(list_id=list_id)
 
-        # Order by success rate (calculated as correct / total)
-        # SQLAlchemy expression for success rate
-        total_attempts = Entry.correct_count + Entry.incorrect_count
-        success_rate = Entry.correct_count * 100.0 / total_attempts
+        return query.order_by(Entry.success_ratio, Entry.id).limit(limit).all()
+
+
+class AIJobService:
+    """Service for list generations running in the background"""
+
+    def __init__(self):
+        self.job_repo = AIGenerationJobRepository()
+        self.runner = get_ai_job_runner()
+
+    def submit_job(
+        self,
+        provider_key: str,
+        topic: str,
+        source_language_id: int,
+        target_language_id: int,
+        entry_type: str,
+        count: Optional[int] = None,
+        regenerate: bool = False,
+    ) -> AIGenerationJob:
+        """Record a generation and queue it for the job runner"""
+        if provider_key not in AIService.PROVIDERS:
+            raise ValueError(f"Onbekende AI provider: {provider_key}")
+
+        # Jobs older than both timeouts no longer count, their worker is gone
+        since = datetime.utcnow() - timedelta(
+            seconds=self.runner.queue_timeout + self.runner.timeout
+        )
+        if self.job_repo.count_unfinished(since) >= self.runner.max_pending:
+            raise ValueError(
+                "Er lopen al te veel generaties, probeer het later opnieuw"
+            )
+
+        job = self.job_repo.create(
+            provider=provider_key,
+            topic=topic,
+            source_language_id=source_language_id,
+            target_language_id=target_language_id,
+            entry_type=entry_type,
+            count=count,
+            regenerate=regenerate,
+        )
+        self.runner.submit(job.id)
+        return job
+
+    def get_job(self, job_id: int) -> Optional[AIGenerationJob]:
+        """Get a job, failing it when it did not finish within the timeout"""
+        job = self.job_repo.get_by_id(job_id)
+        if job is not None:
+            self._expire(job)
+        return job
+
+    def _expire(self, job: AIGenerationJob) -> None:
+        """Fail a job that waited or ran too long, see AI_JOB_*TIMEOUT"""
+        if job.is_finished:
+            return
+        if job.status == "pending":
+            # Batch jobs wait for a provider slot, behind each other
+            deadline = job.created_at + timedelta(seconds=self.runner.queue_timeout)
+            error = "Generatie stond te lang in de wachtrij"
+        else:
+            started_at = job.started_at or job.created_at
+            deadline = started_at + timedelta(seconds=self.runner.timeout)
+            error = "Generatie duurde te lang"
+        now = datetime.utcnow()
+        if now >= deadline:
+            # Only in the state seen here: a job that just started or
+            # finished keeps going
+            self.job_repo.finish(
+                job.id, "failed", now, error=error, unfinished=(job.status,)
+            )
+            db.session.refresh(job)
+
+    def submit_batch(
+        self,
+        provider_keys: ListType[str],
+        topics: ListType[str],
+        source_language_id: int,
+        target_language_id: int,
+        entry_type: str,
+        count: Optional[int] = None,
+        regenerate: bool = False,
+    ) -> AIGenerationBatch:
+        """
+        Queue a job for every topic and provider, to run concurrently
 
-        entries = query.all()
+        Several topics build a curriculum, several providers compare them
+        on the same topic.
+        """
+        for provider_key in provider_keys:
+            if provider_key not in AIService.PROVIDERS:
+                raise ValueError(f"Onbekende AI provider: {provider_key}")
+        topics = list(dict.fromkeys(t.strip() for t in topics if t.strip()))
+        if not topics or not provider_keys:
+            raise ValueError("Kies minimaal 1 onderwerp en 1 provider")
+
+        size = len(topics) * len(provider_keys)
+        if size > self.runner.max_batch_jobs:
+            raise ValueError(f"Te veel lijsten in een keer ({size})")
+        since = datetime.utcnow() - timedelta(
+            seconds=self.runner.queue_timeout + self.runner.timeout
+        )
+        if self.job_repo.count_unfinished(since) + size > self.runner.max_pending:
+            raise ValueError(
+                "Er lopen al te veel generaties, probeer het later opnieuw"
+            )
 
-        # Sort in Python since we need the property
-        entries_with_rate = [(entry, entry.success_rate or 0) for entry in entries]
-        entries_with_rate.sort(key=lambda x: x[1])
+        batch = self.job_repo.create_batch(
+            [
+                dict(
+                    provider=provider_key,
+                    topic=topic,
+                    source_language_id=source_language_id,
+                    target_language_id=target_language_id,
+                    entry_type=entry_type,
+                    count=count,
+                    regenerate=regenerate,
+                )
+                for topic in topics
+                for provider_key in provider_keys
+            ]
+        )
+        self.runner.submit_batch([job.id for job in batch.jobs])
+        return batch
+
+    def get_batch(self, batch_id: int) -> Optional[AIGenerationBatch]:
+        """Get a batch, failing the jobs that did not finish within the timeout"""
+        batch = self.job_repo.get_batch(batch_id)
+        if batch is not None:
+            for job in batch.jobs:
+                self._expire(job)
+        return batch
+
+    def merge_batch_items(self, batch: AIGenerationBatch) -> ListType[dict]:
+        """Merge the items of all finished jobs, dropping repeated source words"""
+        seen = set()
+        merged = []
+        for job in batch.jobs:
+            for item in job.items or []:
+                key = " ".join(item["source"].casefold().split())
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(item)
+        return merged
+
+    def follow_job(
+        self,
+        job_id: int,
+        start: int = 0,
+        max_duration: Optional[float] = None,
+        poll_interval: float = 0.5,
+    ) -> Iterator[Tuple[str, object]]:
+        """
+        Follow a job until it is finished, or for at most `max_duration` seconds
 
-        return [entry for entry, _ in entries_with_rate[:limit]]
+        Yields ("item", item) for every generated item from index `start`,
+        including the ones generated before, and finally ("done", job). When
+        the time is up it stops without "done", so a reader can resume.
+        """
+        sent = start
+        deadline = None if max_duration is None else time.monotonic() + max_duration
+        while True:
+            # End the read transaction, so items committed since are visible
+            db.session.rollback()
+            job = self.get_job(job_id)
+            if job is None:
+                return
+            items = job.items or []
+            for item in items[sent:]:
+                yield "item", item
+            sent = len(items)
+            if job.is_finished:
+                yield "done", job
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            self.runner.wait_for_update(poll_interval)
@@ -1,20 +1,52 @@
-from flask import flash, redirect, render_template, request, session, url_for
+import json
+
+from flask import (
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    session,
+    stream_with_context,
+    url_for,
+)
 from flask.views import MethodView
 from markupsafe import escape
 
+from app.ai_cache import get_ai_response_cache
 from app.ai_service import AIService
 from app.forms import (
     AddEntryForm,
+    AIBatchGenerateForm,
     AIGenerateForm,
     DeleteForm,
     EditEntryForm,
+    ImportEntriesForm,
     LanguageFilterForm,
     NewListForm,
     QuizAnswerForm,
     QuizDirectionForm,
     SaveGeneratedListForm,
 )
-from app.services import CategoryService, LanguageService, ListService, QuizService
+from app.importer import detect_format, read_rows
+from app.question_queue import QuestionQueue
+from app.services import (
+    AIJobService,
+    CategoryService,
+    LanguageService,
+    ListService,
+    QuizService,
+)
+
+
+def get_page_args():
+    """Read the keyset cursor and the capped page size from the query string"""
+    after = request.args.get("after") or None
+    limit = request.args.get("limit", current_app.config["PAGE_SIZE"], type=int)
+    limit = max(1, min(limit, current_app.config["MAX_PAGE_SIZE"]))
+    return after, limit
 
 
 class IndexView(MethodView):
@@ -31,14 +63,17 @@ class IndexView(MethodView):
 
         # Get filter from query parameter
         language_id = request.args.get("language_id", 0, type=int)
+        after, limit = get_page_args()
         selected_language = None
         if language_id:
             form.language_id.data = language_id
             selected_language = self.language_service.get_language_by_id(language_id)
             # Filter op language_name zodat zowel source als target taal matchen
-            lists = self.list_service.get_all_lists(language=selected_language)
+            lists = self.list_service.get_lists_page(
+                language=selected_language, after=after, limit=limit
+            )
         else:
-            lists = self.list_service.get_all_lists()
+            lists = self.list_service.get_lists_page(after=after, limit=limit)
 
         return render_template(
             "index.html",
@@ -46,6 +81,7 @@ class IndexView(MethodView):
             form=form,
             languages=languages,
             selected_language=selected_language,
+            after=after,
         )
 
 
@@ -57,8 +93,14 @@ class AllEntriesView(MethodView):
 
     def get(self):
         """Display all entries from all lists"""
-        entries = self.list_service.get_all_entries()
-        return render_template("all_entries.html", entries=entries)
+        after, limit = get_page_args()
+        entries = self.list_service.get_entries_page(after=after, limit=limit)
+        return render_template(
+            "all_entries.html",
+            entries=entries,
+            total=self.list_service.count_entries(),
+            after=after,
+        )
 
 
 class NewListView(MethodView):
@@ -134,7 +176,11 @@ class ListDetailView(MethodView):
         form = AddEntryForm()
         delete_form = DeleteForm()
         return render_template(
-            "list_detail.html", word_list=word_list, form=form, delete_form=delete_form
+            "list_detail.html",
+            word_list=word_list,
+            form=form,
+            delete_form=delete_form,
+            import_form=ImportEntriesForm(),
         )
 
 
@@ -163,6 +209,45 @@ class AddEntryView(MethodView):
         return redirect(url_for("main.list_detail", list_id=list_id))
 
 
+class ImportEntriesView(MethodView):
+    """View for importing a CSV, TSV or Anki file into a list"""
+
+    def __init__(self):
+        self.list_service = ListService()
+
+    def post(self, list_id):
+        """Stream the uploaded file into the list"""
+        form = ImportEntriesForm()
+
+        if not form.validate_on_submit():
+            for errors in form.errors.values():
+                flash(errors[0], "error")
+            return redirect(url_for("main.list_detail", list_id=list_id))
+
+        upload = form.file.data
+        try:
+            result = self.list_service.import_entries(
+                list_id,
+                read_rows(
+                    upload.stream,
+                    detect_format(upload.filename),
+                    skip_header=form.header.data,
+                ),
+                entry_type=form.entry_type.data,
+                chunk_size=current_app.config["IMPORT_CHUNK_SIZE"],
+            )
+        except ValueError as e:
+            flash(f"Fout bij importeren: {str(e)}", "error")
+            return redirect(url_for("main.list_detail", list_id=list_id))
+
+        flash(
+            f"{result.imported} items geïmporteerd, {result.duplicates} dubbel "
+            f"en {result.invalid} ongeldig overgeslagen",
+            "success",
+        )
+        return redirect(url_for("main.list_detail", list_id=list_id))
+
+
 class EditEntryView(MethodView):
     """View for editing an entry"""
 
@@ -285,13 +370,12 @@ class QuizStartView(MethodView):
             try:
                 quiz_data = self.quiz_service.initialize_quiz(list_id, direction)
                 quiz_data["direction"] = direction  # Store direction for history
-                quiz_data["quiz_answers"] = []  # Track all answers
 
-                # Create quiz session in database
+                # Create quiz session in database, keep its state server-side
                 quiz_session = self.quiz_service.create_or_update_session(quiz_data)
-                quiz_data["quiz_session_id"] = quiz_session.id
+                self.quiz_service.save_quiz_state(quiz_session.id, quiz_data)
 
-                session.update(quiz_data)
+                session["quiz_session_id"] = quiz_session.id
                 return redirect(url_for("main.quiz", list_id=list_id))
             except ValueError as e:
                 flash(str(e), "error")
@@ -314,44 +398,27 @@ class QuizView(MethodView):
             flash("Lijst niet gevonden", "error")
             return redirect(url_for("main.index"))
 
-        # Debug logging
-        print(
-            f"DEBUG: Session before init: quiz_questions={session.get('quiz_questions')}, quiz_list_id={session.get('quiz_list_id')}, quiz_index={session.get('quiz_index')}"
-        )
+        quiz_session_id = session.get("quiz_session_id")
+        quiz_data = self.quiz_service.load_quiz_state(quiz_session_id)
 
         # Check if quiz needs initialization (redirect to quiz start if needed)
-        if "quiz_questions" not in session or session.get("quiz_list_id") != list_id:
+        if not quiz_data or quiz_data.get("quiz_list_id") != list_id:
             return redirect(url_for("main.quiz_start", list_id=list_id))
 
         # Check if quiz is complete
-        if self.quiz_service.is_quiz_complete(session):
-            results = self.quiz_service.get_quiz_results(session)
+        if self.quiz_service.is_quiz_complete(quiz_data):
+            results = self.quiz_service.get_quiz_results(quiz_data)
 
             # Mark session as complete
-            quiz_session_id = session.get("quiz_session_id")
-            if quiz_session_id:
-                try:
-                    self.quiz_service.complete_quiz_session(
-                        quiz_session_id, results["score"]
-                    )
-                except Exception as e:
-                    print(f"Error completing quiz session: {e}")
-            else:
-                # Fallback: save legacy way if no session ID
-                quiz_answers = session.get("quiz_answers", [])
-                if quiz_answers:
-                    try:
-                        self.quiz_service.save_quiz_session(dict(session), quiz_answers)
-                    except Exception as e:
-                        print(f"Error saving quiz session: {e}")
+            try:
+                self.quiz_service.complete_quiz_session(
+                    quiz_session_id, results["score"]
+                )
+            except Exception as e:
+                print(f"Error completing quiz session: {e}")
 
-            # Clear session
-            session.pop("quiz_questions", None)
-            session.pop("quiz_list_id", None)
-            session.pop("quiz_index", None)
-            session.pop("quiz_score", None)
-            session.pop("quiz_answers", None)
-            session.pop("direction", None)
+            # Clear quiz state
+            self.quiz_service.clear_quiz_state(quiz_session_id)
             session.pop("quiz_session_id", None)
             return render_template(
                 "quiz_complete.html",
@@ -361,25 +428,21 @@ class QuizView(MethodView):
             )
 
         # Get current question
-        print(f"DEBUG: Getting current question with session: {dict(session)}")
         entry, updated_quiz_data, progress, direction = (
-            self.quiz_service.get_current_question(dict(session))
+            self.quiz_service.get_current_question(quiz_data)
         )
-        print(f"DEBUG: Entry: {entry}, progress: {progress}, direction: {direction}")
         if not entry:
             # All entries were deleted or quiz is broken, reinitialize
-            session.pop("quiz_questions", None)
-            session.pop("quiz_list_id", None)
-            session.pop("quiz_index", None)
-            session.pop("quiz_score", None)
+            self.quiz_service.clear_quiz_state(quiz_session_id)
+            session.pop("quiz_session_id", None)
             flash(
                 "De quiz kon niet worden geladen. Sommige items zijn mogelijk verwijderd. Probeer opnieuw.",
                 "error",
             )
             return redirect(url_for("main.list_detail", list_id=list_id))
 
-        # Update session with potentially skipped indices
-        session.update(updated_quiz_data)
+        # Store potentially skipped indices
+        self.quiz_service.save_quiz_state(quiz_session_id, updated_quiz_data)
 
         form = QuizAnswerForm()
         return render_template(
@@ -403,25 +466,22 @@ class QuizAnswerView(MethodView):
         form = QuizAnswerForm()
 
         if form.validate_on_submit():
+            quiz_session_id = session.get("quiz_session_id")
+            quiz_data = self.quiz_service.load_quiz_state(quiz_session_id)
+            if not quiz_data:
+                return redirect(url_for("main.quiz_start", list_id=list_id))
+
             entry_id = request.form.get("entry_id", type=int)
             direction = request.form.get("direction", "forward")
             user_answer = form.answer.data
 
             try:
-                is_correct, correct_answer = self.quiz_service.check_answer(
-                    entry_id, user_answer, direction
-                )
-
-                # Get entry for flash message
-                from app.repositories import EntryRepository
-
-                entry_repo = EntryRepository()
-                entry = entry_repo.get_by_id(entry_id)
-
-                # Show the question word based on direction
-                question_word = (
-                    entry.source_word if direction == "forward" else entry.target_word
+                result = self.quiz_service.submit_answer(
+                    quiz_session_id, quiz_data, entry_id, user_answer, direction
                 )
+                is_correct = result["is_correct"]
+                correct_answer = result["correct_answer"]
+                question_word = result["question_word"]
 
                 if is_correct:
                     flash(f"Correct! {escape(question_word)} = {escape(correct_answer)}", "success")
@@ -431,47 +491,61 @@ class QuizAnswerView(MethodView):
                         "error",
                     )
 
-                # Track answer for history
-                answer_data = {
-                    "entry_id": entry_id,
-                    "user_answer": user_answer,
-                    "correct_answer": correct_answer,
-                    "is_correct": is_correct,
-                    "direction": direction,
-                }
-
-                # Save answer to database if we have a session ID
-                quiz_session_id = session.get("quiz_session_id")
-                if quiz_session_id:
-                    try:
-                        self.quiz_service.save_quiz_answer(quiz_session_id, answer_data)
-                    except Exception as e:
-                        print(f"Error saving answer: {e}")
-
-                # Also keep in session for legacy/fallback
-                quiz_answers = session.get("quiz_answers", [])
-                quiz_answers.append(answer_data)
-                session["quiz_answers"] = quiz_answers
-
-                # Advance quiz and update session in DB
-                quiz_data = self.quiz_service.advance_quiz(dict(session), is_correct)
-                session.update(quiz_data)
-
-                # Update quiz session progress
-                if quiz_session_id:
-                    try:
-                        self.quiz_service.create_or_update_session(
-                            dict(session), quiz_session_id
-                        )
-                    except Exception as e:
-                        print(f"Error updating session: {e}")
-
+                # Keep the advanced quiz state server-side
+                self.quiz_service.save_quiz_state(quiz_session_id, result["quiz_data"])
             except ValueError as e:
                 flash(str(e), "error")
 
         return redirect(url_for("main.quiz", list_id=list_id))
 
 
+class QuizAnswersAPIView(MethodView):
+    """JSON endpoint for submitting a batch of quiz answers"""
+
+    def __init__(self):
+        self.quiz_service = QuizService()
+
+    def post(self, session_id):
+        """Check a batch of answers and return a verdict per answer"""
+        payload = request.get_json(silent=True)
+        answers = payload.get("answers") if isinstance(payload, dict) else payload
+        if not isinstance(answers, list) or not answers:
+            return jsonify({"error": "Verwacht een lijst met antwoorden"}), 400
+        if len(answers) > current_app.config["QUIZ_MAX_BATCH_ANSWERS"]:
+            return jsonify({"error": "Te veel antwoorden in een keer"}), 400
+
+        # Only the quiz started in this browser, like the other quiz views
+        quiz_data = None
+        if session_id == session.get("quiz_session_id"):
+            quiz_data = self.quiz_service.load_quiz_state(session_id)
+        if not quiz_data:
+            return jsonify({"error": "Quiz niet gevonden"}), 404
+
+        try:
+            result = self.quiz_service.submit_answers(session_id, quiz_data, answers)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        quiz_data = result["quiz_data"]
+        complete = self.quiz_service.is_quiz_complete(quiz_data)
+        results = self.quiz_service.get_quiz_results(quiz_data)
+        if complete:
+            self.quiz_service.complete_quiz_session(session_id, results["score"])
+            self.quiz_service.clear_quiz_state(session_id)
+        else:
+            self.quiz_service.save_quiz_state(session_id, quiz_data)
+
+        return jsonify(
+            {
+                "results": result["results"],
+                "score": results["score"],
+                "total": results["total"],
+                "index": quiz_data.get("quiz_index", 0),
+                "complete": complete,
+            }
+        )
+
+
 class MixedQuizView(MethodView):
     """View for selecting lists for a mixed quiz"""
 
@@ -515,13 +589,12 @@ class MixedQuizStartView(MethodView):
                 selected_list_ids, direction
             )
             quiz_data["direction"] = direction  # Store direction for history
-            quiz_data["quiz_answers"] = []  # Track all answers
 
-            # Create quiz session in database
+            # Create quiz session in database, keep its state server-side
             quiz_session = self.quiz_service.create_or_update_session(quiz_data)
-            quiz_data["quiz_session_id"] = quiz_session.id
+            self.quiz_service.save_quiz_state(quiz_session.id, quiz_data)
 
-            session.update(quiz_data)
+            session["quiz_session_id"] = quiz_session.id
             flash(f"Quiz gestart met {len(selected_list_ids)} lijst(en)!", "success")
             return redirect(url_for("main.mixed_quiz_question"))
 
@@ -539,43 +612,27 @@ class MixedQuizQuestionView(MethodView):
     def get(self):
         """Display the current quiz question or results"""
         # Check if there's an active mixed quiz
-        if "quiz_list_ids" not in session or "quiz_questions" not in session:
+        quiz_session_id = session.get("quiz_session_id")
+        quiz_data = self.quiz_service.load_quiz_state(quiz_session_id)
+        if not quiz_data or "quiz_list_ids" not in quiz_data:
             flash("Geen actieve quiz. Start een nieuwe quiz.", "error")
             return redirect(url_for("main.mixed_quiz"))
 
         # Check if quiz is complete
-        if self.quiz_service.is_quiz_complete(session):
-            results = self.quiz_service.get_quiz_results(session)
-            list_names = session.get("quiz_list_names", [])
+        if self.quiz_service.is_quiz_complete(quiz_data):
+            results = self.quiz_service.get_quiz_results(quiz_data)
+            list_names = quiz_data.get("quiz_list_names", [])
 
             # Mark session as complete
-            quiz_session_id = session.get("quiz_session_id")
-            if quiz_session_id:
-                try:
-                    self.quiz_service.complete_quiz_session(
-                        quiz_session_id, results["score"]
-                    )
-                except Exception as e:
-                    print(f"Error completing quiz session: {e}")
-            else:
-                # Fallback: save legacy way if no session ID
-                quiz_answers = session.get("quiz_answers", [])
-                if quiz_answers:
-                    try:
-                        self.quiz_service.save_quiz_session(dict(session), quiz_answers)
-                    except Exception as e:
-                        print(f"Error saving quiz session: {e}")
+            try:
+                self.quiz_service.complete_quiz_session(
+                    quiz_session_id, results["score"]
+                )
+            except Exception as e:
+                print(f"Error completing quiz session: {e}")
 
-            # Clear session
-            session.pop("quiz_questions", None)
-            session.pop("quiz_list_ids", None)
-            session.pop("quiz_list_names", None)
-            session.pop("quiz_source_language", None)
-            session.pop("quiz_target_language", None)
-            session.pop("quiz_index", None)
-            session.pop("quiz_score", None)
-            session.pop("quiz_answers", None)
-            session.pop("direction", None)
+            # Clear quiz state
+            self.quiz_service.clear_quiz_state(quiz_session_id)
             session.pop("quiz_session_id", None)
             return render_template(
                 "mixed_quiz_complete.html",
@@ -586,25 +643,20 @@ class MixedQuizQuestionView(MethodView):
 
         # Get current question
         entry, updated_quiz_data, progress, direction = (
-            self.quiz_service.get_current_question(dict(session))
+            self.quiz_service.get_current_question(quiz_data)
         )
         if not entry:
-            # All entries were deleted or quiz is broken, clear session
-            session.pop("quiz_questions", None)
-            session.pop("quiz_list_ids", None)
-            session.pop("quiz_list_names", None)
-            session.pop("quiz_source_language", None)
-            session.pop("quiz_target_language", None)
-            session.pop("quiz_index", None)
-            session.pop("quiz_score", None)
+            # All entries were deleted or quiz is broken, clear state
+            self.quiz_service.clear_quiz_state(quiz_session_id)
+            session.pop("quiz_session_id", None)
             flash("De quiz kon niet worden geladen. Probeer opnieuw.", "error")
             return redirect(url_for("main.mixed_quiz"))
 
-        # Update session
-        session.update(updated_quiz_data)
+        # Store potentially skipped indices
+        self.quiz_service.save_quiz_state(quiz_session_id, updated_quiz_data)
 
         form = QuizAnswerForm()
-        list_names = session.get("quiz_list_names", [])
+        list_names = updated_quiz_data.get("quiz_list_names", [])
         return render_template(
             "mixed_quiz_question.html",
             entry=entry,
@@ -626,25 +678,23 @@ class MixedQuizAnswerView(MethodView):
         form = QuizAnswerForm()
 
         if form.validate_on_submit():
+            quiz_session_id = session.get("quiz_session_id")
+            quiz_data = self.quiz_service.load_quiz_state(quiz_session_id)
+            if not quiz_data:
+                flash("Geen actieve quiz. Start een nieuwe quiz.", "error")
+                return redirect(url_for("main.mixed_quiz"))
+
             entry_id = request.form.get("entry_id", type=int)
             direction = request.form.get("direction", "forward")
             user_answer = form.answer.data
 
             try:
-                is_correct, correct_answer = self.quiz_service.check_answer(
-                    entry_id, user_answer, direction
-                )
-
-                # Get entry for flash message
-                from app.repositories import EntryRepository
-
-                entry_repo = EntryRepository()
-                entry = entry_repo.get_by_id(entry_id)
-
-                # Show the question word based on direction
-                question_word = (
-                    entry.source_word if direction == "forward" else entry.target_word
+                result = self.quiz_service.submit_answer(
+                    quiz_session_id, quiz_data, entry_id, user_answer, direction
                 )
+                is_correct = result["is_correct"]
+                correct_answer = result["correct_answer"]
+                question_word = result["question_word"]
 
                 if is_correct:
                     flash(f"Correct! {escape(question_word)} = {escape(correct_answer)}", "success")
@@ -654,41 +704,8 @@ class MixedQuizAnswerView(MethodView):
                         "error",
                     )
 
-                # Track answer for history
-                answer_data = {
-                    "entry_id": entry_id,
-                    "user_answer": user_answer,
-                    "correct_answer": correct_answer,
-                    "is_correct": is_correct,
-                    "direction": direction,
-                }
-
-                # Save answer to database if we have a session ID
-                quiz_session_id = session.get("quiz_session_id")
-                if quiz_session_id:
-                    try:
-                        self.quiz_service.save_quiz_answer(quiz_session_id, answer_data)
-                    except Exception as e:
-                        print(f"Error saving answer: {e}")
-
-                # Also keep in session for legacy/fallback
-                quiz_answers = session.get("quiz_answers", [])
-                quiz_answers.append(answer_data)
-                session["quiz_answers"] = quiz_answers
-
-                # Advance quiz and update session in DB
-                quiz_data = self.quiz_service.advance_quiz(dict(session), is_correct)
-                session.update(quiz_data)
-
-                # Update quiz session progress
-                if quiz_session_id:
-                    try:
-                        self.quiz_service.create_or_update_session(
-                            dict(session), quiz_session_id
-                        )
-                    except Exception as e:
-                        print(f"Error updating session: {e}")
-
+                # Keep the advanced quiz state server-side
+                self.quiz_service.save_quiz_state(quiz_session_id, result["quiz_data"])
             except ValueError as e:
                 flash(str(e), "error")
 
@@ -703,12 +720,15 @@ class QuizHistoryView(MethodView):
 
     def get(self):
         """Display quiz history with trends"""
-        sessions = self.quiz_service.get_quiz_history()
+        after, limit = get_page_args()
+        sessions = self.quiz_service.get_quiz_history_page(after=after, limit=limit)
         incomplete_sessions = self.quiz_service.get_incomplete_sessions()
         return render_template(
             "quiz_history.html",
             sessions=sessions,
+            stats=self.quiz_service.get_quiz_history_stats(),
             incomplete_sessions=incomplete_sessions,
+            after=after,
         )
 
 
@@ -751,8 +771,9 @@ class ResumeQuizView(MethodView):
             flash("Kan quiz niet hervatten: geen opgeslagen data", "error")
             return redirect(url_for("main.quiz_history"))
 
-        # Load quiz data into session
-        session.update(quiz_session.quiz_data)
+        # Load quiz data into the state store, the cookie only carries the id
+        quiz_data = self.quiz_service.attach_bundle(dict(quiz_session.quiz_data))
+        self.quiz_service.save_quiz_state(quiz_session.id, quiz_data)
         session["quiz_session_id"] = quiz_session.id
 
         # Determine redirect based on quiz type
@@ -779,11 +800,9 @@ class SmartPracticeView(MethodView):
 
     def get(self, list_id=None):
         """Display smart practice start page"""
-        difficult_entries = self.quiz_service.get_difficult_entries(
-            list_id=list_id, limit=15
-        )
+        practice_set = self.quiz_service.get_practice_set(list_id=list_id, limit=15)
 
-        if not difficult_entries:
+        if not practice_set:
             flash("Geen moeilijke woorden gevonden. Oefen eerst wat meer!", "info")
             if list_id:
                 return redirect(url_for("main.list_detail", list_id=list_id))
@@ -796,64 +815,61 @@ class SmartPracticeView(MethodView):
 
         return render_template(
             "smart_practice.html",
-            entries=difficult_entries,
+            entries=list({entry.id: entry for entry, _ in practice_set}.values()),
             word_list=word_list,
         )
 
     def post(self, list_id=None):
         """Start smart practice quiz"""
-        difficult_entries = self.quiz_service.get_difficult_entries(
-            list_id=list_id, limit=15
-        )
+        practice_set = self.quiz_service.get_practice_set(list_id=list_id, limit=15)
 
-        if not difficult_entries:
+        if not practice_set:
             flash("Geen moeilijke woorden gevonden.", "error")
             return redirect(url_for("main.index"))
 
-        # Create quiz questions from difficult entries
+        # Create quiz questions, "random" keeps the scheduled direction
         direction = request.form.get("direction", "random")
-        quiz_questions = []
-        for entry in difficult_entries:
-            if direction == "random":
-                entry_direction = (
-                    "forward"
-                    if entry.success_rate and entry.success_rate < 50
-                    else "reverse"
-                )
-            else:
-                entry_direction = direction
-            quiz_questions.append({"entry_id": entry.id, "direction": entry_direction})
+        quiz_questions = list(
+            dict.fromkeys(
+                (entry.id, entry_direction if direction == "random" else direction)
+                for entry, entry_direction in practice_set
+            )
+        )
 
         # Shuffle for variety
         import random
 
         random.shuffle(quiz_questions)
+        quiz_questions = QuestionQueue(quiz_questions)
 
-        # Store in session
         quiz_data = {
-            "quiz_questions": quiz_questions,
+            "quiz_questions": quiz_questions.encode(),
             "quiz_index": 0,
             "quiz_score": 0,
             "quiz_total": len(quiz_questions),
-            "quiz_answers": [],
             "direction": direction,
         }
+        self.quiz_service.attach_bundle(quiz_data)
 
         if list_id:
             quiz_data["quiz_list_id"] = list_id
-            session.update(quiz_data)
-            flash("Smart practice quiz gestart!", "success")
-            return redirect(url_for("main.quiz", list_id=list_id))
         else:
             # Mixed quiz mode for smart practice across all lists
-            list_ids = list(set(entry.list_id for entry in difficult_entries))
+            list_ids = list(set(entry.list_id for entry, _ in practice_set))
             quiz_data["quiz_list_ids"] = list_ids
             quiz_data["quiz_list_names"] = [
                 self.list_service.get_list_by_id(lid).name for lid in list_ids
             ]
-            session.update(quiz_data)
-            flash("Smart practice quiz gestart!", "success")
-            return redirect(url_for("main.mixed_quiz_question"))
+
+        # Create quiz session in database, keep its state server-side
+        quiz_session = self.quiz_service.create_or_update_session(quiz_data)
+        self.quiz_service.save_quiz_state(quiz_session.id, quiz_data)
+        session["quiz_session_id"] = quiz_session.id
+
+        flash("Smart practice quiz gestart!", "success")
+        if list_id:
+            return redirect(url_for("main.quiz", list_id=list_id))
+        return redirect(url_for("main.mixed_quiz_question"))
 
 
 class AIGenerateView(MethodView):
@@ -861,6 +877,7 @@ class AIGenerateView(MethodView):
 
     def __init__(self):
         self.ai_service = AIService()
+        self.job_service = AIJobService()
         self.list_service = ListService()
         self.language_service = LanguageService()
 
@@ -910,38 +927,16 @@ class AIGenerateView(MethodView):
                     )
 
                 count = int(form.count.data) if form.count.data else None
-                items = self.ai_service.generate_list(
+                job = self.job_service.submit_job(
                     provider_key=form.provider.data,
                     topic=form.topic.data,
-                    source_language=source_language.name,
-                    target_language=target_language.name,
+                    source_language_id=source_language.id,
+                    target_language_id=target_language.id,
                     entry_type=form.entry_type.data,
                     count=count,
+                    regenerate=form.regenerate.data,
                 )
-
-                # Store generated items in session for saving
-                session["ai_generated_items"] = items
-                session["ai_generated_meta"] = {
-                    "topic": form.topic.data,
-                    "source_language_id": source_language.id,
-                    "target_language_id": target_language.id,
-                    "source_language_name": source_language.name,
-                    "target_language_name": target_language.name,
-                    "entry_type": form.entry_type.data,
-                }
-
-                save_form = SaveGeneratedListForm()
-                save_form.list_name.data = form.topic.data
-
-                flash(f"{len(items)} items gegenereerd!", "success")
-                return render_template(
-                    "ai_generate.html",
-                    form=form,
-                    providers=providers,
-                    generated_items=items,
-                    save_form=save_form,
-                    meta=session["ai_generated_meta"],
-                )
+                return redirect(url_for("main.ai_generate_job", job_id=job.id))
 
             except Exception as e:
                 flash(f"Fout bij genereren: {str(e)}", "error")
@@ -951,6 +946,267 @@ class AIGenerateView(MethodView):
         )
 
 
+class AIGenerateJobView(MethodView):
+    """View showing a background generation, with its items once done"""
+
+    def __init__(self):
+        self.ai_service = AIService()
+        self.job_service = AIJobService()
+        self.language_service = LanguageService()
+
+    def get(self, job_id):
+        """Display the generation status or the generated items"""
+        job = self.job_service.get_job(job_id)
+        if job is None:
+            flash("Generatie niet gevonden", "error")
+            return redirect(url_for("main.ai_generate"))
+        if job.status == "failed":
+            flash(f"Fout bij genereren: {job.error}", "error")
+            return redirect(url_for("main.ai_generate"))
+
+        providers = self.ai_service.get_available_providers()
+        languages = self.language_service.get_all_languages()
+        form = AIGenerateForm(
+            providers=providers,
+            languages=languages,
+            provider=job.provider,
+            topic=job.topic,
+            entry_type=job.entry_type,
+            source_language_id=job.source_language_id,
+            target_language_id=job.target_language_id,
+            count=str(job.count) if job.count else "",
+        )
+
+        if job.status != "done":
+            return render_template(
+                "ai_generate.html",
+                form=form,
+                providers=providers,
+                generated_items=None,
+                job=job,
+            )
+
+        # Store generated items in session for saving
+        session["ai_generated_items"] = job.items
+        session["ai_generated_meta"] = {
+            "topic": job.topic,
+            "source_language_id": job.source_language_id,
+            "target_language_id": job.target_language_id,
+            "source_language_name": job.source_language.name,
+            "target_language_name": job.target_language.name,
+            "entry_type": job.entry_type,
+        }
+
+        save_form = SaveGeneratedListForm()
+        save_form.list_name.data = job.topic
+
+        flash(f"{len(job.items)} items gegenereerd!", "success")
+        return render_template(
+            "ai_generate.html",
+            form=form,
+            providers=providers,
+            generated_items=job.items,
+            save_form=save_form,
+            meta=session["ai_generated_meta"],
+        )
+
+
+class AIJobStatusAPIView(MethodView):
+    """JSON endpoint for polling a background generation"""
+
+    def __init__(self):
+        self.job_service = AIJobService()
+
+    def get(self, job_id):
+        """Return the status of a generation job"""
+        job = self.job_service.get_job(job_id)
+        if job is None:
+            return jsonify({"error": "Generatie niet gevonden"}), 404
+        return jsonify(
+            {
+                "id": job.id,
+                "status": job.status,
+                "finished": job.is_finished,
+                "item_count": len(job.items) if job.items else 0,
+                "error": job.error,
+            }
+        )
+
+
+class AIJobEventsAPIView(MethodView):
+    """Server-sent events with the items of a generation as they arrive"""
+
+    def __init__(self):
+        self.job_service = AIJobService()
+
+    def get(self, job_id):
+        """
+        Stream "item" events and a final "done" event
+
+        The stream holds a request worker, so it closes after
+        AI_JOB_EVENTS_DURATION seconds. EventSource then reconnects with the
+        Last-Event-ID header (the number of items received) and the stream
+        resumes from there.
+        """
+        if self.job_service.get_job(job_id) is None:
+            return jsonify({"error": "Generatie niet gevonden"}), 404
+        sent = max(0, request.headers.get("Last-Event-ID", 0, type=int))
+        duration = current_app.config["AI_JOB_EVENTS_DURATION"]
+
+        def events():
+            nonlocal sent
+            # Reconnect right away instead of the browser's default delay
+            yield "retry: 500\n\n"
+            for event, data in self.job_service.follow_job(job_id, sent, duration):
+                if event == "done":
+                    data = {"status": data.status, "error": data.error}
+                    yield f"event: done\ndata: {json.dumps(data)}\n\n"
+                else:
+                    sent += 1
+                    yield f"id: {sent}\nevent: item\ndata: {json.dumps(data)}\n\n"
+
+        return Response(
+            stream_with_context(events()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+class AIBatchGenerateView(MethodView):
+    """View for generating several topics or providers at once"""
+
+    def __init__(self):
+        self.ai_service = AIService()
+        self.job_service = AIJobService()
+        self.language_service = LanguageService()
+
+    def get(self):
+        """Display the batch generation form"""
+        providers = self.ai_service.get_available_providers()
+        languages = self.language_service.get_all_languages()
+        form = None
+        if any(p["available"] for p in providers):
+            form = AIBatchGenerateForm(providers=providers, languages=languages)
+        return render_template("ai_batch_generate.html", form=form, batch=None)
+
+    def post(self):
+        """Queue a job per topic and provider"""
+        providers = self.ai_service.get_available_providers()
+        languages = self.language_service.get_all_languages()
+        form = AIBatchGenerateForm(providers=providers, languages=languages)
+
+        if form.validate_on_submit():
+            try:
+                batch = self.job_service.submit_batch(
+                    provider_keys=form.providers.data,
+                    topics=form.topics.data.splitlines(),
+                    source_language_id=form.source_language_id.data,
+                    target_language_id=form.target_language_id.data,
+                    entry_type=form.entry_type.data,
+                    count=int(form.count.data) if form.count.data else None,
+                    regenerate=form.regenerate.data,
+                )
+                return redirect(url_for("main.ai_batch", batch_id=batch.id))
+            except Exception as e:
+                flash(f"Fout bij genereren: {str(e)}", "error")
+
+        return render_template("ai_batch_generate.html", form=form, batch=None)
+
+
+class AIBatchView(MethodView):
+    """View showing the progress of a batch, with the merged items once done"""
+
+    def __init__(self):
+        self.ai_service = AIService()
+        self.job_service = AIJobService()
+        self.language_service = LanguageService()
+
+    def get(self, batch_id):
+        """Display the batch progress or the merged preview"""
+        batch = self.job_service.get_batch(batch_id)
+        if batch is None:
+            flash("Generatie niet gevonden", "error")
+            return redirect(url_for("main.ai_batch_generate"))
+
+        first_job = batch.jobs[0]
+        form = AIBatchGenerateForm(
+            providers=self.ai_service.get_available_providers(),
+            languages=self.language_service.get_all_languages(),
+            topics="\n".join(dict.fromkeys(job.topic for job in batch.jobs)),
+            entry_type=first_job.entry_type,
+            source_language_id=first_job.source_language_id,
+            target_language_id=first_job.target_language_id,
+            count=str(first_job.count) if first_job.count else "",
+        )
+        form.providers.data = list(dict.fromkeys(job.provider for job in batch.jobs))
+        context = dict(
+            form=form,
+            batch=batch,
+            provider_names=AIService.PROVIDER_NAMES,
+            generated_items=None,
+        )
+        if not batch.is_finished:
+            return render_template("ai_batch_generate.html", **context)
+
+        items = self.job_service.merge_batch_items(batch)
+        if not items:
+            flash("Geen items gegenereerd", "error")
+            return render_template("ai_batch_generate.html", **context)
+
+        # Store generated items in session for saving
+        session["ai_generated_items"] = items
+        session["ai_generated_meta"] = {
+            "topic": first_job.topic,
+            "source_language_id": first_job.source_language_id,
+            "target_language_id": first_job.target_language_id,
+            "source_language_name": first_job.source_language.name,
+            "target_language_name": first_job.target_language.name,
+            "entry_type": first_job.entry_type,
+        }
+
+        save_form = SaveGeneratedListForm()
+        save_form.list_name.data = first_job.topic
+
+        context["generated_items"] = items
+        return render_template(
+            "ai_batch_generate.html",
+            save_form=save_form,
+            meta=session["ai_generated_meta"],
+            **context,
+        )
+
+
+class AIBatchStatusAPIView(MethodView):
+    """JSON endpoint for polling a batch"""
+
+    def __init__(self):
+        self.job_service = AIJobService()
+
+    def get(self, batch_id):
+        """Return the status of every job in a batch"""
+        batch = self.job_service.get_batch(batch_id)
+        if batch is None:
+            return jsonify({"error": "Generatie niet gevonden"}), 404
+        return jsonify(
+            {
+                "id": batch.id,
+                "finished": batch.is_finished,
+                "jobs": [
+                    {
+                        "id": job.id,
+                        "topic": job.topic,
+                        "provider": job.provider,
+                        "status": job.status,
+                        "finished": job.is_finished,
+                        "item_count": len(job.items) if job.items else 0,
+                        "error": job.error,
+                    }
+                    for job in batch.jobs
+                ],
+            }
+        )
+
+
 class AISaveListView(MethodView):
     """View for saving AI-generated list"""
 
@@ -984,22 +1240,15 @@ class AISaveListView(MethodView):
             return redirect(url_for("main.ai_generate"))
 
         try:
-            # Create the list
-            word_list = self.list_service.create_list(
+            # Create the list with all items in one transaction
+            word_list = self.list_service.create_list_with_entries(
                 form.list_name.data,
                 meta["source_language_id"],
                 meta["target_language_id"],
+                items,
+                meta["entry_type"],
             )
 
-            # Add all items
-            for item in items:
-                self.list_service.add_entry_to_list(
-                    word_list.id,
-                    item["source"],
-                    item["target"],
-                    meta["entry_type"],
-                )
-
             # Clear session
             session.pop("ai_generated_items", None)
             session.pop("ai_generated_meta", None)
@@ -1013,3 +1262,11 @@ class AISaveListView(MethodView):
         except Exception as e:
             flash(f"Fout bij opslaan: {str(e)}", "error")
             return redirect(url_for("main.ai_generate"))
+
+
+class AICacheStatsAPIView(MethodView):
+    """JSON endpoint with the hit/miss counters of the AI response cache"""
+
+    def get(self):
+        """Return the cache counters and size"""
+        return jsonify(get_ai_response_cache().stats())
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+class ViteManifest:
+    """In-memory view of the Vite build manifest
+
+    The manifest is parsed once into an entry -> URL map. With auto_reload
+    enabled (development) the file's mtime is checked on lookup and the map
+    is rebuilt when it changes; otherwise the first parse is kept for the
+    lifetime of the process.
+    """
+
+    def __init__(
+        self,
+        manifest_path: str,
+        base_url: str = "/static/dist",
+        auto_reload: bool = False,
+    ):
+        self.manifest_path = manifest_path
+        self.base_url = base_url.rstrip("/")
+        self.auto_reload = auto_reload
+        self._assets: Dict[str, str] = {}
+        self._css: Dict[str, List[str]] = {}
+        self._mtime: Optional[float] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.manifest_path).st_mtime
+        except OSError:
+            return None
+
+    def _refresh(self) -> None:
+        """(Re)load the manifest if it has not been loaded or has changed"""
+        if self._loaded and not self.auto_reload:
+            return
+
+        mtime = self._current_mtime()
+        if self._loaded and mtime == self._mtime:
+            return
+
+        with self._lock:
+            if self._loaded and mtime == self._mtime:
+                return
+
+            assets = {}
+            css = {}
+            if mtime is not None:
+                with open(self.manifest_path, "r") as f:
+                    manifest = json.load(f)
+                for entry, chunk in manifest.items():
+                    if "file" in chunk:
+                        assets[entry] = f"{self.base_url}/{chunk['file']}"
+                    css[entry] = [f"{self.base_url}/{c}" for c in chunk.get("css", [])]
+
+            self._assets = assets
+            self._css = css
+            self._mtime = mtime
+            self._loaded = True
+
+    def asset(self, entry: str) -> str:
+        """Get the built URL for an entry, falling back to the dev path"""
+        self._refresh()
+        return self._assets.get(entry, f"{self.base_url}/assets/{entry}")
+
+    def css(self, entry: str) -> List[str]:
+        """Get the CSS URLs emitted for an entry"""
+        self._refresh()
+        return self._css.get(entry, [])
@@ -8,6 +8,16 @@ basedir = Path(__file__).parent
 load_dotenv(basedir / ".env", override=True)
 
 
+def parse_provider_limits(value, cast=int):
+    """Parse "openai=8,ollama=1" into {"openai": 8, "ollama": 1}"""
+    limits = {}
+    for pair in value.split(","):
+        if pair.strip():
+            key, limit = pair.split("=")
+            limits[key.strip()] = cast(limit)
+    return limits
+
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-change-in-production"
     SQLALCHEMY_DATABASE_URI = (
@@ -15,7 +25,107 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Keyset pagination: default page size and the cap for ?limit=
+    PAGE_SIZE = int(os.environ.get("PAGE_SIZE", 50))
+    MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 200))
+
+    # Importing CSV/TSV/Anki files: rows validated and written per chunk, and
+    # the largest upload accepted (in MB)
+    IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", 5000))
+    MAX_CONTENT_LENGTH = int(os.environ.get("MAX_UPLOAD_MB", 100)) * 1024 * 1024
+
+    # Re-read the Vite manifest when it changes on disk (defaults to debug mode)
+    VITE_MANIFEST_RELOAD = (
+        os.environ.get("VITE_MANIFEST_RELOAD", "").lower() in ("1", "true", "yes")
+        if os.environ.get("VITE_MANIFEST_RELOAD")
+        else None
+    )
+
+    # Server-side quiz state: "memory", "sqlite" or "redis"
+    QUIZ_STATE_BACKEND = os.environ.get("QUIZ_STATE_BACKEND", "memory")
+    QUIZ_STATE_MAX_ENTRIES = int(os.environ.get("QUIZ_STATE_MAX_ENTRIES", 1000))
+    QUIZ_STATE_SQLITE_PATH = os.environ.get(
+        "QUIZ_STATE_SQLITE_PATH", str(basedir / "instance" / "quiz_state.db")
+    )
+    QUIZ_STATE_REDIS_URL = os.environ.get(
+        "QUIZ_STATE_REDIS_URL", "redis://localhost:6379/0"
+    )
+    QUIZ_STATE_TTL = int(os.environ.get("QUIZ_STATE_TTL", 86400))
+    QUIZ_MAX_BATCH_ANSWERS = int(os.environ.get("QUIZ_MAX_BATCH_ANSWERS", 100))
+
+    # Answer checking: "exact" or "tolerant" (ignores accents, punctuation
+    # and allows typos up to ANSWER_MAX_ERROR_RATE of the answer length)
+    ANSWER_MATCHING = os.environ.get("ANSWER_MATCHING", "exact")
+    ANSWER_MAX_ERROR_RATE = float(os.environ.get("ANSWER_MAX_ERROR_RATE", 0.2))
+    ANSWER_MIN_FUZZY_LENGTH = int(os.environ.get("ANSWER_MIN_FUZZY_LENGTH", 4))
+    ANSWER_VARIANT_CACHE_SIZE = int(os.environ.get("ANSWER_VARIANT_CACHE_SIZE", 10000))
+
     # AI Provider Configuration
     OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
     ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
     OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+    OLLAMA_PROBE_TIMEOUT = float(os.environ.get("OLLAMA_PROBE_TIMEOUT", 2))
+    # Seconds the resolved Ollama model is reused before listing models again
+    AI_MODEL_CACHE_TTL = float(os.environ.get("AI_MODEL_CACHE_TTL", 300))
+
+    # Provider health cache: seconds a successful/failed probe stays valid and
+    # how often the background thread re-probes (0 disables the thread)
+    AI_HEALTH_TTL = float(os.environ.get("AI_HEALTH_TTL", 60))
+    AI_HEALTH_NEGATIVE_TTL = float(os.environ.get("AI_HEALTH_NEGATIVE_TTL", 15))
+    AI_HEALTH_REFRESH_INTERVAL = float(os.environ.get("AI_HEALTH_REFRESH_INTERVAL", 30))
+
+    # Generated lists are cached per provider and prompt: seconds a result
+    # stays valid and the number of results kept (least recently used go first)
+    AI_CACHE_TTL = float(os.environ.get("AI_CACHE_TTL", 7 * 86400))
+    AI_CACHE_MAX_ENTRIES = int(os.environ.get("AI_CACHE_MAX_ENTRIES", 1000))
+
+    # Background generation: worker threads (0 runs jobs inline), unfinished
+    # jobs accepted at once, seconds after which a running job failed and
+    # seconds a job may wait for a provider slot (batches queue up). Progress
+    # is saved every AI_JOB_SAVE_EVERY items or AI_JOB_SAVE_INTERVAL seconds
+    AI_JOB_WORKERS = int(os.environ.get("AI_JOB_WORKERS", 2))
+    AI_JOB_MAX_PENDING = int(os.environ.get("AI_JOB_MAX_PENDING", 20))
+    AI_JOB_TIMEOUT = float(os.environ.get("AI_JOB_TIMEOUT", 300))
+    AI_JOB_QUEUE_TIMEOUT = float(os.environ.get("AI_JOB_QUEUE_TIMEOUT", 3600))
+    AI_JOB_SAVE_EVERY = int(os.environ.get("AI_JOB_SAVE_EVERY", 10))
+    AI_JOB_SAVE_INTERVAL = float(os.environ.get("AI_JOB_SAVE_INTERVAL", 1))
+    # Seconds a job event stream holds a request worker before the client
+    # reconnects and resumes with Last-Event-ID
+    AI_JOB_EVENTS_DURATION = float(os.environ.get("AI_JOB_EVENTS_DURATION", 30))
+
+    # Generations running at once per provider in this process (single and
+    # batch), as "openai=8,anthropic=4,ollama=1", and the most lists in a batch
+    AI_PROVIDER_CONCURRENCY = parse_provider_limits(
+        os.environ.get("AI_PROVIDER_CONCURRENCY", "openai=8,anthropic=4,ollama=1")
+    )
+    AI_DEFAULT_CONCURRENCY = int(os.environ.get("AI_DEFAULT_CONCURRENCY", 4))
+    AI_BATCH_MAX_JOBS = int(os.environ.get("AI_BATCH_MAX_JOBS", 20))
+
+    # Provider calls: calls per minute (as "openai=60,anthropic=50", providers
+    # without a rate are not limited) with bursts of AI_RATE_BURST, the most
+    # seconds a call waits for the limit, retries of rate limited or failed
+    # calls with jittered exponential backoff, and the circuit breaker that
+    # refuses a provider for AI_BREAKER_RESET seconds after that many failures
+    AI_RATE_LIMITS = parse_provider_limits(
+        os.environ.get("AI_RATE_LIMITS", "openai=60,anthropic=50"), float
+    )
+    AI_RATE_BURST = int(os.environ.get("AI_RATE_BURST", 5))
+    AI_RATE_MAX_WAIT = float(os.environ.get("AI_RATE_MAX_WAIT", 30))
+    AI_RETRY_ATTEMPTS = int(os.environ.get("AI_RETRY_ATTEMPTS", 3))
+    AI_RETRY_BASE_DELAY = float(os.environ.get("AI_RETRY_BASE_DELAY", 1))
+    AI_RETRY_MAX_DELAY = float(os.environ.get("AI_RETRY_MAX_DELAY", 20))
+    AI_BREAKER_THRESHOLD = int(os.environ.get("AI_BREAKER_THRESHOLD", 5))
+    AI_BREAKER_RESET = float(os.environ.get("AI_BREAKER_RESET", 60))
+
+    # Stub provider for load tests and benchmarks (no network): seconds per
+    # answer +/- jitter, share of malformed answers, items per answer (0 uses
+    # the requested count)
+    AI_STUB_ENABLED = os.environ.get("AI_STUB_ENABLED", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    AI_STUB_LATENCY = float(os.environ.get("AI_STUB_LATENCY", 0.5))
+    AI_STUB_JITTER = float(os.environ.get("AI_STUB_JITTER", 0.2))
+    AI_STUB_MALFORMED_RATE = float(os.environ.get("AI_STUB_MALFORMED_RATE", 0))
+    AI_STUB_ITEM_COUNT = int(os.environ.get("AI_STUB_ITEM_COUNT", 0))
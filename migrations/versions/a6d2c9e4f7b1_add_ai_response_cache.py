@@ -0,0 +1,42 @@
+"""Add AI response cache
+
+Revision ID: a6d2c9e4f7b1
+Revises: f1b8d3a6c472
+Create Date: 2026-10-17 16:02:47.215903
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a6d2c9e4f7b1"
+down_revision = "f1b8d3a6c472"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ai_response_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("provider", sa.String(length=20), nullable=False),
+        sa.Column("items", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_ai_response_cache_last_used_at"),
+        "ai_response_cache",
+        ["last_used_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_ai_response_cache_last_used_at"), table_name="ai_response_cache"
+    )
+    op.drop_table("ai_response_cache")
@@ -0,0 +1,70 @@
+"""Add secondary indexes
+
+Revision ID: b3e1c4d2a9f0
+Revises: 7fabdd5e736a
+Create Date: 2026-10-17 10:12:41.204518
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b3e1c4d2a9f0"
+down_revision = "7fabdd5e736a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Foreign keys used for filtering and joins
+    op.create_index("ix_entries_list_id", "entries", ["list_id"])
+    op.create_index("ix_quiz_answers_session_id", "quiz_answers", ["session_id"])
+    op.create_index("ix_quiz_answers_entry_id", "quiz_answers", ["entry_id"])
+    op.create_index(
+        "ix_quiz_session_lists_session_id", "quiz_session_lists", ["session_id"]
+    )
+    op.create_index("ix_quiz_session_lists_list_id", "quiz_session_lists", ["list_id"])
+
+    # Sort columns
+    op.create_index("ix_lists_created_at", "lists", ["created_at"])
+    op.create_index("ix_entries_created_at", "entries", ["created_at"])
+
+    # ListRepository.get_all_ordered: filter on language/category, newest first
+    op.create_index(
+        "ix_lists_source_language_id_created_at",
+        "lists",
+        ["source_language_id", "created_at"],
+    )
+    op.create_index(
+        "ix_lists_target_language_id_created_at",
+        "lists",
+        ["target_language_id", "created_at"],
+    )
+    op.create_index(
+        "ix_lists_category_id_created_at", "lists", ["category_id", "created_at"]
+    )
+
+    # QuizService.get_quiz_history / get_incomplete_sessions
+    op.create_index(
+        "ix_quiz_sessions_status_completed_at",
+        "quiz_sessions",
+        ["status", "completed_at"],
+    )
+    op.create_index(
+        "ix_quiz_sessions_status_started_at", "quiz_sessions", ["status", "started_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_quiz_sessions_status_started_at", table_name="quiz_sessions")
+    op.drop_index("ix_quiz_sessions_status_completed_at", table_name="quiz_sessions")
+    op.drop_index("ix_lists_category_id_created_at", table_name="lists")
+    op.drop_index("ix_lists_target_language_id_created_at", table_name="lists")
+    op.drop_index("ix_lists_source_language_id_created_at", table_name="lists")
+    op.drop_index("ix_entries_created_at", table_name="entries")
+    op.drop_index("ix_lists_created_at", table_name="lists")
+    op.drop_index("ix_quiz_session_lists_list_id", table_name="quiz_session_lists")
+    op.drop_index("ix_quiz_session_lists_session_id", table_name="quiz_session_lists")
+    op.drop_index("ix_quiz_answers_entry_id", table_name="quiz_answers")
+    op.drop_index("ix_quiz_answers_session_id", table_name="quiz_answers")
+    op.drop_index("ix_entries_list_id", table_name="entries")
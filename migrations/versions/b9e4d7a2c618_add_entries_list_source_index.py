@@ -0,0 +1,25 @@
+"""Add entries (list_id, source_word) index
+
+Revision ID: b9e4d7a2c618
+Revises: d2f7b4e9a813
+Create Date: 2026-10-17 19:02:47.318254
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b9e4d7a2c618"
+down_revision = "d2f7b4e9a813"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_entries_list_id_source_word", "entries", ["list_id", "source_word"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_entries_list_id_source_word", table_name="entries")
@@ -0,0 +1,47 @@
+"""Add AI generation jobs
+
+Revision ID: c5e8a3f1d906
+Revises: a6d2c9e4f7b1
+Create Date: 2026-10-17 16:40:12.584317
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5e8a3f1d906"
+down_revision = "a6d2c9e4f7b1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ai_generation_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("provider", sa.String(length=20), nullable=False),
+        sa.Column("topic", sa.String(length=200), nullable=False),
+        sa.Column("source_language_id", sa.Integer(), nullable=False),
+        sa.Column("target_language_id", sa.Integer(), nullable=False),
+        sa.Column("entry_type", sa.String(length=20), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=True),
+        sa.Column("regenerate", sa.Boolean(), nullable=False),
+        sa.Column("items", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["source_language_id"], ["languages.id"]),
+        sa.ForeignKeyConstraint(["target_language_id"], ["languages.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_ai_generation_jobs_status_id", "ai_generation_jobs", ["status", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_ai_generation_jobs_status_id", table_name="ai_generation_jobs")
+    op.drop_table("ai_generation_jobs")
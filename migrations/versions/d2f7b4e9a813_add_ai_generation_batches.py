@@ -0,0 +1,45 @@
+"""Add AI generation batches
+
+Revision ID: d2f7b4e9a813
+Revises: c5e8a3f1d906
+Create Date: 2026-10-17 17:25:38.106472
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d2f7b4e9a813"
+down_revision = "c5e8a3f1d906"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ai_generation_batches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("ai_generation_jobs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("batch_id", sa.Integer(), nullable=True))
+        batch_op.create_index(
+            batch_op.f("ix_ai_generation_jobs_batch_id"), ["batch_id"], unique=False
+        )
+        batch_op.create_foreign_key(
+            "fk_ai_generation_jobs_batch_id",
+            "ai_generation_batches",
+            ["batch_id"],
+            ["id"],
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("ai_generation_jobs", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_ai_generation_jobs_batch_id", type_="foreignkey")
+        batch_op.drop_index(batch_op.f("ix_ai_generation_jobs_batch_id"))
+        batch_op.drop_column("batch_id")
+
+    op.drop_table("ai_generation_batches")
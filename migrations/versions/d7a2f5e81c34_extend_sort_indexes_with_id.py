@@ -0,0 +1,66 @@
+"""Extend sort indexes with id for keyset pagination
+
+Revision ID: d7a2f5e81c34
+Revises: b3e1c4d2a9f0
+Create Date: 2026-10-17 11:02:17.583120
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d7a2f5e81c34"
+down_revision = "b3e1c4d2a9f0"
+branch_labels = None
+depends_on = None
+
+# (old name, new name, table, old columns, new columns)
+INDEXES = [
+    (
+        "ix_lists_created_at",
+        "ix_lists_created_at_id",
+        "lists",
+        ["created_at"],
+        ["created_at", "id"],
+    ),
+    (
+        "ix_lists_category_id_created_at",
+        "ix_lists_category_id_created_at_id",
+        "lists",
+        ["category_id", "created_at"],
+        ["category_id", "created_at", "id"],
+    ),
+    (
+        "ix_entries_created_at",
+        "ix_entries_created_at_id",
+        "entries",
+        ["created_at"],
+        ["created_at", "id"],
+    ),
+    (
+        "ix_quiz_sessions_status_completed_at",
+        "ix_quiz_sessions_status_completed_at_id",
+        "quiz_sessions",
+        ["status", "completed_at"],
+        ["status", "completed_at", "id"],
+    ),
+    (
+        "ix_quiz_sessions_status_started_at",
+        "ix_quiz_sessions_status_started_at_id",
+        "quiz_sessions",
+        ["status", "started_at"],
+        ["status", "started_at", "id"],
+    ),
+]
+
+
+def upgrade():
+    for old_name, new_name, table, _, new_columns in INDEXES:
+        op.create_index(new_name, table, new_columns)
+        op.drop_index(old_name, table_name=table)
+
+
+def downgrade():
+    for old_name, new_name, table, old_columns, _ in reversed(INDEXES):
+        op.create_index(old_name, table, old_columns)
+        op.drop_index(new_name, table_name=table)
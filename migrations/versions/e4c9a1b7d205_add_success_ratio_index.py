@@ -0,0 +1,35 @@
+"""Add success ratio expression index
+
+Revision ID: e4c9a1b7d205
+Revises: d7a2f5e81c34
+Create Date: 2026-10-17 14:03:18.552907
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e4c9a1b7d205"
+down_revision = "d7a2f5e81c34"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Must stay identical to Entry.success_ratio for the planner to use it
+    op.create_index(
+        "ix_entries_success_ratio_id",
+        "entries",
+        [
+            sa.text(
+                "(CAST(correct_count AS FLOAT) / "
+                "nullif(correct_count + incorrect_count, 0))"
+            ),
+            "id",
+        ],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_entries_success_ratio_id", table_name="entries")
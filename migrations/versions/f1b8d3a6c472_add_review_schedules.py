@@ -0,0 +1,44 @@
+"""Add review schedules
+
+Revision ID: f1b8d3a6c472
+Revises: e4c9a1b7d205
+Create Date: 2026-10-17 15:21:09.381644
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f1b8d3a6c472"
+down_revision = "e4c9a1b7d205"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "review_schedules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entry_id", sa.Integer(), nullable=False),
+        sa.Column("direction", sa.String(length=20), nullable=False),
+        sa.Column("ease", sa.Float(), nullable=False),
+        sa.Column("interval_days", sa.Float(), nullable=False),
+        sa.Column("repetitions", sa.Integer(), nullable=False),
+        sa.Column("lapses", sa.Integer(), nullable=False),
+        sa.Column("due_at", sa.DateTime(), nullable=False),
+        sa.Column("last_reviewed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["entry_id"], ["entries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "entry_id", "direction", name="uq_review_schedules_entry_id_direction"
+        ),
+    )
+    op.create_index(
+        "ix_review_schedules_due_at_id", "review_schedules", ["due_at", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_review_schedules_due_at_id", table_name="review_schedules")
+    op.drop_table("review_schedules")
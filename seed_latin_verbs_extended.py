@@ -11,7 +11,8 @@ ambulare (to walk)
 """
 
 from app import create_app, db
-from app.models import Entry, Language, List
+from app.models import Language, List
+from app.services import ListService
 
 
 def seed_extended_latin_verbs():
@@ -1112,6 +1113,7 @@ def seed_extended_latin_verbs():
                 db.session.delete(lst)
             db.session.commit()
 
+        list_service = ListService()
         total_conjugations = 0
 
         # Create lists and entries for each verb
@@ -1126,15 +1128,15 @@ def seed_extended_latin_verbs():
             db.session.add(verb_list)
             db.session.flush()
 
-            for latin, english in verb_data["conjugations"]:
-                entry = Entry(
-                    list_id=verb_list.id,
-                    source_word=latin,
-                    target_word=english,
-                    entry_type="verb",
-                )
-                db.session.add(entry)
-                total_conjugations += 1
+            total_conjugations += list_service.bulk_add_entries(
+                verb_list.id,
+                [
+                    {"source": latin, "target": english}
+                    for latin, english in verb_data["conjugations"]
+                ],
+                entry_type="verb",
+                commit=False,
+            )
 
         # Commit all changes
         db.session.commit()
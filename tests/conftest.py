@@ -1,7 +1,11 @@
+from datetime import datetime, timedelta
+
 import pytest
 
 from app import create_app
-from app.models import db
+from app.ai_jobs import get_ai_job_runner
+from app.ai_service import StubProvider
+from app.models import Entry, Language, List, QuizSession, QuizSessionList, db
 
 
 @pytest.fixture
@@ -33,3 +37,150 @@ def client(app):
 def runner(app):
     """A test CLI runner for the app."""
     return app.test_cli_runner()
+
+
+@pytest.fixture
+def count_queries(app):
+    """Context manager factory that counts the SQL statements executed inside it."""
+    from contextlib import contextmanager
+
+    from sqlalchemy import event
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
+
+
+@pytest.fixture
+def seed_lists():
+    """Factory creating languages and `count` lists with a few entries each."""
+
+    def seed(count, entries_per_list=3):
+        source = Language.query.filter_by(code="nl").first()
+        target = Language.query.filter_by(code="en").first()
+        if not source:
+            source = Language(name="Nederlands", code="nl")
+            target = Language(name="Engels", code="en")
+            db.session.add_all([source, target])
+            db.session.flush()
+
+        for i in range(count):
+            vocab_list = List(
+                name=f"Lijst {i}",
+                source_language_id=source.id,
+                target_language_id=target.id,
+            )
+            db.session.add(vocab_list)
+            db.session.flush()
+            db.session.add_all(
+                Entry(list_id=vocab_list.id, source_word=f"w{j}", target_word=f"t{j}")
+                for j in range(entries_per_list)
+            )
+        db.session.commit()
+        db.session.expire_all()
+
+    return seed
+
+
+@pytest.fixture
+def seed_sessions():
+    """Factory creating `count` single-list quiz sessions on the first list."""
+
+    def seed(count, status="completed"):
+        vocab_list = List.query.first()
+        for _ in range(count):
+            quiz_session = QuizSession(
+                quiz_type="single",
+                direction="forward",
+                total_questions=3,
+                correct_answers=2,
+                status=status,
+                completed_at=datetime.utcnow() if status == "completed" else None,
+            )
+            db.session.add(quiz_session)
+            db.session.flush()
+            db.session.add(
+                QuizSessionList(session_id=quiz_session.id, list_id=vocab_list.id)
+            )
+        db.session.commit()
+        db.session.expire_all()
+
+    return seed
+
+
+class FakeClock:
+    """A clock that only moves when told to, as seconds or as a UTC datetime"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        if isinstance(self.now, datetime):
+            self.now += timedelta(seconds=seconds)
+        else:
+            self.now += seconds
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.advance(seconds)
+
+
+@pytest.fixture
+def clock():
+    """A fake monotonic clock, its sleep() advances it."""
+    return FakeClock()
+
+
+@pytest.fixture
+def utc_clock():
+    """A fake datetime.utcnow."""
+    return FakeClock(datetime(2026, 1, 1))
+
+
+@pytest.fixture
+def languages(app):
+    """Dutch and English, committed."""
+    nl = Language(name="Nederlands", code="nl")
+    en = Language(name="Engels", code="en")
+    db.session.add_all([nl, en])
+    db.session.commit()
+    return nl, en
+
+
+@pytest.fixture
+def stub_provider(app):
+    """The stub AI provider, enabled and answering without delay."""
+    app.config.update(
+        AI_STUB_ENABLED=True,
+        AI_STUB_LATENCY=0,
+        AI_STUB_JITTER=0,
+        AI_STUB_MALFORMED_RATE=0,
+        AI_STUB_ITEM_COUNT=0,
+    )
+    return StubProvider
+
+
+@pytest.fixture
+def inline_runner(app):
+    """The AI job runner, running jobs inline on submit."""
+    runner = get_ai_job_runner()
+    runner.max_workers = 0
+    # Batch jobs share the in-memory database connection, so run them one by one
+    runner.provider_limits = {}
+    runner.default_limit = 1
+    return runner
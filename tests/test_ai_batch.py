@@ -0,0 +1,140 @@
+"""
+Batch AI generation: concurrent fan-out, shared per-provider limits and the merged preview.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.ai_jobs import fan_out, get_ai_job_runner
+from app.models import AIGenerationJob, db
+from app.services import AIJobService
+
+
+def test_fan_out_takes_the_time_of_the_slowest_chain(app):
+    """The calls run at once, the provider slots alone limit them"""
+    runner = get_ai_job_runner()
+    runner.provider_limits = {"slow": 2}
+    runner.default_limit = 8
+    running = {"fast": 0, "slow": 0}
+    peak = {"fast": 0, "slow": 0}
+    lock = threading.Lock()
+
+    def call(key, result):
+        def run():
+            with runner.provider_slot(key):
+                with lock:
+                    running[key] += 1
+                    peak[key] = max(peak[key], running[key])
+                time.sleep(0.1)
+                with lock:
+                    running[key] -= 1
+            return result
+
+        return run
+
+    calls = [call("fast", i) for i in range(8)]
+    calls += [call("slow", i) for i in range(8, 12)]
+
+    started = time.perf_counter()
+    results = fan_out(calls)
+    elapsed = time.perf_counter() - started
+
+    assert results == list(range(12))
+    assert peak == {"fast": 8, "slow": 2}
+    # 12 sequential calls take 1.2s; the 2-wide "slow" chain takes 0.2s
+    assert elapsed < 0.6
+
+
+def test_fan_out_returns_exceptions_in_place():
+    def fail():
+        raise ValueError("Kapot")
+
+    results = fan_out([lambda: 1, fail, lambda: 0])
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 0
+    assert fan_out([]) == []
+
+
+def test_batch_preview_merges_and_deduplicates(
+    client, stub_provider, languages, inline_runner
+):
+    nl, en = languages
+    response = client.post(
+        "/ai/batch",
+        data={
+            "providers": ["stub"],
+            "topics": "Dieren\nFruit\n\nDieren\ndieren",
+            "entry_type": "word",
+            "source_language_id": nl.id,
+            "target_language_id": en.id,
+            "count": "5",
+        },
+        follow_redirects=True,
+    )
+    assert response.status_code == 200
+    dieren, fruit, lowercase = AIGenerationJob.query.order_by(AIGenerationJob.id)
+    # The cache ignores case, so both animal lists have the same items
+    assert lowercase.items == dieren.items
+    with client.session_transaction() as session:
+        assert session["ai_generated_items"] == dieren.items + fruit.items
+        assert len(session["ai_generated_items"]) == 10
+    assert b"Opslaan als Nieuwe Lijst" in response.data
+
+
+def test_batch_status(client, stub_provider, languages, inline_runner):
+    nl, en = languages
+    batch = AIJobService().submit_batch(
+        ["stub"], ["Dieren", "Fruit"], nl.id, en.id, "word", 5
+    )
+    db.session.expire_all()
+    data = client.get(f"/api/ai/batches/{batch.id}").get_json()
+    assert data["finished"] is True
+    assert [(job["topic"], job["item_count"]) for job in data["jobs"]] == [
+        ("Dieren", 5),
+        ("Fruit", 5),
+    ]
+    assert client.get("/api/ai/batches/999").status_code == 404
+
+
+def test_batch_size_is_limited(app, stub_provider, languages, inline_runner):
+    nl, en = languages
+    inline_runner.max_batch_jobs = 3
+    service = AIJobService()
+    with pytest.raises(ValueError, match="Te veel lijsten"):
+        service.submit_batch(["stub", "openai"], ["a", "b"], nl.id, en.id, "word")
+    with pytest.raises(ValueError, match="Te veel lijsten"):
+        service.submit_batch(["stub"], ["a", "b", "c", "d"], nl.id, en.id, "word")
+    with pytest.raises(ValueError, match="Kies minimaal"):
+        service.submit_batch(["stub"], [" "], nl.id, en.id, "word")
+
+
+def test_provider_limit_is_shared_by_all_generations(
+    app, stub_provider, languages, inline_runner
+):
+    """A generation waits while other jobs or batches use all provider slots."""
+    nl, en = languages
+    job = AIGenerationJob(
+        provider="stub",
+        topic="Dieren",
+        source_language_id=nl.id,
+        target_language_id=en.id,
+        entry_type="word",
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    slot = inline_runner.provider_slot("stub")
+    assert slot is inline_runner.provider_slot("stub")
+    slot.acquire()
+    worker = threading.Thread(target=inline_runner._run_in_app_context, args=(job.id,))
+    worker.start()
+    worker.join(0.3)
+    assert worker.is_alive()
+
+    slot.release()
+    worker.join(5)
+    db.session.expire_all()
+    assert db.session.get(AIGenerationJob, job.id).status == "done"
@@ -0,0 +1,103 @@
+"""
+AI response cache: prompt keys, TTL, LRU eviction and the regenerate bypass.
+"""
+
+import json
+
+import pytest
+
+from app.ai_cache import AIResponseCache, get_ai_response_cache, make_cache_key
+from app.ai_service import AIProvider, AIService
+from app.models import CachedAIResponse
+
+ITEMS = [{"source": "huis", "target": "house"}]
+
+
+class FakeProvider(AIProvider):
+    calls = []
+
+    def is_available(self):
+        return True
+
+    def _stream_completion(self, prompt):
+        topic = prompt.split('"')[1]
+        self.calls.append(topic)
+        yield json.dumps([{"source": f"{topic} {len(self.calls)}", "target": "x"}])
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    FakeProvider.calls = []
+    monkeypatch.setitem(AIService.PROVIDERS, "fake", FakeProvider)
+    monkeypatch.setitem(AIService.PROVIDER_NAMES, "fake", "Fake")
+    return FakeProvider
+
+
+def generate(topic="Dieren", **kwargs):
+    return AIService().generate_list(
+        "fake", topic, "Nederlands", "Engels", "word", 10, **kwargs
+    )
+
+
+def test_key_ignores_case_and_whitespace():
+    assert make_cache_key("openai", "Lijst  over\nDieren") == make_cache_key(
+        "openai", "lijst over dieren "
+    )
+    assert make_cache_key("openai", "dieren") != make_cache_key("ollama", "dieren")
+    assert make_cache_key("openai", "dieren") != make_cache_key("openai", "fruit")
+
+
+def test_second_generation_is_served_from_cache(app, fake_provider):
+    first = generate()
+    second = generate()
+
+    assert first == second
+    assert fake_provider.calls == ["Dieren"]
+    stats = get_ai_response_cache().stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_different_prompts_are_cached_separately(app, fake_provider):
+    generate("Dieren")
+    generate("Fruit")
+    assert fake_provider.calls == ["Dieren", "Fruit"]
+
+
+def test_regenerate_bypasses_and_replaces_cached_result(app, fake_provider):
+    first = generate()
+    fresh = generate(regenerate=True)
+    assert fresh != first
+    assert generate() == fresh
+    assert fake_provider.calls == ["Dieren", "Dieren"]
+
+
+def test_entries_expire_after_ttl(app, utc_clock):
+    cache = AIResponseCache(ttl=60, max_entries=10, clock=utc_clock)
+    cache.set("k", "openai", ITEMS)
+
+    utc_clock.advance(59)
+    assert cache.get("k") == ITEMS
+    utc_clock.advance(1)
+    assert cache.get("k") is None
+    assert CachedAIResponse.query.count() == 0
+
+
+def test_least_recently_used_entries_are_evicted(app, utc_clock):
+    cache = AIResponseCache(ttl=3600, max_entries=2, clock=utc_clock)
+    cache.set("a", "openai", ITEMS)
+    utc_clock.advance(1)
+    cache.set("b", "openai", ITEMS)
+    utc_clock.advance(1)
+    cache.get("a")
+    utc_clock.advance(1)
+    cache.set("c", "openai", ITEMS)
+
+    assert {entry.key for entry in CachedAIResponse.query} == {"a", "c"}
+
+
+def test_stats_endpoint(client, fake_provider):
+    generate()
+    generate()
+    response = client.get("/api/ai/cache")
+    assert response.status_code == 200
+    assert response.get_json() == {"hits": 1, "misses": 1, "entries": 1}
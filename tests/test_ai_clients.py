@@ -0,0 +1,101 @@
+"""
+AI SDK client reuse and Ollama model resolution caching.
+"""
+
+import json
+import sys
+import types
+
+import pytest
+
+from app.ai_clients import AIClientRegistry, choose_ollama_model
+from app.ai_service import OllamaProvider
+
+
+class FakeOllamaClient:
+    instances = []
+
+    def __init__(self, host, timeout=None):
+        self.host = host
+        self.timeout = timeout
+        self.list_calls = 0
+        self.chat_error = None
+        FakeOllamaClient.instances.append(self)
+
+    def list(self):
+        self.list_calls += 1
+        return {"models": [{"name": "phi3:latest"}, {"name": "llama3.2:latest"}]}
+
+    def chat(self, model, messages, stream=False):
+        if self.chat_error:
+            raise self.chat_error
+        content = json.dumps([{"source": "huis", "target": "house"}])
+        assert stream
+        return (
+            {"message": {"content": content[i : i + 5]}}
+            for i in range(0, len(content), 5)
+        )
+
+
+@pytest.fixture
+def fake_sdks(monkeypatch):
+    FakeOllamaClient.instances = []
+    openai = types.ModuleType("openai")
+    openai.OpenAI = lambda api_key: types.SimpleNamespace(api_key=api_key)
+    ollama = types.ModuleType("ollama")
+    ollama.Client = FakeOllamaClient
+    monkeypatch.setitem(sys.modules, "openai", openai)
+    monkeypatch.setitem(sys.modules, "ollama", ollama)
+
+
+def test_clients_are_created_once_per_config(fake_sdks):
+    registry = AIClientRegistry()
+    first = registry.openai("key-1")
+    assert registry.openai("key-1") is first
+    assert registry.openai("key-2") is not first
+
+    probe_client = registry.ollama("http://ollama:11434", timeout=2)
+    assert registry.ollama("http://ollama:11434", timeout=2) is probe_client
+    assert registry.ollama("http://ollama:11434") is not probe_client
+    assert len(FakeOllamaClient.instances) == 2
+
+
+def test_choose_ollama_model():
+    assert choose_ollama_model(["phi3", "mistral:7b", "llama3:8b"]) == "llama3:8b"
+    assert choose_ollama_model(["phi3"]) == "phi3"
+    assert choose_ollama_model([]) is None
+
+
+def test_ollama_model_is_cached_for_its_ttl(fake_sdks, clock):
+    registry = AIClientRegistry(model_ttl=300, clock=clock)
+    host = "http://ollama:11434"
+
+    assert registry.ollama_model(host) == "llama3.2:latest"
+    assert registry.ollama_model(host) == "llama3.2:latest"
+    client = registry.ollama(host)
+    assert client.list_calls == 1
+
+    clock.advance(300)
+    registry.ollama_model(host)
+    assert client.list_calls == 2
+
+
+def test_generation_reuses_client_and_model(app, fake_sdks):
+    app.extensions["ai_clients"] = AIClientRegistry()
+    provider = OllamaProvider()
+
+    for _ in range(3):
+        items = provider.generate_list("huis", "Nederlands", "Engels", "word", 1)
+        assert items == [{"source": "huis", "target": "house"}]
+
+    generation_clients = [c for c in FakeOllamaClient.instances if c.timeout is None]
+    assert len(generation_clients) == 1
+    assert generation_clients[0].list_calls == 1
+
+    # A failing chat forgets the model, so it is resolved again
+    generation_clients[0].chat_error = RuntimeError("model not found")
+    with pytest.raises(RuntimeError):
+        provider.generate_list("huis", "Nederlands", "Engels", "word", 1)
+    generation_clients[0].chat_error = None
+    provider.generate_list("huis", "Nederlands", "Engels", "word", 1)
+    assert generation_clients[0].list_calls == 2
@@ -0,0 +1,103 @@
+"""
+Provider health cache: TTLs, negative caching and the background refresher.
+"""
+
+import time
+
+from app.ai_health import ProviderHealthCache
+
+
+class FakeProbe:
+    def __init__(self, results):
+        self.results = dict(results)
+        self.calls = []
+
+    def __call__(self, key):
+        self.calls.append(key)
+        result = self.results[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def make_cache(results, clock):
+    probe = FakeProbe(results)
+    cache = ProviderHealthCache(probe, ttl=60, negative_ttl=10, clock=clock)
+    return cache, probe
+
+
+def test_get_never_probes(clock):
+    """Reads return the default until a probe ran, then the cached state."""
+    cache, probe = make_cache({"ollama": True}, clock)
+    assert cache.get("ollama") is False
+    assert cache.get("ollama", default=True) is True
+    assert probe.calls == []
+
+    cache.refresh_due()
+    assert probe.calls == ["ollama"]
+    assert cache.get("ollama") is True
+
+
+def test_positive_ttl(clock):
+    cache, probe = make_cache({"ollama": True}, clock)
+    cache.refresh("ollama")
+
+    clock.advance(59)
+    assert cache.get("ollama") is True
+    cache.refresh_due()
+    assert probe.calls == ["ollama"]
+
+    clock.advance(1)
+    probe.results["ollama"] = False
+    # Stale: still served, but a probe is requested
+    assert cache.get("ollama") is True
+    cache.refresh_due()
+    assert probe.calls == ["ollama", "ollama"]
+    assert cache.get("ollama") is False
+
+
+def test_negative_caching(clock):
+    """A failed probe is cached for the (shorter) negative TTL."""
+    cache, probe = make_cache({"ollama": ConnectionError("down")}, clock)
+    assert cache.refresh("ollama") is False
+
+    clock.advance(9)
+    cache.get("ollama")
+    cache.refresh_due()
+    assert len(probe.calls) == 1
+
+    clock.advance(1)
+    probe.results["ollama"] = True
+    cache.get("ollama")
+    cache.refresh_due()
+    assert cache.get("ollama") is True
+
+
+def test_background_refresher():
+    probe = FakeProbe({"ollama": True})
+    cache = ProviderHealthCache(probe, ttl=60)
+    cache.start(["ollama"], interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while cache.get("ollama") is False and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get("ollama") is True
+        assert probe.calls == ["ollama"]
+    finally:
+        cache.stop()
+
+
+def test_generate_page_does_not_probe(client, clock):
+    """Rendering the AI page reads the cache instead of probing Ollama."""
+    cache, probe = make_cache({"ollama": True}, clock)
+    client.application.extensions["ai_health"] = cache
+
+    response = client.get("/ai/generate")
+    assert response.status_code == 200
+    assert probe.calls == []
+
+    cache.refresh_due()
+    assert probe.calls == ["ollama"]
+    response = client.get("/ai/generate")
+    assert b"Ollama" in response.data
+    assert probe.calls == ["ollama"]
@@ -0,0 +1,211 @@
+"""
+Background AI generation: the job runner, the poll endpoint and the preview page.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.ai_jobs import get_ai_job_runner
+from app.models import AIGenerationJob, db
+from app.services import AIJobService
+
+
+@pytest.fixture
+def before_item(monkeypatch, stub_provider):
+    """Install a callback the stub runs with the index before each item"""
+
+    def install(callback):
+        stream = stub_provider._stream_completion
+
+        def hooked(self, prompt):
+            # The first chunk opens the array, the next ones hold an item
+            # each and the last one closes it
+            for i, chunk in enumerate(stream(self, prompt)):
+                if i:
+                    callback(i - 1)
+                yield chunk
+
+        monkeypatch.setattr(stub_provider, "_stream_completion", hooked)
+
+    return install
+
+
+def submit(languages, topic="Dieren", count=3):
+    nl, en = languages
+    return AIJobService().submit_job("stub", topic, nl.id, en.id, "word", count)
+
+
+def form_data(languages, topic="Dieren"):
+    nl, en = languages
+    return {
+        "provider": "stub",
+        "topic": topic,
+        "entry_type": "word",
+        "source_language_id": nl.id,
+        "target_language_id": en.id,
+        "count": "10",
+    }
+
+
+def test_generation_runs_in_the_background(app, client, before_item, languages):
+    """The request returns while the provider is still working."""
+    release = threading.Event()
+    before_item(lambda i: i and release.wait(5))
+
+    response = client.post("/ai/generate", data=form_data(languages))
+    assert response.status_code == 302
+    job_id = int(response.headers["Location"].rsplit("/", 1)[1])
+
+    status = client.get(f"/api/ai/jobs/{job_id}").get_json()
+    assert status["finished"] is False
+    assert status["status"] in ("pending", "running")
+    assert b"Bezig met genereren" in client.get(f"/ai/jobs/{job_id}").data
+
+    release.set()
+    get_ai_job_runner().shutdown(wait=True)
+    db.session.expire_all()
+
+    status = client.get(f"/api/ai/jobs/{job_id}").get_json()
+    assert status == {
+        "id": job_id,
+        "status": "done",
+        "finished": True,
+        "item_count": 10,
+        "error": None,
+    }
+
+
+def test_finished_job_shows_items(client, stub_provider, languages, inline_runner):
+    response = client.post(
+        "/ai/generate", data=form_data(languages, "Fruit"), follow_redirects=True
+    )
+    assert b"10 items gegenereerd!" in response.data
+    with client.session_transaction() as session:
+        items = session["ai_generated_items"]
+        assert len(items) == 10
+        assert session["ai_generated_meta"]["target_language_name"] == "Engels"
+    assert items[9]["source"].encode() in response.data
+
+
+def test_failed_job_records_error(client, before_item, languages, inline_runner):
+    def fail(i):
+        raise ValueError("Kapot")
+
+    before_item(fail)
+    job = submit(languages)
+    assert job.status == "failed"
+    assert job.error == "Kapot"
+
+    response = client.get(f"/ai/jobs/{job.id}", follow_redirects=True)
+    assert b"Fout bij genereren: Kapot" in response.data
+
+
+def test_job_runs_once(app, stub_provider, languages, inline_runner):
+    job = submit(languages)
+    assert job.status == "done"
+    assert inline_runner.run(job.id) is None
+
+
+def test_unfinished_job_fails_after_timeout(app, stub_provider, languages):
+    """Running jobs time out after AI_JOB_TIMEOUT, queued ones much later."""
+    nl, en = languages
+    now = datetime.utcnow()
+
+    def add_job(**kwargs):
+        job = AIGenerationJob(
+            provider="stub",
+            topic="Dieren",
+            source_language_id=nl.id,
+            target_language_id=en.id,
+            entry_type="word",
+            **kwargs,
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+    running = add_job(
+        status="running",
+        created_at=now - timedelta(hours=1),
+        started_at=now - timedelta(minutes=10),
+    )
+    just_started = add_job(
+        status="running",
+        created_at=now - timedelta(hours=1),
+        started_at=now - timedelta(minutes=1),
+    )
+    queued = add_job(created_at=now - timedelta(minutes=10))
+    queued_too_long = add_job(created_at=now - timedelta(hours=2))
+
+    service = AIJobService()
+    job = service.get_job(running)
+    assert job.status == "failed"
+    assert job.error == "Generatie duurde te lang"
+    assert service.get_job(just_started).status == "running"
+    assert service.get_job(queued).status == "pending"
+    job = service.get_job(queued_too_long)
+    assert job.status == "failed"
+    assert job.error == "Generatie stond te lang in de wachtrij"
+
+
+def test_timed_out_job_is_not_finished_by_its_worker(
+    app, before_item, languages, inline_runner
+):
+    """The worker stops streaming and leaves the timeout failure in place."""
+
+    def time_out(i):
+        # As a reader's get_job() would do, before the third item
+        if i == 2:
+            job = AIGenerationJob.query.one()
+            job.started_at = datetime.utcnow() - timedelta(hours=1)
+            db.session.commit()
+            AIJobService().get_job(job.id)
+
+    inline_runner.save_every = 1
+    before_item(time_out)
+    job = submit(languages, count=5)
+
+    assert job.status == "failed"
+    assert job.error == "Generatie duurde te lang"
+    assert len(job.items) == 2
+
+
+def test_progress_is_saved_every_few_items(
+    app, stub_provider, languages, inline_runner, count_queries
+):
+    """Each save rewrites the items, the full list is written once at the end."""
+    inline_runner.save_every = 10
+    with count_queries() as statements:
+        job = submit(languages, count=25)
+
+    updates = [s for s in statements if s.startswith("UPDATE ai_generation_jobs")]
+    # start, progress after 10 and 20 items, finish
+    assert len(updates) == 4
+    assert job.status == "done"
+    assert len(job.items) == 25
+
+
+def test_pending_jobs_are_limited(app, stub_provider, languages):
+    nl, en = languages
+    runner = get_ai_job_runner()
+    runner.max_pending = 1
+    db.session.add(
+        AIGenerationJob(
+            provider="stub",
+            topic="Dieren",
+            source_language_id=nl.id,
+            target_language_id=en.id,
+            entry_type="word",
+        )
+    )
+    db.session.commit()
+
+    with pytest.raises(ValueError, match="te veel generaties"):
+        submit(languages)
+
+
+def test_unknown_job(client):
+    response = client.get("/api/ai/jobs/999")
+    assert response.status_code == 404
@@ -0,0 +1,252 @@
+"""
+Provider guard: token bucket rate limits, jittered retries and the circuit breaker.
+"""
+
+import json
+import types
+
+import pytest
+
+from app.ai_limits import CircuitBreaker, ProviderGuard, TokenBucket, is_retryable
+from app.ai_service import AIProvider, AIService
+
+
+class APIStatusError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after else {}
+        self.response = types.SimpleNamespace(headers=headers)
+
+
+def make_guard(clock, **kwargs):
+    options = dict(
+        retries=3,
+        base_delay=1.0,
+        max_delay=20.0,
+        failure_threshold=3,
+        jitter=lambda: 1.0,
+    )
+    options.update(kwargs)
+    guard = ProviderGuard(clock=clock, sleep=clock.sleep, **options)
+    return guard
+
+
+def flaky(errors, items=("a", "b")):
+    """A call that raises the given errors on its first attempts"""
+    attempts = []
+
+    def start():
+        attempts.append(1)
+        if len(attempts) <= len(errors):
+            raise errors[len(attempts) - 1]
+        yield from items
+
+    return start, attempts
+
+
+def test_token_bucket_allows_bursts_then_the_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+    clock.now += 100
+    assert [bucket.try_acquire() for _ in range(4)][-1] > 0
+
+
+def test_rate_limit_waits_and_gives_up_after_max_wait(clock):
+    guard = make_guard(clock, rates={"openai": 60}, burst=2, max_wait=1.5)
+    for _ in range(4):
+        guard.wait_for_token("openai")
+    assert clock.sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+
+    guard.max_wait = 0.5
+    with pytest.raises(ValueError, match="Te veel verzoeken"):
+        guard.wait_for_token("openai")
+    clock.now += 1
+    guard.wait_for_token("openai")
+
+    # Providers without a rate are not limited
+    for _ in range(100):
+        guard.wait_for_token("ollama")
+
+
+def test_rate_limited_calls_are_retried_with_backoff(clock):
+    guard = make_guard(clock)
+    start, attempts = flaky([APIStatusError(429), APIStatusError(503)])
+    assert list(guard.stream("openai", start)) == ["a", "b"]
+    assert len(attempts) == 3
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_backoff_is_jittered_capped_and_honours_retry_after(clock):
+    guard = make_guard(clock, jitter=lambda: 0.5, max_delay=5.0)
+    error = APIStatusError(429)
+    assert [guard.backoff(attempt, error) for attempt in range(5)] == [
+        0.5,
+        1.0,
+        2.0,
+        2.5,
+        2.5,
+    ]
+    assert guard.backoff(0, APIStatusError(429, retry_after=3)) == 3.0
+    assert guard.backoff(0, APIStatusError(429, retry_after=60)) == 5.0
+
+
+def test_retries_are_limited(clock):
+    guard = make_guard(clock, retries=2, failure_threshold=10)
+    start, attempts = flaky([APIStatusError(429)] * 5)
+    with pytest.raises(APIStatusError):
+        list(guard.stream("openai", start))
+    assert len(attempts) == 3
+
+
+def test_only_transient_errors_are_retried(clock):
+    assert is_retryable(APIStatusError(429))
+    assert is_retryable(ConnectionRefusedError())
+    assert not is_retryable(APIStatusError(401))
+    assert not is_retryable(ValueError("Geen geldige items"))
+
+    guard = make_guard(clock)
+    start, attempts = flaky([APIStatusError(401)])
+    with pytest.raises(APIStatusError):
+        list(guard.stream("openai", start))
+    assert len(attempts) == 1
+
+
+def test_no_retry_after_items_were_yielded(clock):
+    guard = make_guard(clock)
+    attempts = []
+
+    def start():
+        attempts.append(1)
+        yield "a"
+        raise APIStatusError(503)
+
+    with pytest.raises(APIStatusError):
+        list(guard.stream("openai", start))
+    assert len(attempts) == 1
+
+
+def test_circuit_breaker_opens_and_allows_a_trial_after_reset(clock):
+    breaker = CircuitBreaker(threshold=2, reset_timeout=60, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+    clock.now += 60
+    assert breaker.allow()  # the trial call
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open
+
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_repeated_failures_refuse_the_provider(clock):
+    guard = make_guard(clock, retries=0, failure_threshold=2)
+    for _ in range(2):
+        start, _ = flaky([APIStatusError(500)])
+        with pytest.raises(APIStatusError):
+            list(guard.stream("openai", start))
+
+    start, attempts = flaky([])
+    with pytest.raises(ValueError, match="tijdelijk niet beschikbaar"):
+        list(guard.stream("openai", start))
+    assert attempts == []
+    assert not guard.is_open("anthropic")
+
+
+def test_unusable_answers_do_not_open_the_breaker(clock):
+    guard = make_guard(clock, retries=0, failure_threshold=1)
+    start, _ = flaky([ValueError("Geen geldige items gevonden in het antwoord")])
+    with pytest.raises(ValueError):
+        list(guard.stream("openai", start))
+    assert not guard.is_open("openai")
+
+
+def test_retries_stop_once_the_breaker_opens(clock):
+    guard = make_guard(clock, retries=5, failure_threshold=2)
+    start, attempts = flaky([APIStatusError(503)] * 5)
+    with pytest.raises(APIStatusError):
+        list(guard.stream("openai", start))
+    assert len(attempts) == 2
+    assert clock.sleeps == [1.0]
+    assert guard.is_open("openai")
+
+
+def test_failed_trial_call_is_not_retried(clock):
+    guard = make_guard(clock, retries=3, failure_threshold=1, reset_timeout=60)
+    start, _ = flaky([APIStatusError(503)])
+    with pytest.raises(APIStatusError):
+        list(guard.stream("openai", start))
+
+    clock.now += 60
+    start, attempts = flaky([APIStatusError(503)] * 3)
+    with pytest.raises(APIStatusError):
+        list(guard.stream("openai", start))
+    assert len(attempts) == 1
+    assert guard.is_open("openai")
+
+
+def test_unusable_trial_answer_closes_the_breaker(clock):
+    guard = make_guard(clock, retries=0, failure_threshold=1, reset_timeout=60)
+    start, _ = flaky([APIStatusError(503)])
+    with pytest.raises(APIStatusError):
+        list(guard.stream("openai", start))
+
+    clock.now += 60
+    start, _ = flaky([ValueError("Geen geldige items gevonden in het antwoord")])
+    with pytest.raises(ValueError, match="Geen geldige items"):
+        list(guard.stream("openai", start))
+    assert not guard.is_open("openai")
+
+
+class RateLimitedProvider(AIProvider):
+    errors = []
+
+    def is_available(self):
+        return True
+
+    def _stream_completion(self, prompt):
+        if self.errors:
+            raise self.errors.pop(0)
+        yield json.dumps([{"source": "huis", "target": "house"}])
+
+
+@pytest.fixture
+def rate_limited_provider(app, monkeypatch, clock):
+    RateLimitedProvider.errors = []
+    monkeypatch.setitem(AIService.PROVIDERS, "limited", RateLimitedProvider)
+    monkeypatch.setitem(AIService.PROVIDER_NAMES, "limited", "Limited")
+    guard = make_guard(clock, retries=1, failure_threshold=2)
+    app.extensions["ai_guard"] = guard
+    return RateLimitedProvider
+
+
+def generate():
+    return AIService().generate_list(
+        "limited", "Dieren", "Nederlands", "Engels", "word", 1, regenerate=True
+    )
+
+
+def test_service_retries_and_marks_failing_provider_unavailable(
+    rate_limited_provider,
+):
+    rate_limited_provider.errors = [APIStatusError(429)]
+    assert generate() == [{"source": "huis", "target": "house"}]
+
+    rate_limited_provider.errors = [APIStatusError(503)] * 2
+    with pytest.raises(APIStatusError):
+        generate()
+    assert AIService().is_provider_available("limited") is False
+    with pytest.raises(ValueError, match="niet beschikbaar"):
+        generate()
@@ -0,0 +1,124 @@
+"""
+Incremental parsing of streamed AI completions and the job event stream.
+"""
+
+import json
+
+import pytest
+
+from app.ai_service import OllamaProvider
+from app.ai_stream import ItemStreamParser, parse_item_stream
+from app.models import AIGenerationJob, Language, db
+
+COMPLETION = """Hier is de lijst:
+```json
+[
+  {"source": "de \\"haak\\" }{", "target": "the [hook]\\\\"},
+  {"source": "huis", "target": ["house", "home"]},
+  {"source": "zonder vertaling"},
+  {"source": "kat", "target": "cat"}
+]
+```"""
+
+EXPECTED = [
+    {"source": 'de "haak" }{', "target": "the [hook]\\"},
+    {"source": "huis", "target": "['house', 'home']"},
+    {"source": "kat", "target": "cat"},
+]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(COMPLETION)])
+def test_items_survive_any_chunking(size):
+    chunks = [COMPLETION[i : i + size] for i in range(0, len(COMPLETION), size)]
+    assert list(parse_item_stream(chunks)) == EXPECTED
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    parser = ItemStreamParser()
+    assert parser.feed('[{"source": "a", "target"') == []
+    assert parser.feed(': "b"}, {"source": "c",') == [{"source": "a", "target": "b"}]
+    assert parser.feed(' "target": "d"}') == [{"source": "c", "target": "d"}]
+    assert not parser.finished
+    assert parser.feed("] en verder [niets]") == []
+    assert parser.finished
+    assert parser.count == 2
+
+
+def test_truncated_completion_keeps_complete_items():
+    items = list(parse_item_stream(['[{"source": "a", "target": "b"}, {"sou']))
+    assert items == [{"source": "a", "target": "b"}]
+
+
+def test_completion_without_items_is_rejected():
+    with pytest.raises(ValueError, match="Geen geldige JSON array"):
+        list(parse_item_stream(["Sorry, dat kan ik niet."]))
+    with pytest.raises(ValueError, match="Geen geldige items"):
+        list(parse_item_stream(['[{"bron": "a"}, {"source": ', "kapot}]"]))
+
+
+def test_parse_response_uses_the_same_parser():
+    assert OllamaProvider()._parse_response(COMPLETION) == EXPECTED
+
+
+def parse_events(response):
+    """(id, event, data) of every event, without the retry field"""
+    events = []
+    for block in response.get_data(as_text=True).strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        if "event" in fields:
+            events.append(
+                (fields.get("id"), fields["event"], json.loads(fields["data"]))
+            )
+    return events
+
+
+@pytest.fixture
+def job(app):
+    nl = Language(name="Nederlands", code="nl")
+    en = Language(name="Engels", code="en")
+    job = AIGenerationJob(
+        provider="ollama",
+        topic="Dieren",
+        source_language=nl,
+        target_language=en,
+        entry_type="word",
+        status="done",
+        items=EXPECTED[:2],
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def test_job_events_stream_items_and_done(client, job):
+    response = client.get(f"/api/ai/jobs/{job.id}/events")
+    assert response.mimetype == "text/event-stream"
+    assert parse_events(response) == [
+        ("1", "item", EXPECTED[0]),
+        ("2", "item", EXPECTED[1]),
+        (None, "done", {"status": "done", "error": None}),
+    ]
+    assert client.get("/api/ai/jobs/999/events").status_code == 404
+
+
+def test_job_events_close_after_a_while_and_resume(app, client, job):
+    """A running job's stream ends in time, the reconnect skips sent items"""
+    app.config["AI_JOB_EVENTS_DURATION"] = 0
+    job.status = "running"
+    db.session.commit()
+
+    response = client.get(f"/api/ai/jobs/{job.id}/events")
+    assert parse_events(response) == [
+        ("1", "item", EXPECTED[0]),
+        ("2", "item", EXPECTED[1]),
+    ]
+
+    job.status = "done"
+    db.session.commit()
+    response = client.get(
+        f"/api/ai/jobs/{job.id}/events", headers={"Last-Event-ID": "1"}
+    )
+    assert parse_events(response) == [
+        ("2", "item", EXPECTED[1]),
+        (None, "done", {"status": "done", "error": None}),
+    ]
@@ -0,0 +1,112 @@
+"""
+Stub AI provider: deterministic answers, malformed output and the full pipeline.
+Benchmark: pytest -m slow -s tests/test_ai_stub.py
+"""
+
+import time
+
+import pytest
+
+from app.ai_jobs import get_ai_job_runner
+from app.ai_service import AIService
+from app.models import Entry, Language, List, db
+
+
+@pytest.fixture
+def stub(stub_provider):
+    return stub_provider()
+
+
+def generate(provider, topic="Dieren", count=10):
+    return provider.generate_list(topic, "Nederlands", "Engels", "word", count)
+
+
+def test_stub_is_only_listed_when_enabled(app):
+    keys = [p["key"] for p in AIService().get_available_providers()]
+    assert "stub" not in keys
+
+    app.config["AI_STUB_ENABLED"] = True
+    providers = AIService().get_available_providers()
+    assert {"key": "stub", "name": "Stub (test)", "available": True} in providers
+
+
+def test_answers_are_deterministic(stub):
+    first = generate(stub)
+    assert len(first) == 10
+    assert generate(stub) == first
+    assert generate(stub, "Fruit") != first
+    assert len(generate(stub, count=15)) == 15
+
+
+def test_item_count_can_be_fixed(app, stub):
+    app.config["AI_STUB_ITEM_COUNT"] = 3
+    assert len(generate(stub, count=20)) == 3
+
+
+def test_fixed_item_count_is_part_of_the_cache_key(app, stub):
+    service = AIService()
+    args = ("stub", "Dieren", "Nederlands", "Engels", "word", 20)
+    app.config["AI_STUB_ITEM_COUNT"] = 3
+    assert len(service.generate_list(*args)) == 3
+    app.config["AI_STUB_ITEM_COUNT"] = 5
+    assert len(service.generate_list(*args)) == 5
+
+
+def test_latency_is_spread_over_the_items(app, stub):
+    app.config["AI_STUB_LATENCY"] = 0.2
+    stream = stub.stream_list("Dieren", "Nederlands", "Engels", "word", 4)
+    start = time.perf_counter()
+    next(stream)
+    first_item = time.perf_counter() - start
+    list(stream)
+    total = time.perf_counter() - start
+    assert first_item < 0.1
+    assert 0.18 < total < 0.5
+
+
+def test_malformed_answers_cover_the_parse_errors(app, stub):
+    app.config["AI_STUB_MALFORMED_RATE"] = 1.0
+    outcomes = {"array": 0, "items": 0, "partial": 0}
+    for i in range(40):
+        try:
+            items = generate(stub, f"Onderwerp {i}")
+        except ValueError as e:
+            outcomes["array" if "JSON array" in str(e) else "items"] += 1
+        else:
+            assert 0 < len(items) < 10
+            outcomes["partial"] += 1
+    assert all(outcomes.values()), outcomes
+
+
+@pytest.mark.slow
+def test_benchmark_generate_preview_save_pipeline(app, client, stub):
+    """Lists per second through /ai/generate, the preview and /ai/save."""
+    nl = Language(name="Nederlands", code="nl")
+    en = Language(name="Engels", code="en")
+    db.session.add_all([nl, en])
+    db.session.commit()
+    get_ai_job_runner().max_workers = 0
+
+    lists = 50
+    start = time.perf_counter()
+    for i in range(lists):
+        response = client.post(
+            "/ai/generate",
+            data={
+                "provider": "stub",
+                "topic": f"Onderwerp {i}",
+                "entry_type": "word",
+                "source_language_id": nl.id,
+                "target_language_id": en.id,
+                "count": "20",
+            },
+            follow_redirects=True,
+        )
+        assert b"20 items gegenereerd!" in response.data
+        response = client.post("/ai/save", data={"list_name": f"Lijst {i}"})
+        assert response.status_code == 302
+    elapsed = time.perf_counter() - start
+
+    assert List.query.count() == lists
+    assert Entry.query.count() == lists * 20
+    print(f"\n{lists} lists: {elapsed / lists * 1000:.1f} ms per list")
@@ -0,0 +1,160 @@
+"""
+Tolerant answer matching.
+Benchmark: pytest -m slow -s tests/test_answer_matching.py
+"""
+
+import random
+import string
+import time
+
+import pytest
+
+from app.answer_matching import AnswerMatcher, normalize_answer
+from app.services import QuizService
+
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize_answer("  Crème-Brûlée! ") == "creme brulee"
+    assert normalize_answer("l'été") == "l ete"
+    assert normalize_answer("Straße") == "strasse"
+    assert normalize_answer("ἄνθρωπος") == normalize_answer("ανθρωπος")
+
+
+def test_exact_mode_keeps_strict_checking():
+    matcher = AnswerMatcher()
+    assert matcher.is_match(" House ", "house")
+    assert not matcher.is_match("hause", "house")
+    assert not matcher.is_match("cafe", "café")
+
+
+def test_tolerant_mode_scales_typos_with_length():
+    matcher = AnswerMatcher(mode="tolerant")
+    # Short answers must be exact after folding
+    assert matcher.is_match("CAFE", "café")
+    assert not matcher.is_match("cat", "car")
+    # One typo per five characters
+    assert matcher.is_match("hause", "house")
+    assert not matcher.is_match("hayse", "house")
+    assert matcher.is_match("ambulre", "ambulare")
+    assert matcher.is_match("onafhankelyk", "onafhankelijk")
+    assert not matcher.is_match("onafhnkelyk", "onafhankelijk")
+
+
+def test_match_many():
+    matcher = AnswerMatcher(mode="tolerant")
+    assert matcher.match_many(["hause", "fout", "Été"], ["house", "goed", "ete"]) == [
+        True,
+        False,
+        True,
+    ]
+    with pytest.raises(ValueError):
+        matcher.match_many(["a"], [])
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        AnswerMatcher(mode="soundex")
+
+
+def test_quiz_uses_configured_matcher(app, seed_lists):
+    seed_lists(1, entries_per_list=1)
+    app.extensions["answer_matcher"] = AnswerMatcher(mode="tolerant")
+    is_correct, correct_answer = QuizService().check_answer(1, " T0! ", "forward")
+    assert is_correct
+    assert correct_answer == "t0"
+
+
+def test_slash_and_semicolon_variants():
+    """Each alternative is accepted on its own, parentheticals are optional."""
+    matcher = AnswerMatcher()
+    expected = "you (plural) had / were having"
+    assert matcher.is_match("you had", expected)
+    assert matcher.is_match("You (plural) had", expected)
+    assert matcher.is_match("were having", expected)
+    assert matcher.is_match("you (plural) had / were having", expected)
+    assert not matcher.is_match("you", expected)
+
+    assert matcher.is_match("woning", "huis; woning")
+    # A tight slash is part of the answer, not a separator
+    assert not matcher.is_match("she", "he/she/it had")
+    assert matcher.is_match("he/she/it had", "he/she/it had")
+
+    tolerant = AnswerMatcher(mode="tolerant")
+    assert tolerant.is_match("were havng", expected)
+    assert tolerant.is_match("he she it had", "he/she/it had")
+
+
+def test_variants_are_cached_until_invalidated():
+    matcher = AnswerMatcher()
+    first = matcher.variants("I have had / I had", key=(1, "forward"))
+    assert first == {"i have had / i had", "i have had", "i had"}
+    assert matcher.variants("I have had / I had", key=(1, "forward")) is first
+
+    matcher.invalidate(1)
+    assert matcher.variants("I have had / I had", key=(1, "forward")) is not first
+
+    # Changed text is reparsed even without an invalidation
+    assert matcher.variants("I had", key=(1, "forward")) == {"i had"}
+
+
+def test_update_entry_invalidates_variants(app, seed_lists):
+    from app.services import ListService
+
+    seed_lists(1, entries_per_list=1)
+    matcher = app.extensions["answer_matcher"]
+    assert QuizService().check_answer(1, "t0", "forward")[0]
+    assert (1, "forward") in matcher._variants
+
+    ListService().update_entry(1, "w0", "huis / woning", "word")
+    assert (1, "forward") not in matcher._variants
+    assert QuizService().check_answer(1, "woning", "forward")[0]
+
+
+def naive_levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.slow
+def test_benchmark_against_naive_levenshtein():
+    """Per-answer latency of the matcher vs a pure Python edit distance."""
+    rng = random.Random(42)
+    expected = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 20)))
+        for _ in range(20_000)
+    ]
+    answers = [
+        word[:-1] + rng.choice(string.ascii_lowercase) if i % 2 else word
+        for i, word in enumerate(expected)
+    ]
+    matcher = AnswerMatcher(mode="tolerant", max_cached_variants=len(expected))
+    keys = [(i, "forward") for i in range(len(expected))]
+    # Parse the variants once, as repeated quizzes on the same entries would
+    matcher.match_many(expected, expected, keys)
+
+    start = time.perf_counter()
+    fast = matcher.match_many(answers, expected, keys)
+    fast_us = (time.perf_counter() - start) / len(answers) * 1e6
+
+    start = time.perf_counter()
+    slow = [
+        naive_levenshtein(normalize_answer(a), normalize_answer(e))
+        <= matcher.allowed_edits(normalize_answer(e))
+        for a, e in zip(answers, expected)
+    ]
+    naive_us = (time.perf_counter() - start) / len(answers) * 1e6
+
+    print(f"\nAnswerMatcher: {fast_us:.2f} µs/answer, naive: {naive_us:.2f} µs/answer")
+    assert fast == slow
+    assert fast_us < 50
@@ -0,0 +1,182 @@
+"""
+JSON API for batch answer submission.
+"""
+
+from sqlalchemy import event
+
+from app.models import Entry, QuizAnswer, QuizSession, ReviewSchedule, db
+from app.question_queue import QuestionQueue
+
+
+def start_quiz(client, seed_lists, entries_per_list=4):
+    """Start a forward quiz on a new list, returns (session id, questions)"""
+    seed_lists(1, entries_per_list=entries_per_list)
+    client.post("/list/1/quiz/start", data={"direction": "forward"})
+    with client.session_transaction() as cookie:
+        quiz_session_id = cookie["quiz_session_id"]
+    quiz_data = client.application.extensions["quiz_state"].get(quiz_session_id)
+    return quiz_session_id, list(QuestionQueue.load(quiz_data["quiz_questions"]))
+
+
+def answer_for(entry_id, correct=True):
+    entry = db.session.get(Entry, entry_id)
+    return entry.target_word if correct else "fout"
+
+
+def test_batch_answers_in_one_transaction(client, count_queries, seed_lists):
+    """A batch is checked with one entry fetch, one UPDATE of scores and one commit."""
+    quiz_session_id, questions = start_quiz(client, seed_lists)
+    (first, _), (second, _), (third, _) = questions[:3]
+    answers = [
+        {"entry_id": first, "direction": "forward", "answer": answer_for(first)},
+        {
+            "entry_id": second,
+            "direction": "forward",
+            "answer": answer_for(second, correct=False),
+            "answered_at": "2026-01-01T10:00:00+02:00",
+        },
+        # Out of order: the queue is at `third` now
+        {"entry_id": first, "direction": "forward", "answer": answer_for(first)},
+        {"entry_id": third, "direction": "forward", "answer": answer_for(third)},
+    ]
+    db.session.expire_all()
+
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(db.engine, "commit", on_commit)
+    try:
+        with count_queries() as statements:
+            response = client.post(
+                f"/api/quiz/{quiz_session_id}/answers", json={"answers": answers}
+            )
+    finally:
+        event.remove(db.engine, "commit", on_commit)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [r["accepted"] for r in data["results"]] == [True, True, False, True]
+    assert [r.get("is_correct") for r in data["results"]] == [True, False, None, True]
+    assert data["results"][2]["error"] == "Niet de huidige vraag"
+    assert data["score"] == 2
+    assert data["index"] == 3
+    assert data["complete"] is False
+
+    assert len(commits) == 1
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+    assert len([s for s in statements if s.startswith("UPDATE entries")]) == 1
+
+    db.session.expire_all()
+    assert db.session.get(Entry, second).incorrect_count == 1
+    assert db.session.get(QuizSession, quiz_session_id).correct_answers == 2
+    assert QuizAnswer.query.count() == 3
+    assert ReviewSchedule.query.count() == 3
+    late = QuizAnswer.query.filter_by(entry_id=second).one()
+    assert late.answered_at.isoformat() == "2026-01-01T08:00:00"
+
+
+def test_batch_completes_the_quiz(client, seed_lists):
+    quiz_session_id, questions = start_quiz(client, seed_lists, entries_per_list=2)
+    answers = [
+        {"entry_id": entry_id, "direction": direction, "answer": answer_for(entry_id)}
+        for entry_id, direction in questions
+    ]
+    response = client.post(f"/api/quiz/{quiz_session_id}/answers", json=answers)
+
+    data = response.get_json()
+    assert data["complete"] is True
+    assert (data["score"], data["total"]) == (2, 2)
+    assert db.session.get(QuizSession, quiz_session_id).status == "completed"
+    assert client.application.extensions["quiz_state"].get(quiz_session_id) is None
+
+
+def test_batch_validation(client, seed_lists):
+    quiz_session_id, _ = start_quiz(client, seed_lists, entries_per_list=1)
+    url = f"/api/quiz/{quiz_session_id}/answers"
+
+    assert client.post(url, json={"answers": []}).status_code == 400
+    assert client.post(url, data="geen json").status_code == 400
+    response = client.post(url, json=[{"entry_id": "1", "answer": "t0"}])
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "entry_id moet een getal zijn"
+    response = client.post(
+        url, json=[{"entry_id": 1, "answer": "t0", "answered_at": "gisteren"}]
+    )
+    assert response.status_code == 400
+
+    client.application.config["QUIZ_MAX_BATCH_ANSWERS"] = 2
+    response = client.post(url, json=[{"entry_id": 1, "answer": "t0"}] * 3)
+    assert response.status_code == 400
+
+    assert client.post("/api/quiz/999/answers", json=[{}]).status_code == 404
+
+
+def test_batch_only_for_the_quiz_of_this_browser(client, app, seed_lists):
+    """Another client cannot answer or complete a quiz by guessing its id."""
+    quiz_session_id, questions = start_quiz(client, seed_lists, entries_per_list=1)
+    entry_id, direction = questions[0]
+    answers = [
+        {"entry_id": entry_id, "direction": direction, "answer": answer_for(entry_id)}
+    ]
+
+    other = app.test_client()
+    response = other.post(f"/api/quiz/{quiz_session_id}/answers", json=answers)
+    assert response.status_code == 404
+
+    db.session.expire_all()
+    assert db.session.get(QuizSession, quiz_session_id).status != "completed"
+    assert QuizAnswer.query.count() == 0
+    assert client.application.extensions["quiz_state"].get(quiz_session_id)
+
+
+def test_batch_skips_deleted_entries(client, seed_lists):
+    """A current question whose entry was deleted does not block the quiz."""
+    quiz_session_id, questions = start_quiz(client, seed_lists, entries_per_list=2)
+    (deleted, direction), (kept, _) = questions
+    db.session.delete(db.session.get(Entry, deleted))
+    db.session.commit()
+
+    response = client.post(
+        f"/api/quiz/{quiz_session_id}/answers",
+        json=[
+            {"entry_id": deleted, "direction": direction, "answer": "weg"},
+            {"entry_id": kept, "direction": "forward", "answer": answer_for(kept)},
+        ],
+    )
+
+    data = response.get_json()
+    assert data["results"][0] == {
+        "entry_id": deleted,
+        "direction": direction,
+        "accepted": False,
+        "error": "Item niet gevonden",
+    }
+    assert data["results"][1]["accepted"] is True
+    assert data["complete"] is True
+
+
+def test_batch_decodes_the_queue_once(client, monkeypatch, seed_lists):
+    """The number of queue decodes does not grow with the batch size."""
+    quiz_session_id, questions = start_quiz(client, seed_lists, entries_per_list=8)
+    loads = []
+    original = QuestionQueue.load.__func__
+
+    def counting_load(cls, value):
+        loads.append(1)
+        return original(cls, value)
+
+    monkeypatch.setattr(QuestionQueue, "load", classmethod(counting_load))
+
+    def post(batch):
+        loads.clear()
+        answers = [
+            {"entry_id": entry_id, "direction": direction, "answer": "fout"}
+            for entry_id, direction in batch
+        ]
+        response = client.post(f"/api/quiz/{quiz_session_id}/answers", json=answers)
+        assert all(r["accepted"] for r in response.get_json()["results"])
+        return len(loads)
+
+    assert post(questions[:1]) == post(questions[1:7])
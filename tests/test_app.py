@@ -12,3 +12,30 @@ def test_home_page(client):
     """Test that the home page loads."""
     response = client.get("/")
     assert response.status_code == 200
+
+
+def test_vite_manifest_is_cached(tmp_path):
+    """Test that the Vite manifest is parsed once and reloaded on change."""
+    import json
+    import os
+
+    from app.vite import ViteManifest
+
+    path = tmp_path / "manifest.json"
+    path.write_text(
+        json.dumps({"main.js": {"file": "assets/main-1.js", "css": ["a.css"]}})
+    )
+    manifest = ViteManifest(str(path), auto_reload=True)
+
+    assert manifest.asset("main.js") == "/static/dist/assets/main-1.js"
+    assert manifest.css("main.js") == ["/static/dist/a.css"]
+    assert manifest.asset("other.js") == "/static/dist/assets/other.js"
+
+    path.write_text(json.dumps({"main.js": {"file": "assets/main-2.js"}}))
+    os.utime(path, (0, os.stat(path).st_mtime + 10))
+    assert manifest.asset("main.js") == "/static/dist/assets/main-2.js"
+
+    frozen = ViteManifest(str(path), auto_reload=False)
+    assert frozen.asset("main.js") == "/static/dist/assets/main-2.js"
+    path.unlink()
+    assert frozen.asset("main.js") == "/static/dist/assets/main-2.js"
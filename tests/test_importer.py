@@ -0,0 +1,290 @@
+"""
+Tests for the CSV/TSV/Anki importer, its CLI command and upload endpoint.
+"""
+
+import io
+import os
+import sqlite3
+import tempfile
+import zipfile
+
+import pytest
+
+from app.importer import detect_format, read_rows
+from app.models import Entry, Language, List, db
+from app.services import ListService
+
+
+@pytest.fixture
+def vocab_list(app):
+    source = Language(name="Nederlands", code="nl")
+    target = Language(name="Engels", code="en")
+    db.session.add_all([source, target])
+    db.session.flush()
+    vocab_list = List(
+        name="Import", source_language_id=source.id, target_language_id=target.id
+    )
+    db.session.add(vocab_list)
+    db.session.commit()
+    return vocab_list
+
+
+def make_apkg(notes, member="collection.anki2"):
+    """Build an Anki package with a notes table holding these field lists"""
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, flds TEXT)")
+        connection.executemany(
+            "INSERT INTO notes (flds) VALUES (?)",
+            [("\x1f".join(fields),) for fields in notes],
+        )
+        connection.commit()
+        connection.close()
+
+        package = io.BytesIO()
+        with zipfile.ZipFile(package, "w") as archive:
+            archive.write(path, member)
+            archive.writestr("media", "{}")
+        package.seek(0)
+        return package
+    finally:
+        os.remove(path)
+
+
+def test_detect_format():
+    assert detect_format("woorden.CSV") == "csv"
+    assert detect_format("export.txt") == "tsv"
+    assert detect_format("deck.apkg") == "apkg"
+    with pytest.raises(ValueError):
+        detect_format("woorden.xlsx")
+
+
+def test_read_csv_with_quotes_and_header():
+    data = 'bron,doel\n"huis, groot",big house\nboom,tree,extra\n\nkat\n'
+    rows = list(read_rows(io.BytesIO(data.encode()), "csv", skip_header=True))
+    assert rows == [("huis, groot", "big house"), ("boom", "tree"), ("kat", "")]
+
+
+def test_read_tsv_skips_anki_settings_and_bom():
+    data = "\ufeff#separator:tab\n#html:false\nhuis\thouse\n#hashtag\tpound\n"
+    rows = list(read_rows(io.BytesIO(data.encode()), "tsv"))
+    assert rows == [("huis", "house"), ("#hashtag", "pound")]
+
+
+def test_read_invalid_encoding_raises_value_error():
+    with pytest.raises(ValueError):
+        list(read_rows(io.BytesIO(b"huis,\xff\xfe\n"), "csv"))
+
+
+def test_read_apkg_strips_html():
+    package = make_apkg(
+        [
+            ["<b>huis</b>", "house&nbsp;<br>home", "extra"],
+            ["<div>boom</div>", "tree"],
+        ]
+    )
+    rows = list(read_rows(package, "apkg"))
+    assert rows == [("huis", "house home"), ("boom", "tree")]
+
+
+def test_read_apkg_prefers_newest_collection():
+    package = io.BytesIO()
+    with zipfile.ZipFile(package, "w") as archive:
+        archive.writestr("collection.anki2", b"upgrade Anki")
+        old = make_apkg([["huis", "house"]])
+        archive.writestr(
+            "collection.anki21", zipfile.ZipFile(old).read("collection.anki2")
+        )
+    package.seek(0)
+    assert list(read_rows(package, "apkg")) == [("huis", "house")]
+
+
+def test_read_apkg_rejects_other_files():
+    with pytest.raises(ValueError):
+        list(read_rows(io.BytesIO(b"not a zip"), "apkg"))
+    with pytest.raises(ValueError):
+        list(read_rows(make_apkg([], member="media.json"), "apkg"))
+
+
+def test_read_apkg_rejects_compressed_collection():
+    """Modern exports hold collection.anki21b next to a dummy collection.anki2"""
+    package = io.BytesIO()
+    with zipfile.ZipFile(package, "w") as archive:
+        dummy = make_apkg([["Please update to the latest Anki version", ""]])
+        archive.writestr(
+            "collection.anki2", zipfile.ZipFile(dummy).read("collection.anki2")
+        )
+        archive.writestr("collection.anki21b", b"\x28\xb5\x2f\xfd zstd data")
+    package.seek(0)
+
+    with pytest.raises(ValueError, match="Compressed Anki packages"):
+        list(read_rows(package, "apkg"))
+
+
+def test_import_entries_validates_and_deduplicates(vocab_list):
+    db.session.add(
+        Entry(list_id=vocab_list.id, source_word="huis", target_word="house")
+    )
+    db.session.commit()
+
+    rows = [
+        ("huis", "house"),
+        (" boom ", "tree"),
+        ("boom", "tree"),
+        ("boom", "beam"),
+        ("", "leeg"),
+        ("x" * 201, "lang"),
+        ("kat", "cat"),
+    ]
+    progress = []
+    result = ListService().import_entries(
+        vocab_list.id,
+        iter(rows),
+        entry_type="sentence",
+        chunk_size=2,
+        progress=lambda result: progress.append(result.read),
+    )
+
+    assert result.read == 7
+    assert result.imported == 3
+    assert result.duplicates == 2
+    assert result.invalid == 2
+    assert progress == [2, 4, 6, 7]
+    pairs = {
+        (entry.source_word, entry.target_word, entry.entry_type)
+        for entry in Entry.query.filter_by(list_id=vocab_list.id)
+    }
+    assert pairs == {
+        ("huis", "house", "word"),
+        ("boom", "tree", "sentence"),
+        ("boom", "beam", "sentence"),
+        ("kat", "cat", "sentence"),
+    }
+
+
+def test_import_entries_can_be_run_again(vocab_list):
+    rows = [("huis", "house"), ("boom", "tree")]
+    service = ListService()
+    service.import_entries(vocab_list.id, rows)
+    result = service.import_entries(vocab_list.id, rows)
+    assert result.imported == 0
+    assert result.duplicates == 2
+    assert Entry.query.count() == 2
+
+
+def test_import_entries_one_insert_per_chunk(vocab_list, count_queries):
+    rows = [(f"w{i}", f"t{i}") for i in range(25)]
+    with count_queries() as statements:
+        ListService().import_entries(vocab_list.id, rows, chunk_size=10)
+    inserts = [s for s in statements if s.startswith("INSERT INTO entries")]
+    assert len(inserts) == 3
+
+
+def test_import_entries_unknown_list(app):
+    with pytest.raises(ValueError):
+        ListService().import_entries(999, [("huis", "house")])
+
+
+def test_import_list_command(vocab_list, runner, tmp_path):
+    path = tmp_path / "woorden.csv"
+    path.write_text("huis,house\nboom,tree\nboom,tree\n", encoding="utf-8")
+
+    result = runner.invoke(args=["import-list", str(path), "--list-id", "1"])
+
+    assert result.exit_code == 0, result.output
+    assert "3 rows read, 2 imported, 1 duplicates, 0 invalid" in result.output
+    assert Entry.query.filter_by(list_id=vocab_list.id).count() == 2
+
+
+def test_import_list_command_creates_list(vocab_list, runner, tmp_path):
+    path = tmp_path / "deck.apkg"
+    path.write_bytes(make_apkg([["huis", "house"]]).getvalue())
+
+    result = runner.invoke(
+        args=[
+            "import-list",
+            str(path),
+            "--name",
+            "Anki",
+            "--source",
+            "nl",
+            "--target",
+            "en",
+        ]
+    )
+
+    assert result.exit_code == 0, result.output
+    imported = List.query.filter_by(name="Anki").one()
+    assert [entry.source_word for entry in imported.entries] == ["huis"]
+
+
+def test_import_list_command_errors(vocab_list, runner, tmp_path):
+    path = tmp_path / "woorden.xlsx"
+    path.write_bytes(b"")
+    assert runner.invoke(args=["import-list", str(path)]).exit_code != 0
+
+    result = runner.invoke(args=["import-list", str(path), "--list-id", "1"])
+    assert result.exit_code == 1
+    assert "Unsupported file type" in result.output
+
+    result = runner.invoke(
+        args=["import-list", str(path), "--list-id", "1", "--chunk-size", "0"]
+    )
+    assert result.exit_code == 2
+    assert "--chunk-size" in result.output
+
+
+def test_upload_endpoint(vocab_list, client):
+    response = client.post(
+        f"/list/{vocab_list.id}/import",
+        data={
+            "file": (io.BytesIO(b"bron\tdoel\nhuis\thouse\n\tleeg\n"), "lijst.tsv"),
+            "entry_type": "word",
+            "header": "y",
+        },
+        content_type="multipart/form-data",
+        follow_redirects=True,
+    )
+
+    assert response.status_code == 200
+    assert "1 items geïmporteerd" in response.get_data(as_text=True)
+    assert Entry.query.filter_by(list_id=vocab_list.id).count() == 1
+
+
+def test_upload_endpoint_rejects_other_files(vocab_list, client):
+    response = client.post(
+        f"/list/{vocab_list.id}/import",
+        data={"file": (io.BytesIO(b"x"), "lijst.xlsx"), "entry_type": "word"},
+        content_type="multipart/form-data",
+        follow_redirects=True,
+    )
+
+    assert response.status_code == 200
+    assert "Alleen CSV, TSV of Anki" in response.get_data(as_text=True)
+    assert Entry.query.count() == 0
+
+
+@pytest.mark.slow
+def test_import_million_rows_in_constant_memory(vocab_list, tmp_path):
+    """A 1M row file is imported without holding the file or its rows"""
+    import time
+    import tracemalloc
+
+    path = tmp_path / "groot.csv"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(1_000_000):
+            f.write(f"woord {i},word {i}\n")
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    with open(path, "rb") as stream:
+        result = ListService().import_entries(vocab_list.id, read_rows(stream, "csv"))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\n1M rows in {elapsed:.1f}s, peak {peak / 1024 / 1024:.1f} MB")
+    assert result.imported == 1_000_000
+    assert peak < 50 * 1024 * 1024
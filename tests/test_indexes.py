@@ -0,0 +1,228 @@
+"""
+Check that the hot list, quiz and history queries are index-driven.
+Seeds a large database, so it is marked slow: pytest -m slow tests/test_indexes.py
+SQLite only; on other databases (the PostgreSQL CI) the tests are skipped.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.models import Entry, QuizAnswer, QuizSessionList, db
+from app.repositories import ListRepository
+from app.services import QuizService
+
+ENTRY_COUNT = 1_000_000
+LIST_COUNT = 1_000
+SESSION_COUNT = 10_000
+
+pytestmark = pytest.mark.slow
+
+
+@pytest.fixture(autouse=True)
+def sqlite_only(app):
+    """The seed SQL and EXPLAIN QUERY PLAN are SQLite's own"""
+    if db.engine.dialect.name != "sqlite":
+        pytest.skip("Query plan checks run on SQLite only")
+
+
+@pytest.fixture
+def seeded_db(app):
+    """Seed languages, lists, entries and quiz sessions with SQL-side generators."""
+    db.session.execute(
+        text(
+            "INSERT INTO languages (id, name, code) VALUES "
+            "(1, 'Nederlands', 'nl'), (2, 'Engels', 'en')"
+        )
+    )
+    db.session.execute(text("INSERT INTO categories (id, name) VALUES (1, 'Basis')"))
+    db.session.execute(
+        text(
+            "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq "
+            "WHERE n < :count) "
+            "INSERT INTO lists (id, name, source_language_id, target_language_id, "
+            "category_id, created_at) "
+            "SELECT n, 'Lijst ' || n, 1, 2, CASE WHEN n % 2 THEN 1 END, "
+            "datetime('2025-01-01', '+' || n || ' minutes') FROM seq"
+        ),
+        {"count": LIST_COUNT},
+    )
+    db.session.execute(
+        text(
+            "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq "
+            "WHERE n < :count) "
+            "INSERT INTO entries (list_id, source_word, target_word, entry_type, "
+            "created_at, correct_count, incorrect_count) "
+            "SELECT n % :lists + 1, 'woord ' || n, 'word ' || n, 'word', "
+            "datetime('2025-01-01', '+' || n || ' seconds'), n % 7, n % 5 FROM seq"
+        ),
+        {"count": ENTRY_COUNT, "lists": LIST_COUNT},
+    )
+    db.session.execute(
+        text(
+            "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq "
+            "WHERE n < :count) "
+            "INSERT INTO quiz_sessions (id, quiz_type, direction, total_questions, "
+            "correct_answers, current_index, status, started_at, completed_at) "
+            "SELECT n, 'single', 'random', 10, n % 10, 10, "
+            "CASE WHEN n % 10 THEN 'completed' ELSE 'in_progress' END, "
+            "datetime('2025-01-01', '+' || n || ' minutes'), "
+            "CASE WHEN n % 10 THEN datetime('2025-01-01', '+' || (n + 5) || ' minutes') "
+            "END FROM seq"
+        ),
+        {"count": SESSION_COUNT},
+    )
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+    return db
+
+
+def query_plan(query) -> str:
+    """Return SQLite's EXPLAIN QUERY PLAN output for an ORM query"""
+    sql = str(
+        query.statement.compile(
+            dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_index_plan(plan: str, index_name: str, sorted_by_index: bool = True):
+    assert index_name in plan, plan
+    if sorted_by_index:
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_entries_by_list_use_index(seeded_db):
+    """Entries of a list are found through the list_id index."""
+    plan = query_plan(Entry.query.filter_by(list_id=42))
+    assert_index_plan(plan, "ix_entries_list_id")
+
+
+def test_quiz_history_uses_index(seeded_db):
+    """Completed history and incomplete sessions are read in index order."""
+    service = QuizService()
+    history = service._history_query("completed")
+    assert_index_plan(query_plan(history), "ix_quiz_sessions_status_completed_at_id")
+
+    incomplete = service._history_query("in_progress")
+    assert_index_plan(query_plan(incomplete), "ix_quiz_sessions_status_started_at_id")
+
+
+def test_list_index_uses_index(seeded_db):
+    """Lists are ordered by creation date through an index, also per category."""
+    repo = ListRepository()
+    assert_index_plan(query_plan(repo._ordered_query()), "ix_lists_created_at_id")
+    assert_index_plan(
+        query_plan(repo._ordered_query(category_id=1)),
+        "ix_lists_category_id_created_at_id",
+    )
+
+
+def test_quiz_answer_lookups_use_index(seeded_db):
+    """Answers and session lists are looked up through their foreign key indexes."""
+    assert_index_plan(
+        query_plan(QuizAnswer.query.filter_by(session_id=1)),
+        "ix_quiz_answers_session_id",
+    )
+    assert_index_plan(
+        query_plan(QuizAnswer.query.filter_by(entry_id=1)), "ix_quiz_answers_entry_id"
+    )
+    assert_index_plan(
+        query_plan(QuizSessionList.query.filter_by(session_id=1)),
+        "ix_quiz_session_lists_session_id",
+    )
+
+
+def executed_plan(fn) -> str:
+    """Run `fn`, then EXPLAIN the first SELECT it executed with its parameters"""
+    from sqlalchemy import event
+
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        executed.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    statement, parameters = executed[0]
+    rows = db.session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_deep_keyset_pages_use_index(seeded_db):
+    """A page deep into the table is an index range scan, not a skip."""
+    from app.pagination import encode_cursor
+    from app.repositories import EntryRepository
+
+    middle = db.session.get(Entry, ENTRY_COUNT // 2)
+    deep_cursor = encode_cursor(middle.created_at, middle.id)
+    repo = EntryRepository()
+    plan = executed_plan(lambda: repo.get_page_with_list(after=deep_cursor, limit=50))
+    assert_index_plan(plan, "ix_entries_created_at_id")
+
+    service = QuizService()
+    first = service.get_quiz_history_page(limit=50)
+    plan = executed_plan(
+        lambda: service.get_quiz_history_page(after=first.next_cursor, limit=50)
+    )
+    assert_index_plan(plan, "ix_quiz_sessions_status_completed_at_id")
+
+
+def test_smart_practice_top_k_uses_index(seeded_db):
+    """The worst entries are read off the success ratio index, not sorted."""
+    import time
+
+    service = QuizService()
+    plan = executed_plan(lambda: service.get_difficult_entries(limit=15))
+    assert_index_plan(plan, "ix_entries_success_ratio_id")
+
+    start = time.perf_counter()
+    entries = service.get_difficult_entries(limit=15)
+    elapsed = time.perf_counter() - start
+    print(
+        f"\nget_difficult_entries over {ENTRY_COUNT:,} entries: {elapsed * 1000:.2f} ms"
+    )
+
+    rates = [entry.success_ratio for entry in entries]
+    assert len(entries) == 15
+    assert rates == sorted(rates)
+    assert all(entry.total_attempts >= 2 for entry in entries)
+
+
+def test_due_reviews_use_index(seeded_db):
+    """Picking due reviews is a range scan on due_at, cheap at any table size."""
+    import time
+    from datetime import datetime
+
+    from app.repositories import ReviewScheduleRepository
+
+    db.session.execute(
+        text(
+            "INSERT INTO review_schedules (entry_id, direction, ease, interval_days, "
+            "repetitions, lapses, due_at) "
+            "SELECT id, 'forward', 2.5, 1.0, 1, 0, "
+            "datetime('2026-01-01', '+' || (id % 100000) || ' minutes') FROM entries"
+        )
+    )
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+
+    now = datetime(2026, 1, 2)
+    repo = ReviewScheduleRepository()
+    plan = executed_plan(lambda: repo.get_due(now, limit=15))
+    assert_index_plan(plan, "ix_review_schedules_due_at_id")
+
+    start = time.perf_counter()
+    due = repo.get_due(now, limit=15)
+    elapsed = time.perf_counter() - start
+    print(f"\nget_due over {ENTRY_COUNT:,} schedules: {elapsed * 1000:.2f} ms")
+
+    assert len(due) == 15
+    assert all(schedule.due_at <= now for schedule in due)
@@ -0,0 +1,87 @@
+"""
+Keyset pagination for the list index, all-entries and quiz history pages.
+"""
+
+from app.pagination import decode_cursor, encode_cursor
+from app.repositories import EntryRepository, ListRepository
+from app.services import QuizService
+
+
+def walk_pages(fetch, limit):
+    """Follow next cursors until the last page and return all items"""
+    items, after = [], None
+    while True:
+        page = fetch(after=after, limit=limit)
+        assert len(page) <= limit
+        items.extend(page.items)
+        if not page.has_next:
+            return items
+        after = page.next_cursor
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque but decode to the encoded position."""
+    from datetime import datetime
+
+    position = (datetime(2025, 1, 2, 3, 4, 5, 678), 42)
+    cursor = encode_cursor(*position)
+    assert "|" not in cursor
+    assert decode_cursor(cursor) == position
+    assert decode_cursor("not-a-cursor") is None
+    assert decode_cursor(None) is None
+
+
+def test_list_pages_cover_all_lists_once(app, seed_lists):
+    """Walking the list pages yields every list once, newest first."""
+    seed_lists(23, entries_per_list=2)
+    lists = walk_pages(ListRepository().get_page, limit=5)
+
+    assert len(lists) == 23
+    assert len({vocab_list.id for vocab_list in lists}) == 23
+    keys = [(vocab_list.created_at, vocab_list.id) for vocab_list in lists]
+    assert keys == sorted(keys, reverse=True)
+    assert all(vocab_list.entry_count == 2 for vocab_list in lists)
+
+
+def test_entry_and_history_pages_cover_all_rows(app, seed_lists, seed_sessions):
+    """Entries and completed sessions are paginated without gaps or repeats."""
+    seed_lists(4, entries_per_list=5)
+    seed_sessions(12)
+    seed_sessions(3, status="in_progress")
+
+    entries = walk_pages(EntryRepository().get_page_with_list, limit=7)
+    assert len({entry.id for entry in entries}) == 20
+
+    sessions = walk_pages(QuizService().get_quiz_history_page, limit=5)
+    assert len({s.id for s in sessions}) == 12
+    assert all(s.status == "completed" for s in sessions)
+
+
+def test_rows_without_sort_value_are_left_out(app, seed_lists, seed_sessions):
+    """A NULL completed_at has no cursor position, so it is skipped."""
+    from app.models import QuizSession, db
+
+    seed_lists(1)
+    seed_sessions(4)
+    QuizSession.query.filter_by(id=2).update({"completed_at": None})
+    db.session.commit()
+
+    # PostgreSQL sorts NULLs first, where the row would end the first page
+    for limit in (1, 4):
+        sessions = walk_pages(QuizService().get_quiz_history_page, limit=limit)
+        assert [s.id for s in sessions] == [4, 3, 1]
+
+
+def test_pages_render_next_links(client, seed_lists):
+    """Pages link to the next page and cap the requested page size."""
+    seed_lists(3)
+    response = client.get("/?limit=2")
+    assert response.status_code == 200
+    assert b"Volgende pagina" in response.data
+
+    response = client.get("/entries?limit=100000")
+    assert response.status_code == 200
+    assert b"Volgende pagina" not in response.data
+
+    response = client.get("/quiz/history?after=garbage")
+    assert response.status_code == 200
@@ -0,0 +1,161 @@
+"""
+Query-count checks for pages that render many rows.
+"""
+
+import pytest
+
+from app.models import Entry, Language, List, db
+
+
+def test_index_page_query_count_is_constant(client, count_queries, seed_lists):
+    """The homepage runs the same number of queries for 2 or 50 lists."""
+    seed_lists(2)
+    with count_queries() as few:
+        response = client.get("/")
+    assert response.status_code == 200
+    assert b"3 items" in response.data
+
+    seed_lists(48)
+    with count_queries() as many:
+        response = client.get("/")
+    assert response.status_code == 200
+    assert response.data.count(b"3 items") == 50
+    assert len(many) == len(few)
+
+
+def test_quiz_history_query_count_is_constant(
+    client, count_queries, seed_lists, seed_sessions
+):
+    """The history page runs the same number of queries for 2 or 40 sessions."""
+    seed_lists(1)
+    seed_sessions(1)
+    seed_sessions(1, status="in_progress")
+    with count_queries() as few:
+        response = client.get("/quiz/history")
+    assert response.status_code == 200
+    assert b"Lijst 0" in response.data
+
+    seed_sessions(20)
+    seed_sessions(18, status="in_progress")
+    with count_queries() as many:
+        response = client.get("/quiz/history")
+    assert response.status_code == 200
+    assert len(many) == len(few)
+
+
+def test_answer_submission_is_one_transaction(client, count_queries, seed_lists):
+    """Answering a question fetches the entry once and commits once."""
+    from sqlalchemy import event
+
+    from app.question_queue import QuestionQueue
+
+    seed_lists(1, entries_per_list=2)
+    client.post("/list/1/quiz/start", data={"direction": "forward"})
+    with client.session_transaction() as cookie:
+        quiz_session_id = cookie["quiz_session_id"]
+    quiz_data = client.application.extensions["quiz_state"].get(quiz_session_id)
+    entry_id, _ = QuestionQueue.load(quiz_data["quiz_questions"])[0]
+    entry = db.session.get(Entry, entry_id)
+    target_word = entry.target_word
+    db.session.expire_all()
+
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(db.engine, "commit", on_commit)
+    try:
+        with count_queries() as statements:
+            response = client.post(
+                "/list/1/quiz/answer",
+                data={
+                    "entry_id": entry_id,
+                    "direction": "forward",
+                    "answer": target_word,
+                },
+            )
+    finally:
+        event.remove(db.engine, "commit", on_commit)
+
+    assert response.status_code == 302
+    assert len(commits) == 1
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+    db.session.expire_all()
+    assert db.session.get(Entry, entry_id).correct_count == 1
+
+
+def test_saving_generated_list_inserts_entries_at_once(
+    client, count_queries, seed_lists
+):
+    """Saving a generated list inserts all its entries with one statement."""
+    seed_lists(0)
+    source = Language.query.filter_by(code="nl").first()
+    target = Language.query.filter_by(code="en").first()
+    with client.session_transaction() as cookie:
+        cookie["ai_generated_items"] = [
+            {"source": f"w{i}", "target": f"t{i}"} for i in range(25)
+        ]
+        cookie["ai_generated_meta"] = {
+            "source_language_id": source.id,
+            "target_language_id": target.id,
+            "entry_type": "sentence",
+        }
+
+    with count_queries() as statements:
+        response = client.post("/ai/save", data={"list_name": "Gegenereerd"})
+
+    assert response.status_code == 302
+    inserts = [s for s in statements if s.startswith("INSERT INTO entries")]
+    assert len(inserts) == 1
+
+    db.session.expire_all()
+    vocab_list = List.query.filter_by(name="Gegenereerd").one()
+    assert len(vocab_list.entries) == 25
+    assert {entry.entry_type for entry in vocab_list.entries} == {"sentence"}
+
+
+def test_invalid_generated_item_saves_no_list(client, seed_lists):
+    """The list and its entries are committed together, or not at all."""
+    seed_lists(0)
+    source = Language.query.filter_by(code="nl").first()
+    target = Language.query.filter_by(code="en").first()
+    with client.session_transaction() as cookie:
+        cookie["ai_generated_items"] = [
+            {"source": "huis", "target": "house"},
+            {"source": "x" * 201, "target": "te lang"},
+        ]
+        cookie["ai_generated_meta"] = {
+            "source_language_id": source.id,
+            "target_language_id": target.id,
+            "entry_type": "word",
+        }
+
+    response = client.post("/ai/save", data={"list_name": "Gegenereerd"})
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/ai/generate")
+    db.session.expire_all()
+    assert List.query.count() == 0
+    assert Entry.query.count() == 0
+
+
+def test_bulk_add_entries_validates_before_inserting(app, seed_lists):
+    """One invalid item rejects the whole batch."""
+    from app.services import ListService
+
+    seed_lists(1, entries_per_list=0)
+    service = ListService()
+    items = [{"source": "huis", "target": "house"}, {"source": "boom", "target": ""}]
+
+    with pytest.raises(ValueError):
+        service.bulk_add_entries(1, items)
+    with pytest.raises(ValueError):
+        service.bulk_add_entries(1, [{"source": "x" * 201, "target": "y"}])
+    with pytest.raises(ValueError):
+        service.bulk_add_entries(999, items[:1])
+
+    assert Entry.query.count() == 0
+    assert service.bulk_add_entries(1, items[:1]) == 1
+    assert Entry.query.filter_by(list_id=1).count() == 1
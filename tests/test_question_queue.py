@@ -0,0 +1,92 @@
+"""
+Compact question queue encoding.
+Benchmarks print their timings: python -m pytest tests/test_question_queue.py -m slow -s
+"""
+
+import json
+import random
+import timeit
+
+import pytest
+
+from app.question_queue import QuestionQueue
+
+
+def make_questions(count, max_id=1_000_000):
+    rng = random.Random(count)
+    return [
+        (rng.randrange(1, max_id), rng.choice(["forward", "reverse"]))
+        for _ in range(count)
+    ]
+
+
+def make_list_questions(count, first_id=750_000):
+    """Shuffled questions for a list whose entries were added together"""
+    rng = random.Random(count)
+    questions = [
+        (first_id + i, rng.choice(["forward", "reverse"])) for i in range(count)
+    ]
+    rng.shuffle(questions)
+    return questions
+
+
+def test_round_trip():
+    """Encoding and decoding keeps ids, directions and order."""
+    questions = make_questions(37) + [(0, "reverse"), (2**32 - 1, "forward")]
+    queue = QuestionQueue(questions)
+    decoded = QuestionQueue.decode(queue.encode())
+
+    assert list(decoded) == questions
+    assert decoded[-1] == (2**32 - 1, "forward")
+    assert list(QuestionQueue.decode(QuestionQueue().encode())) == []
+
+
+def test_append_after_decode():
+    """Questions can be re-queued on a decoded queue across byte boundaries."""
+    queue = QuestionQueue.decode(QuestionQueue(make_questions(8)).encode())
+    queue.append(*queue[0])
+    queue.append(5, "reverse")
+
+    decoded = QuestionQueue.decode(queue.encode())
+    assert len(decoded) == 10
+    assert decoded[8] == queue[0]
+    assert decoded[9] == (5, "reverse")
+
+
+def test_load_legacy_format():
+    """Quiz data persisted as a list of dicts still loads."""
+    legacy = [
+        {"entry_id": 3, "direction": "forward"},
+        {"entry_id": 9, "direction": "reverse"},
+    ]
+    assert list(QuestionQueue.load(legacy)) == [(3, "forward"), (9, "reverse")]
+    assert len(QuestionQueue.load(None)) == 0
+
+
+@pytest.mark.slow
+def test_benchmark_encoding_2000_questions():
+    """A 2,000-question queue encodes to a few KB, far below the JSON dicts."""
+    questions = make_list_questions(2000)
+    legacy = [{"entry_id": e, "direction": d} for e, d in questions]
+    queue = QuestionQueue(questions)
+    encoded = queue.encode()
+
+    json_size = len(json.dumps(legacy))
+    encoded_size = len(json.dumps(encoded))
+    encode_time = min(timeit.repeat(queue.encode, number=100, repeat=5)) / 100
+    decode_time = (
+        min(timeit.repeat(lambda: QuestionQueue.decode(encoded), number=100, repeat=5))
+        / 100
+    )
+    json_time = (
+        min(timeit.repeat(lambda: json.loads(json.dumps(legacy)), number=100, repeat=5))
+        / 100
+    )
+
+    print(f"\nJSON dicts: {json_size} bytes, round trip {json_time * 1e6:.0f} us")
+    print(
+        f"Encoded:    {encoded_size} bytes, encode {encode_time * 1e6:.0f} us, "
+        f"decode {decode_time * 1e6:.0f} us"
+    )
+    assert encoded_size < 6 * 1024
+    assert encoded_size * 15 < json_size
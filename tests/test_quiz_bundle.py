@@ -0,0 +1,78 @@
+"""
+Preloaded question bundles: serving questions without entry queries.
+"""
+
+from app.models import Entry, QuizSession, db
+from app.question_queue import QuestionQueue
+from app.services import ListService
+
+
+def start_quiz(client, seed_lists, entries_per_list=3):
+    seed_lists(1, entries_per_list=entries_per_list)
+    client.post("/list/1/quiz/start", data={"direction": "forward"})
+    with client.session_transaction() as cookie:
+        return cookie["quiz_session_id"]
+
+
+def test_questions_are_served_from_the_bundle(client, count_queries, seed_lists):
+    """Showing a question does not query the entries table."""
+    quiz_session_id = start_quiz(client, seed_lists)
+    quiz_data = client.application.extensions["quiz_state"].get(quiz_session_id)
+    assert set(quiz_data["quiz_bundle"]) == {"1", "2", "3"}
+    assert quiz_data["quiz_bundle"]["1"] == ["w0", "t0", "Nederlands"]
+
+    with count_queries() as statements:
+        response = client.get("/list/1/quiz")
+    assert response.status_code == 200
+    assert not [s for s in statements if "FROM entries" in s]
+
+
+def test_bundle_is_not_persisted(client, seed_lists):
+    quiz_session_id = start_quiz(client, seed_lists)
+    quiz_session = db.session.get(QuizSession, quiz_session_id)
+    assert "quiz_bundle" not in quiz_session.quiz_data
+    assert "quiz_questions" in quiz_session.quiz_data
+
+
+def test_resume_rebuilds_bundle_without_deleted_entries(
+    client, count_queries, seed_lists
+):
+    """A resumed quiz rebuilds its bundle in one query and skips deleted entries."""
+    quiz_session_id = start_quiz(client, seed_lists)
+    store = client.application.extensions["quiz_state"]
+    first_id, _ = QuestionQueue.load(store.get(quiz_session_id)["quiz_questions"])[0]
+
+    store.delete(quiz_session_id)
+    ListService().delete_entry(first_id)
+
+    with count_queries() as statements:
+        response = client.get("/list/1/quiz")
+    assert response.status_code == 200
+    assert b"2/3" in response.data
+    assert len([s for s in statements if "FROM entries" in s]) == 1
+    assert str(first_id) not in store.get(quiz_session_id)["quiz_bundle"]
+
+
+def test_entry_deleted_during_quiz_is_skipped(client, seed_lists):
+    quiz_session_id = start_quiz(client, seed_lists, entries_per_list=2)
+    store = client.application.extensions["quiz_state"]
+    first_id, _ = QuestionQueue.load(store.get(quiz_session_id)["quiz_questions"])[0]
+    db.session.delete(db.session.get(Entry, first_id))
+    db.session.commit()
+
+    response = client.post(
+        "/list/1/quiz/answer",
+        data={"entry_id": first_id, "direction": "forward", "answer": "x"},
+    )
+    assert response.status_code == 302
+    response = client.get("/list/1/quiz")
+    assert b"2/2" in response.data
+
+
+def test_mixed_quiz_question_shows_source_language(client, seed_lists):
+    seed_lists(2, entries_per_list=1)
+    client.post(
+        "/quiz/mixed/start", data={"list_ids": ["1", "2"], "direction": "reverse"}
+    )
+    response = client.get("/quiz/mixed/question")
+    assert b"Wat is het Nederlands woord voor" in response.data
@@ -0,0 +1,161 @@
+"""
+Server-side quiz state: store backends and the quiz flow on top of them.
+"""
+
+import re
+import sqlite3
+
+from app.models import Entry, QuizSession, db
+from app.quiz_state import (
+    MemoryQuizStateStore,
+    RedisQuizStateStore,
+    SQLiteQuizStateStore,
+)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client API used by the store"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+        self.expiry[key] = ex
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def check_store(store):
+    state = {"quiz_questions": [{"entry_id": 1, "direction": "forward"}]}
+    assert store.get(1) is None
+    store.set(1, state)
+    assert store.get(1) == state
+    store.set(1, {"quiz_index": 1})
+    assert store.get(1) == {"quiz_index": 1}
+    store.delete(1)
+    assert store.get(1) is None
+
+
+def test_memory_store_evicts_least_recently_used():
+    """The in-process store keeps at most max_entries states."""
+    store = MemoryQuizStateStore(max_entries=2)
+    check_store(store)
+
+    store.set(1, {"a": 1})
+    store.set(2, {"b": 2})
+    store.get(1)
+    store.set(3, {"c": 3})
+    assert store.get(2) is None
+    assert store.get(1) == {"a": 1}
+
+
+def test_sqlite_store(tmp_path):
+    """The SQLite store persists state across store instances."""
+    path = str(tmp_path / "state" / "quiz_state.db")
+    check_store(SQLiteQuizStateStore(path))
+
+    SQLiteQuizStateStore(path).set(7, {"quiz_index": 3})
+    assert SQLiteQuizStateStore(path).get(7) == {"quiz_index": 3}
+
+
+def test_sqlite_store_expires_old_state(tmp_path, clock):
+    """State not written for the TTL is gone, and deleted by the next write."""
+    path = str(tmp_path / "quiz_state.db")
+    store = SQLiteQuizStateStore(path, ttl=60, clock=clock)
+    store.set(1, {"quiz_index": 1})
+    clock.advance(30)
+    store.set(2, {"quiz_index": 2})
+
+    clock.advance(30)
+    assert store.get(1) is None
+    assert store.get(2) == {"quiz_index": 2}
+    store.set(3, {"quiz_index": 3})
+
+    rows = sqlite3.connect(path).execute("SELECT session_id FROM quiz_state")
+    assert sorted(session_id for (session_id,) in rows) == [2, 3]
+
+
+def test_redis_store():
+    """The Redis store namespaces keys and sets an expiry."""
+    client = FakeRedis()
+    store = RedisQuizStateStore(client, ttl=60)
+    check_store(store)
+
+    store.set(5, {"quiz_index": 0})
+    assert client.expiry["magistra:quiz:5"] == 60
+
+
+def answer_current_question(client, list_id, correct=True):
+    """Submit the right (or a wrong) answer for the question on the quiz page"""
+    page = client.get(f"/list/{list_id}/quiz").get_data(as_text=True)
+    entry_id = int(re.search(r'name="entry_id" value="(\d+)"', page).group(1))
+    direction = re.search(r'name="direction" value="(\w+)"', page).group(1)
+    entry = db.session.get(Entry, entry_id)
+    answer = entry.target_word if direction == "forward" else entry.source_word
+    return client.post(
+        f"/list/{list_id}/quiz/answer",
+        data={
+            "entry_id": entry_id,
+            "direction": direction,
+            "answer": answer if correct else "fout",
+        },
+    )
+
+
+def test_quiz_cookie_only_carries_session_id(client, seed_lists):
+    """A quiz runs to completion with only the session id in the cookie."""
+    seed_lists(1, entries_per_list=3)
+    response = client.post("/list/1/quiz/start", data={"direction": "forward"})
+    assert response.status_code == 302
+
+    with client.session_transaction() as cookie:
+        assert set(cookie.keys()) == {"quiz_session_id"}
+        quiz_session_id = cookie["quiz_session_id"]
+
+    answer_current_question(client, 1, correct=False)
+    for _ in range(3):
+        answer_current_question(client, 1)
+
+    with client.session_transaction() as cookie:
+        assert "quiz_questions" not in cookie
+
+    response = client.get("/list/1/quiz")
+    assert b"3" in response.data
+    quiz_session = db.session.get(QuizSession, quiz_session_id)
+    assert quiz_session.status == "completed"
+    assert quiz_session.correct_answers == 3
+    assert client.application.extensions["quiz_state"].get(quiz_session_id) is None
+
+
+def test_quiz_state_falls_back_to_database(client, seed_lists):
+    """Evicted state is restored from the persisted QuizSession."""
+    seed_lists(1, entries_per_list=2)
+    client.post("/list/1/quiz/start", data={"direction": "forward"})
+    answer_current_question(client, 1)
+
+    with client.session_transaction() as cookie:
+        quiz_session_id = cookie["quiz_session_id"]
+    client.application.extensions["quiz_state"].delete(quiz_session_id)
+
+    response = client.get("/list/1/quiz")
+    assert response.status_code == 200
+    assert b"2/2" in response.data
+
+
+def test_mixed_quiz_starts_with_server_side_state(client, seed_lists):
+    """A mixed quiz over two lists starts and shows its first question."""
+    seed_lists(2, entries_per_list=2)
+    response = client.post(
+        "/quiz/mixed/start", data={"list_ids": ["1", "2"], "direction": "forward"}
+    )
+    assert response.status_code == 302
+
+    response = client.get("/quiz/mixed/question")
+    assert response.status_code == 200
+    assert b"1/4" in response.data
@@ -0,0 +1,86 @@
+"""
+Spaced-repetition scheduling of quiz answers.
+"""
+
+from datetime import datetime, timedelta
+
+from app.models import ReviewSchedule, db
+from app.scheduler import MINIMUM_EASE, RELEARN_DELAY, next_interval, review
+from app.services import QuizService
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def test_sm2_intervals_grow_with_each_correct_answer():
+    """Correct answers give 1 day, 6 days, then interval * ease."""
+    schedule = ReviewSchedule(entry_id=1, direction="forward")
+    intervals = []
+    for _ in range(4):
+        review(schedule, True, NOW)
+        intervals.append(schedule.interval_days)
+
+    assert intervals == [1.0, 6.0, 15.0, 37.5]
+    assert schedule.due_at == NOW + timedelta(days=37.5)
+    assert schedule.repetitions == 4
+
+
+def test_sm2_lapse_resets_and_lowers_ease():
+    """A wrong answer brings the entry back soon with a lower ease."""
+    schedule = ReviewSchedule(entry_id=1, direction="forward")
+    review(schedule, True, NOW)
+    review(schedule, False, NOW)
+
+    assert schedule.repetitions == 0
+    assert schedule.lapses == 1
+    assert schedule.ease < 2.5
+    assert schedule.due_at == NOW + RELEARN_DELAY
+
+    ease = 1.4
+    for _ in range(5):
+        ease, _, _ = next_interval(ease, 0.0, 0, 0)
+    assert ease == MINIMUM_EASE
+
+
+def test_answers_update_the_schedule(client, seed_lists):
+    """Each submitted answer creates or updates the schedule of its direction."""
+    service = QuizService()
+    seed_lists(1, entries_per_list=1)
+    quiz_data = {"quiz_questions": [], "quiz_index": 0, "quiz_score": 0}
+
+    service.submit_answer(1, dict(quiz_data), 1, "t0", "forward")
+    service.submit_answer(1, dict(quiz_data), 1, "fout", "reverse")
+    service.submit_answer(1, dict(quiz_data), 1, "t0", "forward")
+
+    schedules = {s.direction: s for s in ReviewSchedule.query.all()}
+    assert schedules["forward"].repetitions == 2
+    assert schedules["forward"].interval_days == 6.0
+    assert schedules["reverse"].lapses == 1
+
+
+def test_practice_set_puts_due_reviews_first(app, seed_lists):
+    """Due reviews come first, most overdue first; weak entries fill up."""
+    seed_lists(1, entries_per_list=4)
+    db.session.add_all(
+        [
+            ReviewSchedule(
+                entry_id=3, direction="reverse", due_at=NOW - timedelta(days=2)
+            ),
+            ReviewSchedule(
+                entry_id=1, direction="forward", due_at=NOW - timedelta(hours=1)
+            ),
+            ReviewSchedule(
+                entry_id=2, direction="forward", due_at=NOW + timedelta(days=1)
+            ),
+        ]
+    )
+    db.session.commit()
+    from app.repositories import EntryRepository
+
+    EntryRepository().apply_score_deltas({4: (0, 3), 1: (0, 2)})
+
+    practice_set = QuizService().get_practice_set(limit=3, now=NOW)
+    assert [(entry.id, direction) for entry, direction in practice_set] == [
+        (3, "reverse"),
+        (1, "forward"),
+        (4, "forward"),
+    ]
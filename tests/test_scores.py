@@ -0,0 +1,103 @@
+"""
+Atomic SQL-side score counters.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.models import Entry, db
+from app.repositories import EntryRepository
+from config import Config
+
+
+def test_update_score_refreshes_loaded_entry(app, seed_lists):
+    """The loaded entry sees the new counters without another query."""
+    seed_lists(1, entries_per_list=1)
+    entry = db.session.get(Entry, 1)
+    repo = EntryRepository()
+
+    repo.update_score(entry, True)
+    repo.update_score(entry, False)
+    repo.update_score(entry, True)
+
+    assert (entry.correct_count, entry.incorrect_count) == (2, 1)
+    db.session.expire_all()
+    assert db.session.get(Entry, 1).correct_count == 2
+
+
+def test_apply_score_deltas_in_one_statement(app, count_queries, seed_lists):
+    """Many score deltas are applied with a single UPDATE ... RETURNING."""
+    seed_lists(1, entries_per_list=4)
+    repo = EntryRepository()
+
+    with count_queries() as statements:
+        counts = repo.apply_score_deltas({1: (2, 0), 2: (0, 3), 4: (1, 1)})
+
+    assert len(statements) == 1
+    assert counts == {1: (2, 0), 2: (0, 3), 4: (1, 1)}
+    db.session.expire_all()
+    assert db.session.get(Entry, 3).total_attempts == 0
+    assert db.session.get(Entry, 4).success_rate == 50.0
+
+
+def test_concurrent_increments_are_not_lost(tmp_path, seed_lists):
+    """Hammering one entry from a thread pool keeps every increment."""
+    database_url = os.environ.get("DATABASE_URL", "")
+    if not database_url or database_url.startswith("sqlite"):
+        # In-memory SQLite shares one connection, use a file for real concurrency
+        database_url = f"sqlite:///{tmp_path / 'scores.db'}"
+
+    class ConcurrencyConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SQLALCHEMY_ENGINE_OPTIONS = (
+            {"connect_args": {"timeout": 30}}
+            if database_url.startswith("sqlite")
+            else {}
+        )
+
+    app = create_app(ConcurrencyConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed_lists(1, entries_per_list=1)
+
+    workers, per_worker = 8, 25
+
+    def hammer(worker):
+        with app.app_context():
+            repo = EntryRepository()
+            for i in range(per_worker):
+                entry = db.session.get(Entry, 1)
+                repo.update_score(entry, (worker + i) % 2 == 0)
+                db.session.expire_all()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(hammer, range(workers)))
+
+    with app.app_context():
+        entry = db.session.get(Entry, 1)
+        assert entry.total_attempts == workers * per_worker
+        assert entry.correct_count == workers * per_worker // 2
+        db.session.remove()
+        db.drop_all()
+
+
+def test_difficult_entries_are_ranked_in_sql(app, count_queries, seed_lists):
+    """Smart practice gets the worst entries with one LIMITed query."""
+    from app.services import QuizService
+
+    seed_lists(2, entries_per_list=4)
+    scores = {1: (3, 1), 2: (0, 2), 3: (1, 0), 4: (1, 1), 5: (2, 2), 6: (0, 0)}
+    EntryRepository().apply_score_deltas(scores)
+
+    with count_queries() as statements:
+        entries = QuizService().get_difficult_entries(limit=3)
+
+    assert len(statements) == 1
+    assert "LIMIT" in statements[0]
+    # Entry 3 has one attempt only, entry 6 none; 4 and 5 tie on 50%
+    assert [entry.id for entry in entries] == [2, 4, 5]
+
+    entries = QuizService().get_difficult_entries(list_id=1)
+    assert [entry.id for entry in entries] == [2, 4, 1]